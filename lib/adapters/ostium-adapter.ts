@@ -9,14 +9,25 @@ import fetch from 'node-fetch';
 const OSTIUM_SERVICE_URL =
   process.env.OSTIUM_SERVICE_URL || 'http://localhost:5002';
 
+// Must not exceed the service's OSTIUM_BATCH_MAX_ADDRESSES
+const OSTIUM_BATCH_MAX_ADDRESSES = parseInt(process.env.OSTIUM_BATCH_MAX_ADDRESSES || '1000', 10);
+
 export interface OstiumPosition {
   market: string;
   side: 'long' | 'short';
   size: number;
   entryPrice: number;
   leverage: number;
-  unrealizedPnl: number;
+  unrealizedPnl: number; // Net of rollover and funding fees
   tradeId: string;
+  // Present when the service could price the trade
+  currentPrice?: number;
+  grossPnl?: number;
+  pnlPercent?: number;
+  rolloverFee?: number;
+  fundingFee?: number;
+  liquidationPrice?: number;
+  notional?: number;
 }
 
 export interface OstiumBalance {
@@ -101,6 +112,58 @@ export async function getOstiumPositions(
   }
 }
 
+/**
+ * Get open positions for many addresses
+ * Addresses are sent in chunks of at most OSTIUM_BATCH_MAX_ADDRESSES.
+ * Returns a map of address -> positions; addresses that failed are omitted.
+ * Throws only if every chunk failed.
+ */
+export async function getOstiumPositionsBatch(
+  addresses: string[]
+): Promise<Record<string, OstiumPosition[]>> {
+  const chunks: string[][] = [];
+  for (let i = 0; i < addresses.length; i += OSTIUM_BATCH_MAX_ADDRESSES) {
+    chunks.push(addresses.slice(i, i + OSTIUM_BATCH_MAX_ADDRESSES));
+  }
+
+  const positionsByAddress: Record<string, OstiumPosition[]> = {};
+  let lastError: Error | null = null;
+  let failedChunks = 0;
+
+  await Promise.all(chunks.map(async (chunk, index) => {
+    try {
+      const response = await fetch(`${OSTIUM_SERVICE_URL}/positions/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ addresses: chunk }),
+      });
+
+      const data: any = await response.json();
+
+      if (!data.success) {
+        throw new Error(data.error || 'Failed to get batch positions');
+      }
+
+      for (const [address, result] of Object.entries<any>(data.results || {})) {
+        if (result.success) {
+          positionsByAddress[address] = result.positions || [];
+        } else {
+          console.error(`[Ostium] Batch positions failed for ${address}:`, result.error);
+        }
+      }
+    } catch (error: any) {
+      failedChunks++;
+      lastError = error;
+      console.error(`[Ostium] Batch positions chunk ${index + 1}/${chunks.length} (${chunk.length} addresses) failed:`, error.message);
+    }
+  }));
+
+  if (chunks.length > 0 && failedChunks === chunks.length && lastError) {
+    throw lastError;
+  }
+  return positionsByAddress;
+}
+
 /**
  * Open a position on Ostium
  */
@@ -125,6 +188,32 @@ export async function openOstiumPosition(params: OpenPositionParams) {
   }
 }
 
+/**
+ * Wait for a submitted order to be filled, cancelled or timed out
+ * Long-polls the service's order tracker instead of polling positions
+ */
+export async function waitForOstiumOrder(
+  orderId: string,
+  timeoutSeconds: number = 30
+): Promise<{ status: 'pending' | 'filled' | 'cancelled' | 'timeout'; tradeId?: string; [key: string]: any }> {
+  try {
+    const response = await fetch(
+      `${OSTIUM_SERVICE_URL}/orders/${orderId}/wait?timeout=${timeoutSeconds}`
+    );
+
+    const data: any = await response.json();
+
+    if (!data.success) {
+      throw new Error(data.error || 'Failed to get order status');
+    }
+
+    return data.order;
+  } catch (error: any) {
+    console.error('[Ostium] Wait for order failed:', error.message);
+    throw error;
+  }
+}
+
 /**
  * Close a position on Ostium (idempotent)
  */
@@ -175,6 +264,7 @@ export async function transferOstiumUSDC(params: TransferParams) {
 
 /**
  * User approves agent to trade on their behalf
+ * Returns a jobId immediately; poll getOstiumTransactionStatus for the receipt
  */
 export async function approveOstiumAgent(params: {
   userPrivateKey: string;
@@ -200,6 +290,28 @@ export async function approveOstiumAgent(params: {
   }
 }
 
+/**
+ * Get the status of a queued on-chain write (e.g. agent approval)
+ */
+export async function getOstiumTransactionStatus(
+  jobId: string
+): Promise<{ status: 'queued' | 'submitted' | 'confirmed' | 'reverted' | 'failed' | 'timeout'; txHash?: string; [key: string]: any }> {
+  try {
+    const response = await fetch(`${OSTIUM_SERVICE_URL}/tx/${jobId}`);
+
+    const data: any = await response.json();
+
+    if (!data.success) {
+      throw new Error(data.error || 'Failed to get transaction status');
+    }
+
+    return data.job;
+  } catch (error: any) {
+    console.error('[Ostium] Get transaction status failed:', error.message);
+    throw error;
+  }
+}
+
 /**
  * Request testnet USDC from faucet
  */
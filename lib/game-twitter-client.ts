@@ -13,6 +13,15 @@ interface Tweet {
   author_id?: string;
 }
 
+export interface BatchTweetsResult {
+  username: string;
+  since_id?: string | null;
+  newest_id?: string;
+  count: number;
+  data: Tweet[];
+  error?: string;
+}
+
 export class GameTwitterClient {
   private proxyUrl: string;
 
@@ -73,6 +82,36 @@ export class GameTwitterClient {
       return [];
     }
   }
+
+  /**
+   * Fetch new tweets for many accounts in one proxy call (POST /tweets/batch)
+   * The proxy fetches them concurrently; pass sinceIds (username -> newest
+   * tweet id already stored) so only newer tweets come back.
+   * Throws if the proxy is unreachable; per-account errors are in `error`.
+   */
+  async getUserTweetsBatch(
+    usernames: string[],
+    options: {
+      maxResults?: number;
+      sinceIds?: Record<string, string>;
+    } = {}
+  ): Promise<BatchTweetsResult[]> {
+    const maxResults = Math.max(5, Math.min(options.maxResults || 10, 100));
+
+    console.log(`[Twitter Proxy] Batch fetching ${usernames.length} accounts (max ${maxResults} tweets each)`);
+
+    const response = await axios.post(`${this.proxyUrl}/tweets/batch`, {
+      usernames: usernames.map(username => username.replace('@', '')),
+      max_results: maxResults,
+      since_ids: options.sinceIds,
+    }, {
+      timeout: 300000 // whole batch, paced by the proxy's rate budget
+    });
+
+    const results: BatchTweetsResult[] = response.data?.results || [];
+    console.log(`[Twitter Proxy] Batch fetched ${response.data?.count || 0} tweets in ${response.data?.elapsed}s`);
+    return results;
+  }
 }
 
 /**
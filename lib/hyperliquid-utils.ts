@@ -8,6 +8,8 @@ import { getPrivateKeyForAddress } from './wallet-pool';
 
 const prisma = new PrismaClient();
 const HYPERLIQUID_SERVICE_URL = process.env.HYPERLIQUID_SERVICE_URL || 'http://localhost:5001';
+// Must not exceed the service's HYPERLIQUID_BATCH_MAX_ADDRESSES
+const HYPERLIQUID_BATCH_MAX_ADDRESSES = parseInt(process.env.HYPERLIQUID_BATCH_MAX_ADDRESSES || '1000', 10);
 
 export interface HyperliquidPosition {
   coin: string;
@@ -52,6 +54,57 @@ export async function getHyperliquidOpenPositions(
   }
 }
 
+/**
+ * Get open positions for many Hyperliquid accounts
+ * Addresses are sent in chunks of at most HYPERLIQUID_BATCH_MAX_ADDRESSES.
+ * Returns a map of address -> positions; addresses that failed are omitted.
+ * Throws only if every chunk failed.
+ */
+export async function getHyperliquidOpenPositionsBatch(
+  userAddresses: string[]
+): Promise<Record<string, HyperliquidPosition[]>> {
+  const chunks: string[][] = [];
+  for (let i = 0; i < userAddresses.length; i += HYPERLIQUID_BATCH_MAX_ADDRESSES) {
+    chunks.push(userAddresses.slice(i, i + HYPERLIQUID_BATCH_MAX_ADDRESSES));
+  }
+
+  const positionsByAddress: Record<string, HyperliquidPosition[]> = {};
+  let lastError: Error | null = null;
+  let failedChunks = 0;
+
+  await Promise.all(chunks.map(async (chunk, index) => {
+    try {
+      const response = await fetch(`${HYPERLIQUID_SERVICE_URL}/positions/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ addresses: chunk }),
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to fetch batch positions: ${response.statusText}`);
+      }
+
+      const data = await response.json();
+      for (const [address, result] of Object.entries<any>(data.results || {})) {
+        if (result.success) {
+          positionsByAddress[address] = result.positions || [];
+        } else {
+          console.error(`[HyperliquidUtils] Batch positions failed for ${address}:`, result.error);
+        }
+      }
+    } catch (error: any) {
+      failedChunks++;
+      lastError = error;
+      console.error(`[HyperliquidUtils] Batch positions chunk ${index + 1}/${chunks.length} (${chunk.length} addresses) failed:`, error.message);
+    }
+  }));
+
+  if (chunks.length > 0 && failedChunks === chunks.length && lastError) {
+    throw lastError;
+  }
+  return positionsByAddress;
+}
+
 /**
  * Get current market price for a token on Hyperliquid
  */
@@ -98,6 +151,80 @@ export async function getHyperliquidAllMarkets(): Promise<Record<string, Hyperli
   }
 }
 
+export interface HyperliquidBatchOrderResult {
+  index: number;
+  coin: string;
+  success: boolean;
+  status: 'filled' | 'resting' | 'error' | 'unknown';
+  oid?: number;
+  totalSz?: string;
+  avgPx?: string;
+  error?: string;
+}
+
+export interface HyperliquidFanoutResult extends HyperliquidBatchOrderResult {
+  id?: string;           // Caller's execution id (e.g. deployment id)
+  size?: number;         // Coin size that was ordered
+  collateral?: number | null;
+}
+
+/**
+ * Execute one signal for many followers in a single call
+ * The service sizes each follower (fixed-usdc or balance-percentage, as in
+ * trade-executor), groups executions per signer into bulk actions and streams
+ * results back as they complete; onResult is called for each one.
+ */
+export async function fanOutHyperliquidSignal(
+  params: {
+    coin: string;
+    isBuy: boolean;
+    sizing: { type: 'fixed-usdc' | 'balance-percentage'; value: number; leverage?: number };
+    slippage?: number;
+    executions: Array<{ id?: string; agentPrivateKey: string; userAddress: string; size?: number }>;
+  },
+  onResult?: (result: HyperliquidFanoutResult) => void
+): Promise<{ results: HyperliquidFanoutResult[]; failed: number; elapsed: number }> {
+  const response = await fetch(`${HYPERLIQUID_SERVICE_URL}/signals/fanout`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ ...params, stream: true }),
+  });
+
+  if (!response.ok || !response.body) {
+    const errorData = await response.json().catch(() => ({}));
+    throw new Error(errorData.error || `Failed to fan out signal: ${response.statusText}`);
+  }
+
+  const results: HyperliquidFanoutResult[] = [];
+  let summary = { failed: 0, elapsed: 0 };
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const handleLine = (line: string) => {
+    if (!line.trim()) return;
+    const message = JSON.parse(line);
+    if (message.done) {
+      summary = { failed: message.failed, elapsed: message.elapsed };
+    } else {
+      results.push(message);
+      onResult?.(message);
+    }
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer);
+
+  return { results: results.sort((a, b) => a.index - b.index), ...summary };
+}
+
 /**
  * Close a Hyperliquid position
  */
@@ -158,8 +285,13 @@ export async function closeHyperliquidPosition(params: {
 
 /**
  * Get user fills (historical trades) including closed PnL
+ * With sinceTime (ms), only fills at or after that time are fetched, page by page
+ * from the service's local fill store; without it, the most recent fills.
  */
-export async function getHyperliquidUserFills(userAddress: string): Promise<Array<{
+export async function getHyperliquidUserFills(
+  userAddress: string,
+  options: { sinceTime?: number; pageSize?: number } = {}
+): Promise<Array<{
   coin: string;
   side: string;
   px: string;
@@ -171,19 +303,34 @@ export async function getHyperliquidUserFills(userAddress: string): Promise<Arra
   oid: string;
 }>> {
   try {
-    const response = await fetch(`${HYPERLIQUID_SERVICE_URL}/user-fills`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ address: userAddress }),
-    });
+    const fills: any[] = [];
+    let cursor: string | undefined;
 
-    if (!response.ok) {
-      const errorData = await response.json();
-      throw new Error(errorData.error || `Failed to get user fills: ${response.statusText}`);
-    }
+    while (true) {
+      const response = await fetch(`${HYPERLIQUID_SERVICE_URL}/user-fills`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          address: userAddress,
+          sinceTime: options.sinceTime,
+          cursor,
+          limit: options.pageSize,
+        }),
+      });
 
-    const data = await response.json();
-    return data.fills || [];
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || `Failed to get user fills: ${response.statusText}`);
+      }
+
+      const data = await response.json();
+      fills.push(...(data.fills || []));
+
+      if (options.sinceTime === undefined || !data.hasMore) {
+        return fills;
+      }
+      cursor = data.nextCursor;
+    }
   } catch (error: any) {
     console.error('[HyperliquidUtils] Failed to get user fills:', error.message);
     return [];
@@ -11,7 +11,7 @@ import { createGMXAdapterSubaccount, GMXAdapterSubaccount } from './adapters/gmx
 import { createHyperliquidAdapter, HyperliquidAdapter } from './adapters/hyperliquid-adapter';
 import { SafeModuleService, createSafeModuleService } from './safe-module-service';
 import { createSafeTransactionService } from './safe-transaction-service';
-import { closeHyperliquidPosition } from './hyperliquid-utils';
+import { closeHyperliquidPosition, fanOutHyperliquidSignal, HyperliquidFanoutResult } from './hyperliquid-utils';
 import { updateMetricsForDeployment } from './metrics-updater';
 import { ethers } from 'ethers';
 import {
@@ -99,6 +99,150 @@ export class TradeExecutor {
     }
   }
 
+  /**
+   * Execute a Hyperliquid signal for many deployments in one service call
+   * Followers are sized and ordered by the service (/signals/fanout), one bulk
+   * action per agent wallet, instead of one /open-position round trip per user.
+   * Returns one result per deployment id, in input order.
+   */
+  async executeHyperliquidSignalForDeployments(
+    signalId: string,
+    deploymentIds: string[]
+  ): Promise<Array<ExecutionResult & { deploymentId: string }>> {
+    const results = new Map<string, ExecutionResult>();
+    // Results in input order; deployments without a result yet get this error
+    const resultsInOrder = (error: string, reason?: string) =>
+      deploymentIds.map(deploymentId => results.get(deploymentId)
+        ? { deploymentId, ...results.get(deploymentId)! }
+        : { deploymentId, success: false, error, reason });
+
+    try {
+      const signal = await prisma.signals.findUnique({ where: { id: signalId } });
+      if (!signal) {
+        return resultsInOrder('Signal not found');
+      }
+      if (signal.venue !== 'HYPERLIQUID') {
+        return resultsInOrder(`Fan-out is only supported for HYPERLIQUID signals, not ${signal.venue}`);
+      }
+
+      const deployments = await prisma.agent_deployments.findMany({
+        where: { id: { in: deploymentIds } },
+      });
+      const deploymentsById = new Map(deployments.map(d => [d.id, d]));
+      if (deployments.length === 0) {
+        return resultsInOrder('Deployment not found');
+      }
+
+      // Venue checks depend only on the signal for Hyperliquid, so run them once
+      const safeWallet = createSafeWallet(deployments[0].safe_wallet, getChainIdForVenue(signal.venue));
+      const preCheck = await this.preTradeValidation(signal as any, deployments[0] as any, safeWallet);
+      if (!preCheck.canExecute) {
+        return resultsInOrder('Pre-trade validation failed', preCheck.reason);
+      }
+
+      // Strip _MANUAL_timestamp suffix if present
+      const actualTokenSymbol = signal.token_symbol.split('_MANUAL_')[0];
+      const marketInfo = await createHyperliquidAdapter(safeWallet).getMarketInfo(actualTokenSymbol);
+      if (!marketInfo) {
+        return resultsInOrder(`Market not available for ${actualTokenSymbol}`);
+      }
+
+      // Get agent private keys from wallet pool (NO decryption needed!)
+      const { getPrivateKeyForAddress } = await import('./wallet-pool');
+      const executions: Array<{ id: string; agentPrivateKey: string; userAddress: string }> = [];
+      for (const deploymentId of deploymentIds) {
+        const deployment = deploymentsById.get(deploymentId);
+        if (!deployment) {
+          results.set(deploymentId, { success: false, error: 'Deployment not found' });
+          continue;
+        }
+        const agentPrivateKey = deployment.hyperliquid_agent_address
+          ? await getPrivateKeyForAddress(deployment.hyperliquid_agent_address)
+          : null;
+        if (!agentPrivateKey) {
+          results.set(deploymentId, {
+            success: false,
+            error: 'Hyperliquid agent wallet not found in pool. Please reconnect.',
+            reason: 'Agent wallet required for Hyperliquid trading',
+          });
+          continue;
+        }
+        // For Hyperliquid, safe_wallet actually stores the user's Hyperliquid wallet address
+        executions.push({ id: deploymentId, agentPrivateKey, userAddress: deployment.safe_wallet });
+      }
+
+      if (executions.length > 0) {
+        // Same sizing rules as executeHyperliquidTrade, applied per follower by the service
+        const sizeModel = signal.size_model as any;
+        const isFixed = sizeModel.type === 'fixed-usdc';
+
+        console.log(`[TradeExecutor] Hyperliquid fan-out: ${actualTokenSymbol} ${signal.side} for ${executions.length} deployments`);
+
+        // Record positions as results stream in rather than after the last follower
+        const recorded: Promise<void>[] = [];
+        const recordResult = (result: HyperliquidFanoutResult) => {
+          const deploymentId = result.id as string;
+          if (!result.success) {
+            results.set(deploymentId, {
+              success: false,
+              error: result.error || 'Hyperliquid order submission failed',
+            });
+            return;
+          }
+          recorded.push((async () => {
+            try {
+              const position = await prisma.positions.create({
+                data: {
+                  deployment_id: deploymentId,
+                  signal_id: signal.id,
+                  venue: signal.venue,
+                  token_symbol: actualTokenSymbol,
+                  side: signal.side,
+                  entry_price: result.avgPx ? parseFloat(result.avgPx) : marketInfo.price,
+                  qty: result.size || 0,
+                  entry_tx_hash: result.oid ? String(result.oid) : 'HL-' + Date.now(),
+                  trailing_params: {
+                    enabled: true,
+                    trailingPercent: 1, // 1% trailing stop
+                    highestPrice: null,
+                  },
+                },
+              });
+              results.set(deploymentId, {
+                success: true,
+                txHash: result.oid ? String(result.oid) : undefined,
+                positionId: position.id,
+              });
+            } catch (error: any) {
+              console.error(`[TradeExecutor] Failed to record Hyperliquid position for ${deploymentId}:`, error);
+              results.set(deploymentId, { success: false, error: error.message });
+            }
+          })());
+        };
+
+        const fanout = await fanOutHyperliquidSignal({
+          coin: actualTokenSymbol,
+          isBuy: signal.side === 'LONG',
+          sizing: {
+            type: isFixed ? 'fixed-usdc' : 'balance-percentage',
+            value: isFixed ? (sizeModel.value || 0) : (sizeModel.value || 5),
+            leverage: sizeModel.leverage || 1,
+          },
+          slippage: 0.01, // 1% slippage
+          executions,
+        }, recordResult);
+        await Promise.all(recorded);
+
+        console.log(`[TradeExecutor] ✅ Hyperliquid fan-out done: ${executions.length - fanout.failed}/${executions.length} filled in ${fanout.elapsed.toFixed(2)}s`);
+      }
+
+      return resultsInOrder('No result returned for deployment');
+    } catch (error: any) {
+      console.error('[TradeExecutor] Hyperliquid fan-out failed:', error);
+      return resultsInOrder(error.message);
+    }
+  }
+
   /**
    * Execute a signal (auto trading - uses first active deployment)
    */
@@ -3,7 +3,7 @@
  * Supports: Bearer Token, GAME API, and other alternatives
  */
 
-import { GameTwitterClient } from './game-twitter-client';
+import { BatchTweetsResult, GameTwitterClient } from './game-twitter-client';
 
 interface Tweet {
   id: string;
@@ -73,6 +73,31 @@ export class MultiMethodXApiClient {
     return [];
   }
 
+  /**
+   * Fetch new tweets for many accounts at once (GAME proxy only)
+   * Returns null when no batch-capable method is configured so callers can
+   * fall back to getUserTweets per account.
+   */
+  async getUserTweetsBatch(
+    usernames: string[],
+    options: {
+      maxResults?: number;
+      sinceIds?: Record<string, string>;
+    } = {}
+  ): Promise<BatchTweetsResult[] | null> {
+    if (!this.gameApiKey) {
+      return null;
+    }
+
+    try {
+      const gameClient = new GameTwitterClient(this.gameApiKey);
+      return await gameClient.getUserTweetsBatch(usernames, options);
+    } catch (error: any) {
+      console.error('[X API] GAME batch fetch failed:', error.response?.data || error.message);
+      return null;
+    }
+  }
+
   /**
    * Standard bearer token method (existing implementation)
    */
@@ -1,6 +1,6 @@
 import type { NextApiRequest, NextApiResponse} from 'next';
 import { PrismaClient } from '@prisma/client';
-import { TradeExecutor } from '../../../lib/trade-executor';
+import { TradeExecutor, ExecutionResult } from '../../../lib/trade-executor';
 
 const prisma = new PrismaClient();
 
@@ -107,26 +107,41 @@ export default async function handler(
     const errors = [];
     const executor = new TradeExecutor();
 
-    for (const deployment of deployments) {
-      // Check for duplicate position (same deployment + signal)
-      const existing = await prisma.positions.findUnique({
-        where: {
-          deployment_id_signal_id: {
-            deployment_id: deployment.id,
-            signal_id: signal.id,
-          },
-        },
-      });
-
-      if (existing) {
+    // Skip deployments that already have a position for this signal
+    const existingPositions = await prisma.positions.findMany({
+      where: {
+        signal_id: signal.id,
+        deployment_id: { in: deployments.map(d => d.id) },
+      },
+      select: { deployment_id: true },
+    });
+    const alreadyExecuted = new Set(existingPositions.map(p => p.deployment_id));
+    const pendingDeployments = deployments.filter(deployment => {
+      if (alreadyExecuted.has(deployment.id)) {
         console.log(`[TRADE] Position already exists for deployment ${deployment.id}`);
-        continue;
+        return false;
       }
+      return true;
+    });
 
-      // Execute REAL on-chain trade via TradeExecutor for SPECIFIC deployment
-      console.log(`[TRADE] Executing real trade for deployment ${deployment.id} (Safe: ${deployment.safe_wallet})`);
-      const result = await executor.executeSignalForDeployment(signal.id, deployment.id);
+    // Hyperliquid followers go out in one fan-out call; other venues one deployment at a time
+    let results: Array<ExecutionResult & { deploymentId: string }> = [];
+    if (signal.venue === 'HYPERLIQUID' && pendingDeployments.length > 0) {
+      console.log(`[TRADE] Executing Hyperliquid fan-out for ${pendingDeployments.length} deployments`);
+      results = await executor.executeHyperliquidSignalForDeployments(
+        signal.id,
+        pendingDeployments.map(d => d.id)
+      );
+    } else {
+      for (const deployment of pendingDeployments) {
+        // Execute REAL on-chain trade via TradeExecutor for SPECIFIC deployment
+        console.log(`[TRADE] Executing real trade for deployment ${deployment.id} (Safe: ${deployment.safe_wallet})`);
+        const result = await executor.executeSignalForDeployment(signal.id, deployment.id);
+        results.push({ deploymentId: deployment.id, ...result });
+      }
+    }
 
+    for (const result of results) {
       if (result.success && result.positionId) {
         console.log(`[TRADE] ✅ Trade executed on-chain! Position: ${result.positionId}, TX: ${result.txHash}`);
         
@@ -140,10 +155,10 @@ export default async function handler(
         }
       } else {
         const errorMsg = result.error || result.reason || 'Unknown error';
-        console.error(`[TRADE] ❌ Trade execution failed for deployment ${deployment.id}:`, errorMsg);
+        console.error(`[TRADE] ❌ Trade execution failed for deployment ${result.deploymentId}:`, errorMsg);
         console.error(`[TRADE] Full result:`, JSON.stringify(result, null, 2));
         errors.push({
-          deploymentId: deployment.id,
+          deploymentId: result.deploymentId,
           error: errorMsg,
           reason: result.reason,
           summary: result.executionSummary,
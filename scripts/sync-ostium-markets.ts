@@ -18,7 +18,7 @@ async function syncOstiumMarkets() {
     const execAsync = promisify(exec);
     
     const scriptPath = './services/fetch-all-ostium-markets.py';
-    const { stdout, stderr } = await execAsync(`cd services && source venv/bin/activate && python3 ../services/fetch-all-ostium-markets.py`);
+    const { stdout, stderr } = await execAsync(`cd services && source venv/bin/activate && python3 ../services/fetch-all-ostium-markets.py --snapshot`);
     
     if (stderr && !stderr.includes('UserWarning')) {
       console.error('Python stderr:', stderr);
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Ostium Read Path Benchmark
+Compares per-request latency of the /balance and /positions read paths:
+  before - a new OstiumSDK (Web3 provider, contracts, ABIs) per request
+  after  - one shared read-only SDK with a pooled keep-alive RPC session
+
+Run:
+python services/benchmark-ostium-reads.py [iterations] [address]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import statistics
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from ostium_python_sdk import OstiumSDK
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+ADDRESS = Web3.to_checksum_address(sys.argv[2] if len(sys.argv) > 2 else '0x3828dFCBff64fD07B963Ef11BafE632260413Ab3')
+RPC_URL = os.getenv('OSTIUM_RPC_URL', 'https://sepolia-rollup.arbitrum.io/rpc')
+NETWORK = 'testnet' if os.getenv('OSTIUM_TESTNET', 'true').lower() == 'true' else 'mainnet'
+READ_ONLY_KEY = '0x' + '1' * 64
+
+
+def new_sdk():
+    return OstiumSDK(network=NETWORK, private_key=READ_ONLY_KEY, rpc_url=RPC_URL)
+
+
+def shared_sdk():
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+    session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+    sdk = new_sdk()
+    sdk.w3.provider = Web3.HTTPProvider(RPC_URL, session=session)
+    return sdk
+
+
+def balance_request(sdk):
+    sdk.balance.get_usdc_balance(ADDRESS)
+    sdk.balance.get_ether_balance(ADDRESS)
+
+
+def positions_request(sdk, loop):
+    loop.run_until_complete(sdk.get_open_trades(trader_address=ADDRESS))
+
+
+def measure(name, fn):
+    """Run fn ITERATIONS times and return latencies in ms"""
+    samples = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(f"   {name:<28} p50 {statistics.median(samples):8.1f} ms   "
+          f"p95 {samples[int(len(samples) * 0.95) - 1]:8.1f} ms   "
+          f"mean {statistics.mean(samples):8.1f} ms")
+    return samples
+
+
+def main():
+    print("🚀 OSTIUM READ PATH BENCHMARK")
+    print("=" * 60)
+    print(f"   Network: {NETWORK}, RPC: {RPC_URL}")
+    print(f"   Address: {ADDRESS}, iterations: {ITERATIONS}\n")
+    
+    print("📊 /balance")
+    before = measure("before (new SDK/request)", lambda: balance_request(new_sdk()))
+    sdk = shared_sdk()
+    after = measure("after (shared SDK)", lambda: balance_request(sdk))
+    print(f"   Speedup: {statistics.median(before) / statistics.median(after):.1f}x\n")
+    
+    print("📊 /positions")
+    
+    def positions_before():
+        loop = asyncio.new_event_loop()
+        positions_request(new_sdk(), loop)
+        loop.close()
+    
+    loop = asyncio.new_event_loop()
+    before = measure("before (new SDK/request)", positions_before)
+    after = measure("after (shared SDK)", lambda: positions_request(sdk, loop))
+    loop.close()
+    print(f"   Speedup: {statistics.median(before) / statistics.median(after):.1f}x")
+    
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
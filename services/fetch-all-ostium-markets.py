@@ -2,11 +2,17 @@
 """
 Fetch ALL Ostium markets and output as JSON
 This will be called by the TypeScript sync script
+
+--snapshot [PATH] also writes the open markets in the format served by
+ostium-service.py /available-markets, which loads that file at startup
+(default: OSTIUM_MARKETS_SNAPSHOT or services/data/ostium-markets.json).
 """
 import os
 import sys
 import json
+import time
 import asyncio
+import argparse
 
 os.environ['PYTHONHTTPSVERIFY'] = '0'
 
@@ -53,7 +59,51 @@ async def fetch_all_ostium_markets():
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def write_snapshot(markets, path):
+    """Write open markets keyed by symbol (same shape as /api/venue-markets/available)"""
+    snapshot = {
+        'markets': {
+            market['symbol']: {
+                'index': market['index'],
+                'name': market['name'],
+                'available': True,
+                'minPosition': float(market['minLevPos']) if market['minLevPos'] else None,
+                'maxLeverage': int(float(market['maxLeverage'])) if market['maxLeverage'] else None,
+                'group': market['group'],
+                'currentPrice': float(market['currentPrice']) if market['currentPrice'] else None,
+            }
+            for market in markets
+            if market['symbol'] and market['isMarketOpen'] is not False
+        },
+        'updatedAt': time.time(),
+        'source': 'fetch-all-ostium-markets',
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+parser = argparse.ArgumentParser(description='Fetch all Ostium markets as JSON')
+parser.add_argument(
+    '--snapshot',
+    nargs='?',
+    const=os.getenv(
+        'OSTIUM_MARKETS_SNAPSHOT',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ostium-markets.json')
+    ),
+    help='also write the market snapshot loaded by ostium-service.py'
+)
+args = parser.parse_args()
+
 # Run async function
 result = asyncio.run(fetch_all_ostium_markets())
+if args.snapshot and result['success'] and result['markets']:
+    try:
+        write_snapshot(result['markets'], args.snapshot)
+    except Exception as e:
+        # stdout stays valid JSON for the sync script
+        print(f"Could not write market snapshot to {args.snapshot}: {e}", file=sys.stderr)
 print(json.dumps(result, indent=2))
 
@@ -0,0 +1,48 @@
+"""
+Gunicorn settings shared by all Python services (see wsgi.py)
+Every setting can be overridden by environment variable or on the command line.
+
+Note: the Ostium service (nonce manager, transaction queue, order tracker) and
+the Twitter proxy (rate-limit scheduler, since ids, watch poller) keep
+per-process state, so run them with GUNICORN_WORKERS=1 and scale with threads.
+The Hyperliquid service serializes each signer's actions only within a worker;
+run it with GUNICORN_WORKERS=1 if one agent wallet must never send from two
+workers at once.
+Each Twitter /watch/stream (SSE) client holds one thread while connected;
+TWITTER_WATCH_MAX_SUBSCRIBERS caps them below GUNICORN_THREADS.
+"""
+
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))  # so wsgi.py is importable
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# Processes x threads; gthread workers suit the blocking SDK/HTTP calls
+workers = int(os.getenv('GUNICORN_WORKERS', os.getenv('WEB_CONCURRENCY', '2')))
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+worker_class = 'gthread'
+
+# Import services (SDKs, ABIs) once in the master; workers fork from it.
+# Connections (sqlite, keep-alive sockets) must not cross the fork: services
+# open them lazily per process or reset them in start_services.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Trades wait for on-chain receipts inside the SDK
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '180'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Background threads do not survive fork: start them in each worker"""
+    import wsgi
+    wsgi.start_services()
+
+
+def worker_exit(server, worker):
+    """Graceful shutdown: runs after the worker has finished its in-flight requests"""
+    import wsgi
+    wsgi.stop_services()
@@ -12,14 +12,22 @@ Testnet:
 HYPERLIQUID_TESTNET=true python services/hyperliquid-service.py
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from hyperliquid.api import API
 from hyperliquid.info import Info
 from hyperliquid.exchange import Exchange
 from eth_account import Account
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import asyncio
+import hashlib
+import sqlite3
+import websocket  # websocket-client (installed with hyperliquid-python-sdk)
+import json
 import os
 import logging
+import threading
 import time
 
 app = Flask(__name__)
@@ -37,16 +45,948 @@ logger.info(f"📡 Base URL: {BASE_URL}")
 # Hyperliquid API client
 info = Info(base_url=BASE_URL, skip_ws=True)
 
+# Batch positions settings (used by /positions/batch)
+POSITIONS_BATCH_WORKERS = int(os.environ.get('HYPERLIQUID_BATCH_WORKERS', 16))
+POSITIONS_BATCH_MAX_ADDRESSES = int(os.environ.get('HYPERLIQUID_BATCH_MAX_ADDRESSES', 1000))
+ORDERS_BATCH_MAX_ORDERS = int(os.environ.get('HYPERLIQUID_BATCH_MAX_ORDERS', 500))
+
+# Signal fan-out settings (used by /signals/fanout)
+FANOUT_WORKERS = int(os.environ.get('HYPERLIQUID_FANOUT_WORKERS', 32))
+FANOUT_MAX_EXECUTIONS = int(os.environ.get('HYPERLIQUID_FANOUT_MAX_EXECUTIONS', 2000))
+MIN_ORDER_USD = 10  # Hyperliquid minimum order value
+
+# Shared worker pool for fanning out user_state calls
+batch_executor = ThreadPoolExecutor(
+    max_workers=POSITIONS_BATCH_WORKERS,
+    thread_name_prefix='hl-batch'
+)
+
+# Separate pool for writes (signal fan-out, /orders/batch) so they can't starve batch reads
+fanout_executor = ThreadPoolExecutor(
+    max_workers=FANOUT_WORKERS,
+    thread_name_prefix='hl-fanout'
+)
+
+# One action at a time per signing wallet within this process: keeps a
+# signer's orders in submission order and avoids colliding timestamp nonces.
+# The locks are per process; with several workers the same signer can still
+# send from two of them at once (Hyperliquid then rejects a duplicate nonce).
+signer_locks = {}
+signer_locks_lock = threading.Lock()
+
+def get_signer_lock(address: str) -> threading.Lock:
+    with signer_locks_lock:
+        return signer_locks.setdefault(address.lower(), threading.Lock())
+
+def format_positions(state: dict) -> list:
+    """Format assetPositions from a user_state response"""
+    formatted_positions = []
+    for pos in state.get("assetPositions", []):
+        position = pos.get("position", {})
+        formatted_positions.append({
+            "coin": position.get("coin"),
+            "szi": position.get("szi"),  # Size (positive = long, negative = short)
+            "entryPx": position.get("entryPx"),
+            "positionValue": position.get("positionValue"),
+            "unrealizedPnl": position.get("unrealizedPnl"),
+            "liquidationPx": position.get("liquidationPx"),
+            "leverage": position.get("leverage", {}).get("value", "1")
+        })
+    return formatted_positions
+
+def format_balance(state: dict) -> dict:
+    """/balance response body from a user_state response"""
+    margin_summary = state.get("marginSummary", {})
+    return {
+        "success": True,
+        "withdrawable": float(state.get("withdrawable", 0)),
+        "accountValue": float(margin_summary.get("accountValue", 0)),
+        "totalNtlPos": float(margin_summary.get("totalNtlPos", 0)),
+        "totalRawUsd": float(margin_summary.get("totalRawUsd", 0))
+    }
+
+def format_fills(fills: list) -> list:
+    """Format user_fills entries with PnL data"""
+    formatted_fills = []
+    for fill in fills:
+        formatted_fills.append({
+            "coin": fill.get("coin"),
+            "side": fill.get("side"),  # "A" = long/buy, "B" = short/sell
+            "px": fill.get("px"),  # Fill price
+            "sz": fill.get("sz"),  # Fill size
+            "time": fill.get("time"),  # Timestamp
+            "closedPnl": fill.get("closedPnl", "0"),  # PnL from closing position
+            "fee": fill.get("fee"),
+            "tid": fill.get("tid"),  # Trade ID
+            "oid": fill.get("oid"),  # Order ID
+        })
+    return formatted_fills
+
+def find_vault_balance(state: dict, vault_address: str) -> float:
+    """Equity held in a vault according to a user_state response"""
+    for vault_equity in state.get('vaultEquities', []):
+        if vault_equity.get('vault') == vault_address:
+            return float(vault_equity.get('equity', 0))
+    return 0
+
+def find_approved_agents(user_state: dict) -> list:
+    """Approved agent addresses from a user_state response (empty if the API doesn't report them)"""
+    # Check different possible locations for agent approval info
+    if user_state and isinstance(user_state, dict):
+        if 'approvedAgents' in user_state:
+            return user_state.get('approvedAgents', [])
+        if 'agentApprovals' in user_state:
+            return user_state.get('agentApprovals', [])
+    return []
+
+# Market metadata settings
+META_TTL = float(os.environ.get('HYPERLIQUID_META_TTL', 300))  # seconds between meta() refreshes
+MIDS_REFRESH_INTERVAL = float(os.environ.get('HYPERLIQUID_MIDS_REFRESH_INTERVAL', 1))
+MIDS_MAX_AGE = float(os.environ.get('HYPERLIQUID_MIDS_MAX_AGE', 3))  # max staleness for order prices
+MARKET_IDLE_AFTER = float(os.environ.get('HYPERLIQUID_MARKET_IDLE_AFTER', 60))  # pause polling without readers
+
+# Opt-in websocket price feed (allMids + optional l2Book top-of-book)
+WS_PRICES_ENABLED = os.environ.get('HYPERLIQUID_WS_PRICES', 'false').lower() == 'true'
+WS_URL = os.environ.get('HYPERLIQUID_WS_URL', 'ws' + BASE_URL[len('http'):] + '/ws')
+WS_L2_COINS = [c.strip() for c in os.environ.get('HYPERLIQUID_WS_L2_COINS', '').split(',') if c.strip()]
+
+class MarketMetadataStore:
+    """
+    In-process cache of Hyperliquid market metadata and mid prices.
+    meta() is indexed by coin name and refreshed every META_TTL seconds;
+    all_mids() is refreshed every MIDS_REFRESH_INTERVAL seconds by a
+    background thread. Tables are replaced wholesale on refresh, so
+    readers never need the lock.
+    The thread starts on first read and stops polling when nobody has read
+    for idle_after seconds (the next read wakes it). REST mids polling is
+    skipped while the websocket feed delivers fresh prices.
+    """
+
+    def __init__(self, info_client, meta_ttl, mids_refresh_interval, mids_max_age, idle_after):
+        self.info = info_client
+        self.meta_ttl = meta_ttl
+        self.mids_refresh_interval = mids_refresh_interval
+        self.mids_max_age = mids_max_age
+        self.idle_after = idle_after
+        self.last_access = time.time()
+        self.meta = None        # raw meta() response
+        self.assets = {}        # coin -> universe entry
+        self.sz_decimals = {}   # coin -> szDecimals
+        self.max_leverage = {}  # coin -> maxLeverage
+        self.meta_updated = None
+        self.meta_version = 0   # bumped when the universe (coin -> asset index) changes
+        self.mids = {}          # coin -> mid price (float)
+        self.mids_updated = None
+        self.mids_source = None
+        self.bbo = {}           # coin -> {"bid", "ask", "time"} from l2Book stream
+        self.feed = None        # optional MidsFeed (websocket)
+        self.rest_polls = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def refresh_meta(self):
+        """Fetch meta() and rebuild the coin-indexed tables"""
+        meta = self.info.meta()
+        assets = {asset.get("name"): asset for asset in meta.get("universe", [])}
+        with self._lock:
+            previous = self.meta
+            if previous is None or [a.get("name") for a in previous.get("universe", [])] != list(assets):
+                self.meta_version += 1
+            self.meta = meta
+            self.assets = assets
+            self.sz_decimals = {coin: a.get("szDecimals", 0) for coin, a in assets.items()}
+            self.max_leverage = {coin: a.get("maxLeverage", 0) for coin, a in assets.items()}
+            self.meta_updated = time.time()
+        return assets
+
+    def update_mids(self, mids: dict, source: str = 'rest'):
+        """Replace the mid price table"""
+        parsed = {coin: float(px) for coin, px in mids.items()}
+        with self._lock:
+            self.mids = parsed
+            self.mids_updated = time.time()
+            self.mids_source = source
+
+    def update_bbo(self, coin: str, bid: float, ask: float):
+        """Replace top-of-book for a coin"""
+        bbo = dict(self.bbo)
+        bbo[coin] = {"bid": bid, "ask": ask, "time": time.time()}
+        with self._lock:
+            self.bbo = bbo
+
+    def refresh_mids(self):
+        """Fetch all_mids() over REST"""
+        self.update_mids(self.info.all_mids(), source='rest')
+        self.rest_polls += 1
+        return self.mids
+
+    def feed_healthy(self) -> bool:
+        """Websocket feed connected and its last push is within mids_max_age"""
+        age = self.mids_age()
+        return (self.feed is not None and self.feed.connected and self.mids_source == 'ws'
+                and age is not None and age < self.mids_max_age)
+
+    def idle(self) -> bool:
+        return time.time() - self.last_access > self.idle_after
+
+    def _touch(self):
+        """Record a read; wakes the refresh thread if it was idling"""
+        was_idle = self.idle()
+        self.last_access = time.time()
+        self.start()
+        if was_idle:
+            self._wake.set()
+
+    def meta_age(self):
+        return None if self.meta_updated is None else time.time() - self.meta_updated
+
+    def mids_age(self):
+        return None if self.mids_updated is None else time.time() - self.mids_updated
+
+    def get_asset(self, coin: str):
+        """Universe entry for a coin (None if unknown)"""
+        self._touch()
+        age = self.meta_age()
+        if age is None or age > self.meta_ttl * 2:
+            # Background refresh has not run or is falling behind
+            self.refresh_meta()
+        return self.assets.get(coin)
+
+    def get_sz_decimals(self, coin: str, default: int = 1) -> int:
+        asset = self.get_asset(coin)
+        return asset.get("szDecimals", default) if asset else default
+
+    def get_mid(self, coin: str, max_age: float = None) -> float:
+        """Mid price for a coin, refreshed synchronously if older than max_age (0 if unknown)"""
+        self._touch()
+        max_age = self.mids_max_age if max_age is None else max_age
+        age = self.mids_age()
+        if age is None or age > max_age:
+            self.refresh_mids()
+        return self.mids.get(coin, 0.0)
+
+    def start(self):
+        """Start the background refresh thread (idempotent; readers call it on first use)"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='hl-market-store', daemon=True)
+            self._thread.start()
+            if self.feed is not None:
+                self.feed.start()
+        logger.info(f"📈 Market metadata store started (meta TTL {self.meta_ttl}s, mids every {self.mids_refresh_interval}s)")
+
+    def stop(self):
+        """Stop the refresh thread and the websocket feed"""
+        self._stop.set()
+        self._wake.set()
+        if self.feed is not None:
+            self.feed.stop()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.idle():
+                # Nobody is reading: wait for the next reader instead of polling
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            try:
+                age = self.meta_age()
+                if age is None or age >= self.meta_ttl:
+                    self.refresh_meta()
+                age = self.mids_age()
+                if not self.feed_healthy() and (age is None or age >= self.mids_refresh_interval):
+                    # REST polling only while the websocket feed is off or stale
+                    self.refresh_mids()
+            except Exception as e:
+                logger.error(f"Market metadata refresh failed: {str(e)}")
+            # A healthy feed only needs checking once per staleness window
+            interval = self.mids_max_age if self.feed_healthy() else self.mids_refresh_interval
+            self._stop.wait(interval)
+
+    def stats(self):
+        return {
+            "coins": len(self.assets),
+            "metaAge": self.meta_age(),
+            "midsAge": self.mids_age(),
+            "midsSource": self.mids_source,
+            "restPolls": self.rest_polls,
+            "idle": self.idle(),
+            "feed": self.feed.stats() if self.feed is not None else None,
+        }
+
+class MidsFeed:
+    """
+    Websocket subscriber for the allMids (and optional l2Book) streams.
+    Pushes every update into a MarketMetadataStore and reconnects with
+    backoff. The URL is configurable (HYPERLIQUID_WS_URL) so the feed can
+    be pointed at a local websocket stand-in.
+    """
+
+    PING_INTERVAL = 50  # Hyperliquid drops idle connections after 60s
+
+    def __init__(self, store, url, l2_coins=None):
+        self.store = store
+        self.url = url
+        self.l2_coins = l2_coins or []
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self._ws = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='hl-mids-feed', daemon=True)
+        self._thread.start()
+        logger.info(f"🔌 Websocket price feed starting: {self.url} (l2: {self.l2_coins or 'none'})")
+
+    def stop(self, timeout=5):
+        """Close the connection and end the reconnect loop"""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=lambda ws, e: logger.error(f"Price feed error: {e}"),
+                on_close=self._on_close,
+            )
+            started = time.time()
+            if self._stop.is_set():  # stop() raced with the new connection
+                break
+            # ping_timeout bounds each select() so a stop() from another thread is
+            # noticed promptly; without ping_interval no websocket pings are sent
+            self._ws.run_forever(ping_timeout=1)
+            if self._stop.is_set():
+                break
+            # Reset backoff if the connection was up for a while
+            backoff = 1 if time.time() - started > 60 else min(backoff * 2, 30)
+            self.reconnects += 1
+            logger.warning(f"Price feed disconnected, reconnecting in {backoff}s")
+            self._stop.wait(backoff)
+        self.connected = False
+        logger.info("Price feed stopped")
+
+    def _on_open(self, ws):
+        self.connected = True
+        ws.send(json.dumps({"method": "subscribe", "subscription": {"type": "allMids"}}))
+        for coin in self.l2_coins:
+            ws.send(json.dumps({"method": "subscribe", "subscription": {"type": "l2Book", "coin": coin}}))
+        threading.Thread(target=self._keepalive, args=(ws,), name='hl-mids-ping', daemon=True).start()
+        logger.info("✅ Price feed connected")
+
+    def _keepalive(self, ws):
+        """Send application-level pings while this connection is open"""
+        while not self._stop.wait(self.PING_INTERVAL):
+            if ws is not self._ws or not self.connected:
+                return
+            try:
+                ws.send(json.dumps({"method": "ping"}))
+            except Exception:
+                return
+
+    def _on_close(self, ws, status_code=None, msg=None):
+        self.connected = False
+
+    def _on_message(self, ws, message):
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+        channel = msg.get("channel")
+        data = msg.get("data") or {}
+        if channel == "allMids":
+            self.messages += 1
+            self.store.update_mids(data.get("mids", {}), source='ws')
+        elif channel == "l2Book":
+            self.messages += 1
+            bids, asks = (data.get("levels") or [[], []])[:2]
+            if bids and asks:
+                self.store.update_bbo(data.get("coin"), float(bids[0]["px"]), float(asks[0]["px"]))
+
+    def stats(self):
+        return {"url": self.url, "connected": self.connected, "messages": self.messages, "reconnects": self.reconnects}
+
+market_store = MarketMetadataStore(info, META_TTL, MIDS_REFRESH_INTERVAL, MIDS_MAX_AGE, MARKET_IDLE_AFTER)
+if WS_PRICES_ENABLED:
+    market_store.feed = MidsFeed(market_store, WS_URL, WS_L2_COINS)
+
+# Exchange pool settings
+EXCHANGE_POOL_MAX_SIZE = int(os.environ.get('HYPERLIQUID_EXCHANGE_POOL_SIZE', 256))
+EXCHANGE_POOL_IDLE_TTL = float(os.environ.get('HYPERLIQUID_EXCHANGE_POOL_IDLE_TTL', 1800))  # seconds
+
+class ExchangePool:
+    """
+    LRU-bounded pool of Exchange clients keyed by a SHA-256 of
+    (agent key, account_address), so raw keys are never held as dict keys.
+    Entries unused for idle_ttl seconds are dropped on access. Each entry
+    remembers the market_store.meta_version it was built with and is rebuilt
+    from the current meta when the universe changes.
+    """
+
+    def __init__(self, max_size, idle_ttl):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.meta_refreshes = 0
+        self._entries = OrderedDict()  # key -> (exchange, last_used, meta_version)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(agent_private_key: str, account_address: str = None) -> str:
+        material = f"{agent_private_key.lower()}|{(account_address or '').lower()}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, agent_private_key: str, account_address: str = None) -> Exchange:
+        key = self.make_key(agent_private_key, account_address)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] != market_store.meta_version and market_store.meta is not None:
+                # New listings shift asset indices: replace the client rather than
+                # mutating its coin -> asset map while another thread may be signing
+                del self._entries[key]
+                entry = None
+                self.meta_refreshes += 1
+            if entry is not None:
+                self._entries[key] = (entry[0], now, entry[2])
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Build outside the lock - Exchange.__init__ may hit the network
+        version = market_store.meta_version
+        exchange = Exchange(
+            wallet=Account.from_key(agent_private_key),
+            base_url=BASE_URL,
+            meta=market_store.meta,  # reuse cached metadata when loaded
+            account_address=account_address  # If set, agent trades on behalf of this user
+        )
+        with self._lock:
+            self._entries[key] = (exchange, now, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return exchange
+
+    def _expire(self, now):
+        # Oldest entries are at the front
+        while self._entries:
+            key, (_, last_used, _) = next(iter(self._entries.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            del self._entries[key]
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "idleTtl": self.idle_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "metaRefreshes": self.meta_refreshes,
+        }
+
+exchange_pool = ExchangePool(EXCHANGE_POOL_MAX_SIZE, EXCHANGE_POOL_IDLE_TTL)
+
+# Shared user_state cache settings
+USER_STATE_TTL = float(os.environ.get('HYPERLIQUID_USER_STATE_TTL', 1.5))  # seconds
+USER_STATE_CACHE_SIZE = int(os.environ.get('HYPERLIQUID_USER_STATE_CACHE_SIZE', 10000))
+USER_STATE_WAIT_TIMEOUT = 15  # max wait on another caller's in-flight fetch
+
+class UserStateCache:
+    """
+    Short-TTL per-address cache of info.user_state() with single-flight
+    fetches: concurrent callers for the same address (threads or, in ASGI
+    mode, coroutines) share one upstream request. Writes for an address
+    call invalidate() so the next read is fresh.
+    """
+
+    def __init__(self, info_client, ttl, max_size):
+        self.info = info_client
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # lowercase address -> (state, fetched_at)
+        self._inflight = {}  # lowercase address -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def _lookup(self, key):
+        """Cached state, or (future, is_leader) for the fetch to wait on; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            self.hits += 1
+            return entry[0], None, False
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return None, future, False
+        self.misses += 1
+        future = Future()
+        self._inflight[key] = future
+        return None, future, True
+
+    def _complete(self, key, future, state=None, error=None):
+        with self._lock:
+            # Only cache if no write invalidated the address while the fetch was in flight
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                if error is None:
+                    self._entries[key] = (state, time.time())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        if future.done():  # defensive: waiters must never resolve the shared future
+            return
+        if error is None:
+            future.set_result(state)
+        else:
+            future.set_exception(error)
+
+    def get(self, address: str) -> dict:
+        key = address.lower()
+        with self._lock:
+            state, future, leader = self._lookup(key)
+        if future is None:
+            return state
+        if not leader:
+            return future.result(USER_STATE_WAIT_TIMEOUT)
+        try:
+            state = self.info.user_state(address)
+        except BaseException as e:  # never leave followers waiting on an abandoned fetch
+            self._complete(key, future, error=e)
+            raise
+        self._complete(key, future, state)
+        return state
+
+    async def get_async(self, address: str, fetch) -> dict:
+        """Async variant; fetch(address) is a coroutine function doing the upstream call"""
+        key = address.lower()
+        with self._lock:
+            state, future, leader = self._lookup(key)
+        if future is None:
+            return state
+        if not leader:
+            # shield: a follower timing out must not cancel the future other callers share
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), USER_STATE_WAIT_TIMEOUT)
+        try:
+            state = await fetch(address)
+        except BaseException as e:  # includes cancellation
+            self._complete(key, future, error=e)
+            raise
+        self._complete(key, future, state)
+        return state
+
+    def invalidate(self, *addresses):
+        with self._lock:
+            for address in addresses:
+                if not address:
+                    continue
+                key = address.lower()
+                self._entries.pop(key, None)
+                self._inflight.pop(key, None)
+                self.invalidations += 1
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
+
+user_state_cache = UserStateCache(info, USER_STATE_TTL, USER_STATE_CACHE_SIZE)
+
+# Local fill store settings (used by /user-fills)
+FILLS_DB_PATH = os.environ.get(
+    'HYPERLIQUID_FILLS_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'hyperliquid-fills.db')
+)
+FILLS_SYNC_INTERVAL = float(os.environ.get('HYPERLIQUID_FILLS_SYNC_INTERVAL', 5))  # min seconds between upstream syncs
+FILLS_UPSTREAM_PAGE = 2000  # user_fills_by_time returns at most this many fills
+FILLS_DEFAULT_LIMIT = 500
+FILLS_MAX_LIMIT = 2000
+FILLS_LOCK_STRIPES = 64  # sync locks shared by hashed address, so memory stays fixed
+
+class FillStore:
+    """
+    Append-only SQLite store of user fills, deduplicated by (address, tid).
+    sync() pulls only fills newer than the last stored time via
+    user_fills_by_time (at most once per FILLS_SYNC_INTERVAL per address);
+    page() serves them in (time, tid) order behind an opaque cursor.
+    The connection is opened lazily in each process, so a store created in a
+    preloading gunicorn master is never shared by forked workers.
+    """
+
+    def __init__(self, info_client, path, sync_interval):
+        self.info = info_client
+        self.path = path
+        self.sync_interval = sync_interval
+        self._connection = None
+        self._pid = None  # process that opened _connection
+        self._lock = threading.Lock()  # guards the connection
+        self._address_locks = [threading.Lock() for _ in range(FILLS_LOCK_STRIPES)]
+        self.upstream_calls = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """This process's connection (callers hold _lock)"""
+        if self._pid != os.getpid():
+            self._connection = self._open()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS fills (
+                address TEXT NOT NULL,
+                tid INTEGER NOT NULL,
+                time INTEGER NOT NULL,
+                coin TEXT,
+                side TEXT,
+                px TEXT,
+                sz TEXT,
+                closed_pnl TEXT,
+                fee TEXT,
+                oid INTEGER,
+                PRIMARY KEY (address, tid)
+            );
+            CREATE INDEX IF NOT EXISTS fills_by_time ON fills (address, time, tid);
+            CREATE TABLE IF NOT EXISTS fill_sync (
+                address TEXT PRIMARY KEY,
+                last_time INTEGER NOT NULL,
+                synced_at REAL NOT NULL
+            );
+        """)
+        return db
+
+    def _address_lock(self, key):
+        """Sync lock for an address (striped: unrelated addresses may share one)"""
+        return self._address_locks[hash(key) % len(self._address_locks)]
+
+    def _insert(self, key, fills):
+        rows = [
+            (key, f["tid"], f["time"], f["coin"], f["side"], f["px"], f["sz"], f["closedPnl"], f["fee"], f["oid"])
+            for f in format_fills(fills) if f.get("tid") is not None
+        ]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR IGNORE INTO fills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def sync(self, address: str):
+        """Fetch fills newer than the last stored one (no-op if synced recently)"""
+        key = address.lower()
+        with self._address_lock(key):
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT last_time, synced_at FROM fill_sync WHERE address = ?", (key,)
+                ).fetchone()
+            if row and time.time() - row[1] < self.sync_interval:
+                return
+            start = row[0] if row else 0
+            while True:
+                self.upstream_calls += 1
+                page = self.info.user_fills_by_time(address, start)
+                if not page:
+                    break
+                self._insert(key, page)
+                page_max = max(fill["time"] for fill in page)
+                if len(page) < FILLS_UPSTREAM_PAGE or page_max <= start:
+                    break
+                start = page_max  # inclusive; duplicates are ignored by tid
+            with self._lock, self._db:
+                last_time = self._db.execute(
+                    "SELECT COALESCE(MAX(time), 0) FROM fills WHERE address = ?", (key,)
+                ).fetchone()[0]
+                self._db.execute(
+                    "INSERT OR REPLACE INTO fill_sync VALUES (?, ?, ?)", (key, last_time, time.time())
+                )
+
+    def page(self, address: str, since_time: int = None, cursor: str = None, limit: int = FILLS_DEFAULT_LIMIT):
+        """Fills after cursor (or at/after since_time) in ascending order; returns (fills, next_cursor, has_more)"""
+        key = address.lower()
+        if cursor:
+            cursor_time, cursor_tid = (int(part) for part in cursor.split(':'))
+            where = "address = ? AND (time > ? OR (time = ? AND tid > ?))"
+            params = (key, cursor_time, cursor_time, cursor_tid)
+        else:
+            where = "address = ? AND time >= ?"
+            params = (key, since_time or 0)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM fills WHERE {where} ORDER BY time, tid LIMIT ?", params + (limit + 1,)
+            ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1][2]}:{rows[-1][1]}" if rows else cursor
+        return [self._to_fill(row) for row in rows], next_cursor, has_more
+
+    def latest(self, address: str, limit: int = FILLS_MAX_LIMIT) -> list:
+        """Most recent fills first (the shape of the legacy full-history response)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM fills WHERE address = ? ORDER BY time DESC, tid DESC LIMIT ?", (address.lower(), limit)
+            ).fetchall()
+        return [self._to_fill(row) for row in rows]
+
+    @staticmethod
+    def _to_fill(row) -> dict:
+        _, tid, fill_time, coin, side, px, sz, closed_pnl, fee, oid = row
+        return {
+            "coin": coin,
+            "side": side,
+            "px": px,
+            "sz": sz,
+            "time": fill_time,
+            "closedPnl": closed_pnl,
+            "fee": fee,
+            "tid": tid,
+            "oid": oid,
+        }
+
+    def stats(self):
+        with self._lock:
+            addresses, fills = self._db.execute("SELECT COUNT(DISTINCT address), COUNT(*) FROM fills").fetchone()
+        return {
+            "addresses": addresses,
+            "fills": fills,
+            "upstreamCalls": self.upstream_calls,
+        }
+
+fill_store = FillStore(info, FILLS_DB_PATH, FILLS_SYNC_INTERVAL)
+
+def user_fills_response(data: dict):
+    """
+    /user-fills body and status (shared by the Flask and ASGI handlers)
+    Without sinceTime/cursor returns the most recent fills (newest first) as before;
+    with them returns the next page in time order plus nextCursor/hasMore.
+    """
+    address = data.get('address')
+    if not address:
+        return {"error": "address required"}, 400
+    
+    since_time = data.get('sinceTime')
+    cursor = data.get('cursor')
+    try:
+        limit = min(int(data.get('limit', FILLS_DEFAULT_LIMIT)), FILLS_MAX_LIMIT)
+        since_time = int(since_time) if since_time is not None else None
+        if cursor:
+            cursor_time, cursor_tid = cursor.split(':')
+            int(cursor_time), int(cursor_tid)
+    except (TypeError, ValueError):
+        return {"success": False, "error": "Invalid sinceTime, cursor or limit"}, 400
+    
+    # Pull only new fills from Hyperliquid; serve what is stored if that fails
+    stale = False
+    try:
+        fill_store.sync(address)
+    except Exception as e:
+        logger.warning(f"Fill sync failed for {address}, serving stored fills: {str(e)}")
+        stale = True
+    
+    if since_time is None and not cursor:
+        fills = fill_store.latest(address)
+        next_cursor = f"{fills[0]['time']}:{fills[0]['tid']}" if fills else None
+        return {"success": True, "fills": fills, "nextCursor": next_cursor, "hasMore": False, "stale": stale}, 200
+    
+    fills, next_cursor, has_more = fill_store.page(address, since_time, cursor, limit)
+    return {"success": True, "fills": fills, "nextCursor": next_cursor, "hasMore": has_more, "stale": stale}, 200
+
 def get_exchange_for_agent(agent_private_key: str, vault_address: str = None) -> Exchange:
-    """Create Exchange instance for an agent wallet (optionally trading on behalf of a user)"""
-    account = Account.from_key(agent_private_key)
+    """Get a pooled Exchange instance for an agent wallet (optionally trading on behalf of a user)"""
     # Use account_address for agent delegation to regular accounts
     # vault_address is for Hyperliquid's managed vault products
-    return Exchange(
-        wallet=account,
-        base_url=BASE_URL,
-        account_address=vault_address  # If set, agent trades on behalf of this user
-    )
+    return exchange_pool.get(agent_private_key, vault_address)
+
+def agent_not_approved(error_msg: str) -> bool:
+    """Hyperliquid rejects orders from unapproved agents with these messages"""
+    return 'not registered' in error_msg.lower() or 'vault' in error_msg.lower()
+
+def round_order_price(px: float, sz_decimals: int) -> float:
+    """5 significant figures and at most (6 - szDecimals) decimals, as the SDK does for perps"""
+    return round(float(f"{px:.5g}"), 6 - sz_decimals)
+
+def build_order_request(order: dict) -> dict:
+    """
+    SDK OrderRequest for one /orders/batch entry
+    Same pricing as /open-position: an IOC limit at mid (or limitPx) +/- slippage
+    Raises ValueError for invalid orders
+    """
+    coin = order.get('coin')
+    is_buy = order.get('isBuy')
+    size = order.get('size')
+    if not coin or is_buy is None or size is None:
+        raise ValueError("Missing required fields: coin, isBuy, size")
+    if not isinstance(is_buy, bool):
+        raise ValueError("isBuy must be a boolean")
+    if market_store.get_asset(coin) is None:
+        raise ValueError(f"Unknown coin: {coin}")
+    
+    sz_decimals = market_store.get_sz_decimals(coin)
+    rounded_size = round(float(size), sz_decimals)
+    if rounded_size <= 0:
+        raise ValueError(f"Size {size} rounds to zero ({sz_decimals} decimals)")
+    
+    base_px = order.get('limitPx') or market_store.get_mid(coin)
+    if not base_px:
+        raise ValueError(f"Could not get price for {coin}")
+    slippage = float(order.get('slippage', 0.01))
+    limit_px = float(base_px) * (1 + slippage if is_buy else 1 - slippage)
+    
+    return {
+        "coin": coin,
+        "is_buy": is_buy,
+        "sz": rounded_size,
+        "limit_px": round_order_price(limit_px, sz_decimals),
+        "order_type": {"limit": {"tif": order.get('tif', 'Ioc')}},
+        "reduce_only": bool(order.get('reduceOnly', False)),
+    }
+
+def parse_order_status(status_item: dict, vault_address: str = None) -> dict:
+    """Per-order result from one entry of an exchange response's statuses"""
+    if 'error' in status_item:
+        error_msg = status_item.get('error', 'Unknown error')
+        if agent_not_approved(error_msg):
+            return {
+                "success": False,
+                "status": "error",
+                "error": f"Agent not approved for account {vault_address}. Please approve the agent on Hyperliquid first.",
+                "hyperliquid_error": error_msg
+            }
+        return {"success": False, "status": "error", "error": error_msg}
+    if 'filled' in status_item:
+        filled = status_item['filled']
+        return {
+            "success": True,
+            "status": "filled",
+            "oid": filled.get('oid'),
+            "totalSz": filled.get('totalSz'),
+            "avgPx": filled.get('avgPx')
+        }
+    if 'resting' in status_item:
+        return {"success": True, "status": "resting", "oid": status_item['resting'].get('oid')}
+    return {"success": True, "status": "unknown", "raw": status_item}
+
+def submit_signer_orders(agent_private_key: str, vault_address: str, indexed_orders: list) -> list:
+    """Send one signer's orders as a single bulk_orders action; returns [(index, result)]"""
+    try:
+        exchange = get_exchange_for_agent(agent_private_key, vault_address)
+        with get_signer_lock(exchange.wallet.address):
+            response = exchange.bulk_orders([order for _, order in indexed_orders])
+    except Exception as e:
+        logger.error(f"Bulk order submission failed: {str(e)}")
+        return [(index, {"coin": order["coin"], "success": False, "status": "error", "error": str(e)})
+                for index, order in indexed_orders]
+    
+    user_state_cache.invalidate(vault_address or exchange.wallet.address)
+    
+    if not isinstance(response, dict) or response.get('status') != 'ok':
+        error_msg = str(response.get('response') if isinstance(response, dict) else response)
+        return [(index, {"coin": order["coin"], "success": False, "status": "error", "error": error_msg})
+                for index, order in indexed_orders]
+    
+    statuses = response.get('response', {}).get('data', {}).get('statuses', [])
+    results = []
+    for position, (index, order) in enumerate(indexed_orders):
+        if position < len(statuses):
+            result = parse_order_status(statuses[position], vault_address)
+        else:
+            result = {"success": False, "status": "error", "error": "No status returned for order"}
+        results.append((index, {"coin": order["coin"], **result}))
+    return results
+
+def size_follower_order(sizing: dict, user_address: str, mid: float):
+    """
+    (coin size, collateral USD) for one follower, mirroring trade-executor.ts:
+    'fixed-usdc' uses sizing.value USD, otherwise sizing.value percent of the
+    user's withdrawable balance; at least MIN_ORDER_USD, never more than the balance
+    """
+    withdrawable = float(user_state_cache.get(user_address).get("withdrawable", 0))
+    min_usd = float(sizing.get('minUsd', MIN_ORDER_USD))
+    if withdrawable < min_usd:
+        raise ValueError(f"Insufficient balance. Available: ${withdrawable:.2f}, Required: ${min_usd:.2f}")
+    
+    value = float(sizing.get('value', 5))
+    if sizing.get('type') == 'fixed-usdc':
+        collateral = value
+    else:
+        collateral = withdrawable * value / 100
+    collateral = max(collateral, min_usd)
+    if collateral > withdrawable:
+        raise ValueError(f"Insufficient balance for trade. Available: ${withdrawable:.2f}, Required: ${collateral:.2f}")
+    
+    leverage = float(sizing.get('leverage', 1))
+    return collateral * leverage / mid, collateral
+
+def execute_signer_fanout(signal: dict, agent_private_key: str, user_address: str, indexed_executions: list) -> list:
+    """Size and place one signer's share of a signal as a single bulk action; returns result dicts"""
+    coin = signal['coin']
+    results = {}
+    indexed_orders = []
+    for index, execution in indexed_executions:
+        base = {"index": index, "id": execution.get('id'), "coin": coin}
+        try:
+            if execution.get('size') is not None:
+                size, collateral = float(execution['size']), None
+            else:
+                size, collateral = size_follower_order(signal['sizing'], user_address, signal['mid'])
+            order_request = build_order_request({
+                "coin": coin,
+                "isBuy": signal['isBuy'],
+                "size": size,
+                "limitPx": signal.get('limitPx'),
+                "slippage": signal.get('slippage', 0.01),
+            })
+            results[index] = {**base, "size": order_request["sz"], "collateral": collateral}
+            indexed_orders.append((index, order_request))
+        except Exception as e:
+            results[index] = {**base, "success": False, "status": "error", "error": str(e)}
+    
+    if indexed_orders:
+        for index, result in submit_signer_orders(agent_private_key, user_address, indexed_orders):
+            results[index].update(result)
+    return [results[index] for index, _ in indexed_executions]
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -55,7 +995,11 @@ def health():
         "status": "ok",
         "service": "hyperliquid",
         "network": "testnet" if IS_TESTNET else "mainnet",
-        "baseUrl": BASE_URL
+        "baseUrl": BASE_URL,
+        "marketStore": market_store.stats(),
+        "exchangePool": exchange_pool.stats(),
+        "userStateCache": user_state_cache.stats(),
+        "fillStore": fill_store.stats()
     })
 
 @app.route('/balance', methods=['POST'])
@@ -69,15 +1013,9 @@ def get_balance():
             return jsonify({"error": "address required"}), 400
         
         # Get clearinghouse state
-        state = info.user_state(address)
+        state = user_state_cache.get(address)
         
-        return jsonify({
-            "success": True,
-            "withdrawable": float(state.get("withdrawable", 0)),
-            "accountValue": float(state.get("marginSummary", {}).get("accountValue", 0)),
-            "totalNtlPos": float(state.get("marginSummary", {}).get("totalNtlPos", 0)),
-            "totalRawUsd": float(state.get("marginSummary", {}).get("totalRawUsd", 0))
-        })
+        return jsonify(format_balance(state))
     except Exception as e:
         logger.error(f"Error getting balance: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -93,21 +1031,8 @@ def get_positions():
             return jsonify({"error": "address required"}), 400
         
         # Get user state
-        state = info.user_state(address)
-        positions = state.get("assetPositions", [])
-        
-        formatted_positions = []
-        for pos in positions:
-            position = pos.get("position", {})
-            formatted_positions.append({
-                "coin": position.get("coin"),
-                "szi": position.get("szi"),  # Size (positive = long, negative = short)
-                "entryPx": position.get("entryPx"),
-                "positionValue": position.get("positionValue"),
-                "unrealizedPnl": position.get("unrealizedPnl"),
-                "liquidationPx": position.get("liquidationPx"),
-                "leverage": position.get("leverage", {}).get("value", "1")
-            })
+        state = user_state_cache.get(address)
+        formatted_positions = format_positions(state)
         
         return jsonify({
             "success": True,
@@ -117,6 +1042,57 @@ def get_positions():
         logger.error(f"Error getting positions: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/positions/batch', methods=['POST'])
+def get_positions_batch():
+    """
+    Get open positions for many addresses in one call
+    Body: { "addresses": ["0x...", "0x...", ...] }
+    user_state calls are fanned out over a bounded worker pool;
+    a failure for one address does not fail the whole batch.
+    """
+    try:
+        data = request.json or {}
+        addresses = data.get('addresses')
+        
+        if not addresses or not isinstance(addresses, list):
+            return jsonify({"success": False, "error": "addresses (list) required"}), 400
+        
+        if len(addresses) > POSITIONS_BATCH_MAX_ADDRESSES:
+            return jsonify({
+                "success": False,
+                "error": f"Too many addresses (max {POSITIONS_BATCH_MAX_ADDRESSES})"
+            }), 400
+        
+        # De-duplicate while keeping request order
+        unique_addresses = list(dict.fromkeys(addresses))
+        
+        def fetch(address):
+            try:
+                state = user_state_cache.get(address)
+                return address, {"success": True, "positions": format_positions(state)}
+            except Exception as e:
+                logger.error(f"Error getting positions for {address}: {str(e)}")
+                return address, {"success": False, "error": str(e)}
+        
+        started = time.time()
+        results = dict(batch_executor.map(fetch, unique_addresses))
+        failed = sum(1 for r in results.values() if not r["success"])
+        
+        logger.info(
+            f"Batch positions: {len(unique_addresses)} addresses, {failed} failed "
+            f"in {time.time() - started:.2f}s"
+        )
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "count": len(unique_addresses),
+            "failed": failed
+        })
+    except Exception as e:
+        logger.error(f"Error getting batch positions: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/market-info', methods=['POST'])
 def get_market_info():
     """Get market info for a specific coin"""
@@ -127,28 +1103,36 @@ def get_market_info():
         if not coin:
             return jsonify({"error": "coin required"}), 400
         
-        # Get all markets metadata
-        meta = info.meta()
-        all_mids = info.all_mids()
+        # Return every market when coin == 'ALL'
+        if coin == 'ALL':
+            market_store.get_asset(coin)  # ensure meta is loaded
+            markets = {
+                name: {
+                    "coin": name,
+                    "price": market_store.get_mid(name),
+                    "szDecimals": asset.get("szDecimals", 0),
+                    "maxLeverage": asset.get("maxLeverage", 0),
+                    "onlyIsolated": asset.get("onlyIsolated", False)
+                }
+                for name, asset in market_store.assets.items()
+            }
+            return jsonify({"success": True, "markets": markets})
         
-        # Find the coin
-        universe = meta.get("universe", [])
-        coin_info = None
-        for asset in universe:
-            if asset.get("name") == coin:
-                coin_info = asset
-                break
+        coin_info = market_store.get_asset(coin)
         
         if not coin_info:
             return jsonify({"success": False, "error": f"Market not found for {coin}"}), 404
         
         # Get current price
-        current_price = float(all_mids.get(coin, 0))
+        current_price = market_store.get_mid(coin)
+        bbo = market_store.bbo.get(coin)
         
         return jsonify({
             "success": True,
             "coin": coin,
             "price": current_price,
+            "bestBid": bbo["bid"] if bbo else None,
+            "bestAsk": bbo["ask"] if bbo else None,
             "szDecimals": coin_info.get("szDecimals", 0),
             "maxLeverage": coin_info.get("maxLeverage", 0),
             "onlyIsolated": coin_info.get("onlyIsolated", False)
@@ -177,36 +1161,22 @@ def open_position():
                 "error": "Missing required fields: agentPrivateKey, coin, isBuy, size"
             }), 400
         
+        if not isinstance(is_buy, bool):
+            return jsonify({"success": False, "error": "isBuy must be a boolean"}), 400
+        
         # Create exchange instance for agent wallet (with optional delegation)
         exchange = get_exchange_for_agent(agent_private_key, vault_address)
         
         if vault_address:
             logger.info(f"Agent trading on behalf of vault: {vault_address}")
             
-            # CRITICAL: Verify agent is approved for this account BEFORE trading
-            try:
-                agent_account = Account.from_key(agent_private_key)
-                agent_address = agent_account.address
-                
-                # Check if agent is approved by querying user state
-                user_state = info.user_state(vault_address)
-                
-                # For now, we'll proceed but log a warning
-                # The trade will fail on Hyperliquid's side if not approved
-                logger.warning(f"⚠️  Attempting trade for {vault_address} with agent {agent_address}")
-                logger.warning(f"⚠️  If agent is not approved, trade will be REJECTED by Hyperliquid")
-            except Exception as e:
-                logger.error(f"Could not verify agent approval: {e}")
-                # Continue anyway - let Hyperliquid reject if needed
+            # Approval isn't checked up front (user_state doesn't report it);
+            # the trade will fail on Hyperliquid's side if not approved
+            logger.warning(f"⚠️  Attempting trade for {vault_address} with agent {exchange.wallet.address}")
+            logger.warning(f"⚠️  If agent is not approved, trade will be REJECTED by Hyperliquid")
         
         # Get market metadata for size decimals
-        meta = info.meta()
-        universe = meta.get("universe", [])
-        sz_decimals = 1  # default
-        for asset in universe:
-            if asset.get("name") == coin:
-                sz_decimals = asset.get("szDecimals", 1)
-                break
+        sz_decimals = market_store.get_sz_decimals(coin)
         
         # Round size to proper decimals
         rounded_size = round(float(size), sz_decimals)
@@ -214,8 +1184,7 @@ def open_position():
         
         # Get current price for market orders
         if limit_px is None:
-            all_mids = info.all_mids()
-            current_price = float(all_mids.get(coin, 0))
+            current_price = market_store.get_mid(coin)
             if current_price == 0:
                 return jsonify({
                     "success": False,
@@ -228,16 +1197,18 @@ def open_position():
             else:
                 limit_px = current_price * (1 - slippage)
         
-        # Place order
-        order_result = exchange.market_open(
-            name=coin,  # Parameter is 'name', not 'coin'
-            is_buy=is_buy,
-            sz=rounded_size,  # Use rounded size
-            px=limit_px,
-            slippage=slippage
-        )
+        # Place order (serialized per signer within this worker, like /orders/batch)
+        with get_signer_lock(exchange.wallet.address):
+            order_result = exchange.market_open(
+                name=coin,  # Parameter is 'name', not 'coin'
+                is_buy=is_buy,
+                sz=rounded_size,  # Use rounded size
+                px=limit_px,
+                slippage=slippage
+            )
         
         logger.info(f"Order placed: {order_result}")
+        user_state_cache.invalidate(vault_address or exchange.wallet.address)
         
         # Check if order was actually filled
         if isinstance(order_result, dict):
@@ -252,7 +1223,7 @@ def open_position():
                     logger.error(f"❌ Trade REJECTED by Hyperliquid: {error_msg}")
                     
                     # Check for agent approval errors
-                    if 'not registered' in error_msg.lower() or 'vault' in error_msg.lower():
+                    if agent_not_approved(error_msg):
                         return jsonify({
                             "success": False,
                             "error": f"Agent not approved for account {vault_address}. Please approve the agent on Hyperliquid first.",
@@ -272,6 +1243,198 @@ def open_position():
         logger.error(f"Error opening position: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/orders/batch', methods=['POST'])
+def place_orders_batch():
+    """
+    Place many orders with one signed bulk_orders action per signer
+    Body: {
+        "orders": [
+            { "agentPrivateKey": "0x...", "vaultAddress": "0x...", "coin": "BTC",
+              "isBuy": true, "size": 0.01, "limitPx": null, "slippage": 0.01,
+              "reduceOnly": false, "tif": "Ioc" },
+            ...
+        ]
+    }
+    Different signers are submitted in parallel; results come back in
+    request order with the same status parsing as /open-position.
+    """
+    try:
+        data = request.json or {}
+        orders = data.get('orders')
+        
+        if not orders or not isinstance(orders, list):
+            return jsonify({"success": False, "error": "orders (list) required"}), 400
+        
+        if len(orders) > ORDERS_BATCH_MAX_ORDERS:
+            return jsonify({
+                "success": False,
+                "error": f"Too many orders (max {ORDERS_BATCH_MAX_ORDERS})"
+            }), 400
+        
+        results = [None] * len(orders)
+        groups = OrderedDict()  # (agent key, vault address) -> [(index, order request)]
+        for index, order in enumerate(orders):
+            try:
+                if not isinstance(order, dict) or not order.get('agentPrivateKey'):
+                    raise ValueError("Missing required field: agentPrivateKey")
+                order_request = build_order_request(order)
+            except ValueError as e:
+                results[index] = {"coin": order.get('coin') if isinstance(order, dict) else None,
+                                  "success": False, "status": "error", "error": str(e)}
+                continue
+            group_key = (order['agentPrivateKey'], order.get('vaultAddress'))
+            groups.setdefault(group_key, []).append((index, order_request))
+        
+        started = time.time()
+        futures = [
+            fanout_executor.submit(submit_signer_orders, agent_key, vault_address, indexed_orders)
+            for (agent_key, vault_address), indexed_orders in groups.items()
+        ]
+        for future in futures:
+            for index, result in future.result():
+                results[index] = result
+        
+        for index, result in enumerate(results):
+            result["index"] = index
+        failed = sum(1 for r in results if not r["success"])
+        
+        logger.info(
+            f"Batch orders: {len(orders)} orders across {len(groups)} signers, {failed} failed "
+            f"in {time.time() - started:.2f}s"
+        )
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "count": len(orders),
+            "signers": len(groups),
+            "failed": failed
+        })
+    except Exception as e:
+        logger.error(f"Error placing batch orders: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/signals/fanout', methods=['POST'])
+def fanout_signal():
+    """
+    Execute one signal for many followers
+    Body: {
+        "coin": "BTC",
+        "isBuy": true,
+        "sizing": { "type": "fixed-usdc" | "balance-percentage", "value": 5, "leverage": 3 },
+        "slippage": 0.01,
+        "limitPx": null,
+        "executions": [
+            { "id": "<deploymentId>", "agentPrivateKey": "0x...", "userAddress": "0x...", "size": null },
+            ...
+        ],
+        "stream": true
+    }
+    Executions are grouped per (agent, user) signer and each group is sized
+    and sent as one bulk_orders action; groups run on a bounded pool, one
+    action at a time per signing wallet in this worker. With "stream" (default) results are
+    streamed as NDJSON lines as each group completes, followed by a summary
+    line {"done": true, ...}; otherwise one JSON response is returned.
+    """
+    try:
+        data = request.json or {}
+        coin = data.get('coin')
+        is_buy = data.get('isBuy')
+        executions = data.get('executions')
+        
+        if not coin or is_buy is None or not isinstance(executions, list) or not executions:
+            return jsonify({
+                "success": False,
+                "error": "Missing required fields: coin, isBuy, executions (list)"
+            }), 400
+        
+        if not isinstance(is_buy, bool):
+            return jsonify({"success": False, "error": "isBuy must be a boolean"}), 400
+        
+        if len(executions) > FANOUT_MAX_EXECUTIONS:
+            return jsonify({
+                "success": False,
+                "error": f"Too many executions (max {FANOUT_MAX_EXECUTIONS})"
+            }), 400
+        
+        if market_store.get_asset(coin) is None:
+            return jsonify({"success": False, "error": f"Unknown coin: {coin}"}), 400
+        
+        mid = market_store.get_mid(coin)
+        if mid == 0:
+            return jsonify({"success": False, "error": f"Could not get price for {coin}"}), 400
+        
+        signal = {
+            "coin": coin,
+            "isBuy": is_buy,
+            "sizing": data.get('sizing') or {},
+            "slippage": data.get('slippage', 0.01),
+            "limitPx": data.get('limitPx'),
+            "mid": mid,
+        }
+        
+        invalid = []
+        groups = OrderedDict()  # (agent key, user address) -> [(index, execution)]
+        for index, execution in enumerate(executions):
+            if not isinstance(execution, dict) or not execution.get('agentPrivateKey') or not execution.get('userAddress'):
+                invalid.append({
+                    "index": index,
+                    "id": execution.get('id') if isinstance(execution, dict) else None,
+                    "coin": coin,
+                    "success": False,
+                    "status": "error",
+                    "error": "Missing required fields: agentPrivateKey, userAddress"
+                })
+                continue
+            group_key = (execution['agentPrivateKey'], execution['userAddress'])
+            groups.setdefault(group_key, []).append((index, execution))
+        
+        started = time.time()
+        futures = {
+            fanout_executor.submit(execute_signer_fanout, signal, agent_key, user_address, indexed_executions): indexed_executions
+            for (agent_key, user_address), indexed_executions in groups.items()
+        }
+        logger.info(f"Signal fan-out: {coin} {'long' if is_buy else 'short'} for {len(executions)} executions across {len(groups)} signers")
+        
+        def group_results(future):
+            try:
+                return future.result()
+            except Exception as e:
+                # execute_signer_fanout reports per-order errors itself; this only guards bugs
+                logger.error(f"Fan-out group failed: {str(e)}")
+                return [
+                    {"index": index, "id": execution.get('id'), "coin": coin, "success": False, "status": "error", "error": str(e)}
+                    for index, execution in futures[future]
+                ]
+        
+        def summary(failed):
+            elapsed = time.time() - started
+            logger.info(f"Signal fan-out done: {len(executions)} executions, {failed} failed in {elapsed:.2f}s")
+            return {"done": True, "count": len(executions), "signers": len(groups), "failed": failed, "elapsed": elapsed}
+        
+        if not data.get('stream', True):
+            results = list(invalid)
+            for future in futures:
+                results.extend(group_results(future))
+            results.sort(key=lambda r: r["index"])
+            failed = sum(1 for r in results if not r.get("success"))
+            return jsonify({"success": True, "results": results, **summary(failed)})
+        
+        def generate():
+            failed = len(invalid)
+            for result in invalid:
+                yield json.dumps(result) + "\n"
+            for future in as_completed(futures):
+                for result in group_results(future):
+                    failed += 0 if result.get("success") else 1
+                    yield json.dumps(result) + "\n"
+            yield json.dumps(summary(failed)) + "\n"
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    except Exception as e:
+        logger.error(f"Error fanning out signal: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/close-position', methods=['POST'])
 def close_position():
     """Close a perpetual position on Hyperliquid"""
@@ -293,8 +1456,8 @@ def close_position():
         exchange = get_exchange_for_agent(agent_private_key, vault_address)
         
         # Get current position to determine direction and size
-        user_address = vault_address if vault_address else Account.from_key(agent_private_key).address
-        state = info.user_state(user_address)
+        user_address = vault_address if vault_address else exchange.wallet.address
+        state = user_state_cache.get(user_address)
         positions = state.get("assetPositions", [])
         
         current_position = None
@@ -326,8 +1489,7 @@ def close_position():
         logger.info(f"Closing {coin} position: current_size={current_size}, close_size={size}, is_buy={is_buy}")
         
         # Get current price
-        all_mids = info.all_mids()
-        current_price = float(all_mids.get(coin, 0))
+        current_price = market_store.get_mid(coin)
         
         # Apply slippage
         if is_buy:
@@ -336,14 +1498,16 @@ def close_position():
             limit_px = current_price * (1 - slippage)
         
         # Close position using market_close (cleaner than market_open with reduce_only)
-        order_result = exchange.market_close(
-            coin=coin,
-            sz=abs(float(size)) if size else None,  # None = close full position
-            px=limit_px,
-            slippage=slippage
-        )
+        with get_signer_lock(exchange.wallet.address):
+            order_result = exchange.market_close(
+                coin=coin,
+                sz=abs(float(size)) if size else None,  # None = close full position
+                px=limit_px,
+                slippage=slippage
+            )
         
         logger.info(f"Position closed: {order_result}")
+        user_state_cache.invalidate(user_address)
         
         return jsonify({
             "success": True,
@@ -355,36 +1519,14 @@ def close_position():
 
 @app.route('/user-fills', methods=['POST'])
 def get_user_fills():
-    """Get historical fills (trades) for a user including closed PnL"""
+    """
+    Get historical fills (trades) for a user including closed PnL
+    Body: { "address": "0x...", "sinceTime": 1700000000000, "cursor": "<nextCursor>", "limit": 500 }
+    sinceTime/cursor/limit are optional; see user_fills_response()
+    """
     try:
-        data = request.json
-        address = data.get('address')
-        
-        if not address:
-            return jsonify({"error": "address required"}), 400
-        
-        # Get user fills from Hyperliquid
-        fills = info.user_fills(address)
-        
-        # Format fills with PnL data
-        formatted_fills = []
-        for fill in fills:
-            formatted_fills.append({
-                "coin": fill.get("coin"),
-                "side": fill.get("side"),  # "A" = long/buy, "B" = short/sell
-                "px": fill.get("px"),  # Fill price
-                "sz": fill.get("sz"),  # Fill size
-                "time": fill.get("time"),  # Timestamp
-                "closedPnl": fill.get("closedPnl", "0"),  # PnL from closing position
-                "fee": fill.get("fee"),
-                "tid": fill.get("tid"),  # Trade ID
-                "oid": fill.get("oid"),  # Order ID
-            })
-        
-        return jsonify({
-            "success": True,
-            "fills": formatted_fills
-        })
+        body, status = user_fills_response(request.json or {})
+        return jsonify(body), status
     except Exception as e:
         logger.error(f"Error getting user fills: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -417,6 +1559,7 @@ def vault_deposit():
         })
         
         logger.info(f"Vault deposit: {result}")
+        user_state_cache.invalidate(exchange.wallet.address, vault_address)
         
         return jsonify({
             "success": True,
@@ -452,6 +1595,7 @@ def vault_withdraw():
         })
         
         logger.info(f"Vault withdraw: {result}")
+        user_state_cache.invalidate(exchange.wallet.address, vault_address)
         
         return jsonify({
             "success": True,
@@ -476,20 +1620,12 @@ def vault_balance():
             }), 400
         
         # Get vault state
-        state = info.user_state(address)
-        
-        # Find vault balance
-        vault_balance = 0
-        if 'vaultEquities' in state:
-            for vault_equity in state['vaultEquities']:
-                if vault_equity.get('vault') == vault_address:
-                    vault_balance = float(vault_equity.get('equity', 0))
-                    break
+        state = user_state_cache.get(address)
         
         return jsonify({
             "success": True,
             "vaultAddress": vault_address,
-            "balance": vault_balance,
+            "balance": find_vault_balance(state, vault_address),
             "address": address
         })
     except Exception as e:
@@ -574,6 +1710,7 @@ def approve_agent():
         result = user_exchange._post_action(action, signature, timestamp)
         
         logger.info(f"Agent approval result: {result}")
+        user_state_cache.invalidate(user_account.address)
         
         return jsonify({
             "success": True,
@@ -615,6 +1752,7 @@ def transfer_to_agent():
         )
         
         logger.info(f"Transfer result: {result}")
+        user_state_cache.invalidate(user_account.address, agent_address)
         
         return jsonify({
             "success": True,
@@ -699,7 +1837,7 @@ def transfer():
         # Create exchange instance for agent (with optional vault delegation)
         exchange = get_exchange_for_agent(agent_private_key, vault_address)
         
-        agent_account = Account.from_key(agent_private_key)
+        agent_account = exchange.wallet
         from_address = vault_address if vault_address else agent_account.address
         
         logger.info(f"Transferring ${amount} USDC from {from_address} to {to_address}")
@@ -713,6 +1851,7 @@ def transfer():
         )
         
         logger.info(f"Transfer result: {result}")
+        user_state_cache.invalidate(from_address, to_address)
         
         return jsonify({
             "success": True,
@@ -745,21 +1884,11 @@ def check_agent_status():
         logger.info(f"Checking agent status: {agent_address} for user {user_address}")
         
         # Get user's state from Hyperliquid
-        user_state = info.user_state(user_address)
+        user_state = user_state_cache.get(user_address)
         
         # Check if agent is in the approved agents list
-        # The user_state should contain information about approved agents
-        # In Hyperliquid, this is typically in the 'crossMarginSummary' or similar field
-        approved_agents = []
-        
-        # Try to get approved agents from user state
-        if user_state and isinstance(user_state, dict):
-            # Check different possible locations for agent approval info
-            if 'approvedAgents' in user_state:
-                approved_agents = user_state.get('approvedAgents', [])
-            elif 'agentApprovals' in user_state:
-                approved_agents = user_state.get('agentApprovals', [])
-            
+        approved_agents = find_approved_agents(user_state)
+        
         # Check if our agent is in the list
         is_approved = any(
             agent.lower() == agent_address.lower() 
@@ -783,7 +1912,22 @@ def check_agent_status():
         logger.error(f"Error checking agent status: {str(e)}")
         return jsonify({"success": False, "error": str(e), "isApproved": False}), 500
 
+def start_services():
+    """Start background workers (called once per process: dev server or each WSGI worker)"""
+    # Keep-alive sockets opened by Info() at import belong to the preloading master
+    info.session.close()
+    # The market store and price feed start on first read (MarketMetadataStore.start)
+
+
+def stop_services():
+    """Release background resources on graceful shutdown"""
+    market_store.stop()
+    batch_executor.shutdown(wait=False)
+    fanout_executor.shutdown(wait=False)
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('HYPERLIQUID_SERVICE_PORT', 5001))
+    start_services()
     app.run(host='0.0.0.0', port=port, debug=False)
 
@@ -0,0 +1,236 @@
+"""
+Async (ASGI) serving mode for the Hyperliquid service
+Read-only endpoints that just proxy the Hyperliquid info API are served
+natively on the event loop through one shared aiohttp connection pool, so a
+single process can keep thousands of upstream requests in flight. Every
+other route (trading, transfers, approvals) falls through to the Flask app
+and keeps its sync semantics in a worker thread.
+
+Run:
+uvicorn hyperliquid_asgi:app --host 0.0.0.0 --port 5001 --workers 2
+
+Install:
+pip install starlette uvicorn aiohttp a2wsgi
+"""
+
+from contextlib import asynccontextmanager
+import logging
+import os
+
+from a2wsgi import WSGIMiddleware
+import aiohttp
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import wsgi
+
+# Shared helpers, market store and the Flask app for write endpoints
+hl = wsgi.load_service('hyperliquid')
+
+logger = logging.getLogger(__name__)
+
+ASYNC_POOL_SIZE = int(os.environ.get('HYPERLIQUID_ASYNC_POOL_SIZE', 1000))  # max concurrent upstream connections
+ASYNC_TIMEOUT = float(os.environ.get('HYPERLIQUID_ASYNC_TIMEOUT', 10))  # seconds per upstream request
+WSGI_THREADS = int(os.environ.get('HYPERLIQUID_WSGI_THREADS', 16))  # threads for the sync Flask routes
+
+
+class AsyncInfoClient:
+    """Async counterpart of hyperliquid.info.Info for the read endpoints"""
+
+    def __init__(self, base_url, pool_size, timeout):
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = None
+        self.requests = 0
+        self.errors = 0
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def post(self, payload: dict):
+        self.requests += 1
+        async with self.session.post(f"{self.base_url}/info", json=payload) as response:
+            if response.status >= 400:
+                self.errors += 1
+                raise RuntimeError(f"Hyperliquid API error {response.status}: {await response.text()}")
+            return await response.json(content_type=None)
+
+    async def user_state(self, address: str) -> dict:
+        return await self.post({"type": "clearinghouseState", "user": address, "dex": ""})
+
+    def stats(self):
+        return {
+            "poolSize": self.pool_size,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+async_info = AsyncInfoClient(hl.BASE_URL, ASYNC_POOL_SIZE, ASYNC_TIMEOUT)
+
+
+async def read_json(request) -> dict:
+    try:
+        return await request.json() or {}
+    except ValueError:
+        return {}
+
+
+async def get_balance(request):
+    """Get account balance on Hyperliquid"""
+    try:
+        data = await read_json(request)
+        address = data.get('address')
+
+        if not address:
+            return JSONResponse({"error": "address required"}, status_code=400)
+
+        state = await hl.user_state_cache.get_async(address, async_info.user_state)
+        return JSONResponse(hl.format_balance(state))
+    except Exception as e:
+        logger.error(f"Error getting balance: {str(e)}")
+        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+async def get_positions(request):
+    """Get open positions for an address"""
+    try:
+        data = await read_json(request)
+        address = data.get('address')
+
+        if not address:
+            return JSONResponse({"error": "address required"}, status_code=400)
+
+        state = await hl.user_state_cache.get_async(address, async_info.user_state)
+        return JSONResponse({
+            "success": True,
+            "positions": hl.format_positions(state)
+        })
+    except Exception as e:
+        logger.error(f"Error getting positions: {str(e)}")
+        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+async def get_user_fills(request):
+    """Get fills from the local fill store (SQLite, so it runs in the thread pool)"""
+    try:
+        data = await read_json(request)
+        body, status = await run_in_threadpool(hl.user_fills_response, data)
+        return JSONResponse(body, status_code=status)
+    except Exception as e:
+        logger.error(f"Error getting user fills: {str(e)}")
+        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+async def vault_balance(request):
+    """Get vault balance for an address"""
+    try:
+        data = await read_json(request)
+        address = data.get('address')
+        vault_address = data.get('vaultAddress')
+
+        if not all([address, vault_address]):
+            return JSONResponse({
+                "success": False,
+                "error": "Missing required fields: address, vaultAddress"
+            }, status_code=400)
+
+        state = await hl.user_state_cache.get_async(address, async_info.user_state)
+        return JSONResponse({
+            "success": True,
+            "vaultAddress": vault_address,
+            "balance": hl.find_vault_balance(state, vault_address),
+            "address": address
+        })
+    except Exception as e:
+        logger.error(f"Error getting vault balance: {str(e)}")
+        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+async def check_agent_status(request):
+    """Check if an agent is whitelisted/approved for a user's account"""
+    try:
+        data = await read_json(request)
+        user_address = data.get('userAddress')
+        agent_address = data.get('agentAddress')
+
+        if not all([user_address, agent_address]):
+            return JSONResponse({
+                "success": False,
+                "error": "Missing required fields: userAddress, agentAddress"
+            }, status_code=400)
+
+        user_state = await hl.user_state_cache.get_async(user_address, async_info.user_state)
+        approved_agents = hl.find_approved_agents(user_state)
+        is_approved = any(
+            agent.lower() == agent_address.lower()
+            for agent in approved_agents
+        )
+
+        return JSONResponse({
+            "success": True,
+            "isApproved": is_approved,
+            "approvedAgents": approved_agents,
+            "note": "Agent approval verified via Hyperliquid API"
+        })
+    except Exception as e:
+        logger.error(f"Error checking agent status: {str(e)}")
+        return JSONResponse({"success": False, "error": str(e), "isApproved": False}, status_code=500)
+
+
+async def health(request):
+    """Health check endpoint (adds async client stats to the Flask health payload)"""
+    return JSONResponse({
+        "status": "ok",
+        "service": "hyperliquid",
+        "mode": "asgi",
+        "network": "testnet" if hl.IS_TESTNET else "mainnet",
+        "baseUrl": hl.BASE_URL,
+        "marketStore": hl.market_store.stats(),
+        "exchangePool": hl.exchange_pool.stats(),
+        "userStateCache": hl.user_state_cache.stats(),
+        "fillStore": hl.fill_store.stats(),
+        "asyncInfo": async_info.stats()
+    })
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await async_info.start()
+    hl.start_services()
+    logger.info(f"⚡ Async read endpoints enabled (pool size {ASYNC_POOL_SIZE})")
+    yield
+    hl.stop_services()
+    await async_info.close()
+
+
+# Same CORS policy as flask_cors on the Flask app (which adds its own headers to mounted routes)
+cors = [Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+
+app = Starlette(
+    routes=[
+        Route('/health', health, methods=['GET'], middleware=cors),
+        Route('/balance', get_balance, methods=['POST', 'OPTIONS'], middleware=cors),
+        Route('/positions', get_positions, methods=['POST', 'OPTIONS'], middleware=cors),
+        Route('/user-fills', get_user_fills, methods=['POST', 'OPTIONS'], middleware=cors),
+        Route('/vault/balance', vault_balance, methods=['POST', 'OPTIONS'], middleware=cors),
+        Route('/check-agent-status', check_agent_status, methods=['POST', 'OPTIONS'], middleware=cors),
+        # Write endpoints (and everything else) keep their sync Flask handlers
+        Mount('/', WSGIMiddleware(hl.app, workers=WSGI_THREADS)),
+    ],
+    lifespan=lifespan,
+)
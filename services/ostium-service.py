@@ -8,8 +8,19 @@ Similar to hyperliquid-service.py but for Arbitrum-based Ostium
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from web3 import Web3
+from requests.adapters import HTTPAdapter
+import numpy as np
+import requests
+import asyncio
+import json
 import os
 import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 import traceback
 import ssl
@@ -23,6 +34,7 @@ ssl._create_default_https_context = ssl._create_unverified_context
 # Ostium SDK imports
 try:
     from ostium_python_sdk import OstiumSDK
+    from ostium_python_sdk.formulae import GetCurrentRolloverFee, GetFundingRate
 except ImportError:
     print("ERROR: ostium-python-sdk not installed. Run: pip install ostium-python-sdk")
     exit(1)
@@ -54,6 +66,147 @@ logger = logging.getLogger(__name__)
 OSTIUM_TESTNET = os.getenv('OSTIUM_TESTNET', 'true').lower() == 'true'
 OSTIUM_RPC_URL = os.getenv('OSTIUM_RPC_URL', 'https://sepolia-rollup.arbitrum.io/rpc')
 PORT = int(os.getenv('OSTIUM_SERVICE_PORT', '5002'))
+RPC_POOL_SIZE = int(os.getenv('OSTIUM_RPC_POOL_SIZE', '32'))  # keep-alive connections to OSTIUM_RPC_URL
+ASYNC_TIMEOUT = float(os.getenv('OSTIUM_ASYNC_TIMEOUT', '30'))  # max wait for an async SDK call
+BATCH_CHUNK_SIZE = int(os.getenv('OSTIUM_BATCH_CHUNK_SIZE', '100'))  # traders per subgraph query
+BATCH_MAX_ADDRESSES = int(os.getenv('OSTIUM_BATCH_MAX_ADDRESSES', '1000'))
+SUBGRAPH_PAGE_SIZE = 1000  # The Graph caps `first` at 1000
+SUBGRAPH_TIMEOUT = float(os.getenv('OSTIUM_SUBGRAPH_TIMEOUT', '30'))  # seconds per subgraph request
+MAX_PROFIT_P = 900.0  # Ostium caps trade profit at 900% of collateral
+
+# Database (wallet_pool lookups)
+DATABASE_URL = os.getenv('DATABASE_URL')
+DB_POOL_MIN = int(os.getenv('OSTIUM_DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('OSTIUM_DB_POOL_MAX', '10'))
+AGENT_KEY_CACHE_TTL = float(os.getenv('AGENT_KEY_CACHE_TTL', '300'))  # seconds
+AGENT_KEY_CACHE_SIZE = int(os.getenv('AGENT_KEY_CACHE_SIZE', '1024'))
+AGENT_KEY_NEGATIVE_TTL = float(os.getenv('AGENT_KEY_NEGATIVE_TTL', '30'))  # seconds an unknown agent stays unknown
+
+# Price oracle (Ostium metadata-backend latest prices)
+PRICE_REFRESH_INTERVAL = float(os.getenv('OSTIUM_PRICE_REFRESH_INTERVAL', '2'))  # seconds
+PRICE_MAX_AGE = float(os.getenv('OSTIUM_PRICE_MAX_AGE', '10'))  # older prices trigger a synchronous refresh
+PRICE_IDLE_AFTER = float(os.getenv('OSTIUM_PRICE_IDLE_AFTER', '60'))  # pause refreshes without readers
+LIQ_THRESHOLD_TTL = float(os.getenv('OSTIUM_LIQ_THRESHOLD_TTL', '300'))  # protocol liquidation threshold cache
+
+# Order tracking (keeper fills)
+ORDER_POLL_INTERVAL = float(os.getenv('OSTIUM_ORDER_POLL_INTERVAL', '2'))  # seconds between subgraph polls
+ORDER_TIMEOUT = float(os.getenv('OSTIUM_ORDER_TIMEOUT', '300'))  # give up on unfilled orders after this
+ORDER_RETENTION = float(os.getenv('OSTIUM_ORDER_RETENTION', '3600'))  # keep resolved orders this long
+ORDER_WAIT_MAX = 60  # cap for long-poll waits
+
+# Background transaction queue (approvals and other on-chain writes)
+TX_WORKERS = int(os.getenv('OSTIUM_TX_WORKERS', '4'))
+TX_RECEIPT_POLL_INTERVAL = float(os.getenv('OSTIUM_TX_RECEIPT_POLL_INTERVAL', '2'))
+TX_RECEIPT_TIMEOUT = float(os.getenv('OSTIUM_TX_RECEIPT_TIMEOUT', '300'))
+TX_RETENTION = float(os.getenv('OSTIUM_TX_RETENTION', '3600'))
+TX_GAS_MULTIPLIER = float(os.getenv('OSTIUM_TX_GAS_MULTIPLIER', '1.2'))  # headroom over estimate_gas
+
+# Per-signer nonce manager
+NONCE_ERRORS = ('nonce too low', 'nonce too high', 'invalid nonce', 'already known', 'replacement transaction underpriced')
+NONCE_RETRYABLE = ('nonce too low', 'nonce too high', 'invalid nonce')  # tx was rejected, safe to resend
+
+# Available markets (snapshot file + stale-while-revalidate refresh from the database API)
+NEXTJS_API_URL = os.getenv('NEXTJS_API_URL', 'http://localhost:3000')
+MARKETS_SNAPSHOT_FILE = os.getenv(
+    'OSTIUM_MARKETS_SNAPSHOT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ostium-markets.json')
+)
+MARKETS_TTL = float(os.getenv('OSTIUM_MARKETS_TTL', '300'))  # older lists are served while a refresh runs
+MARKETS_RETRY_INTERVAL = float(os.getenv('OSTIUM_MARKETS_RETRY_INTERVAL', '30'))  # wait after a failed refresh
+MARKETS_FETCH_TIMEOUT = 10
+
+# Known markets, served only until the first snapshot exists
+FALLBACK_MARKETS = {
+    'BTC': {'index': 0, 'name': 'BTC/USD', 'available': True},
+    'ETH': {'index': 1, 'name': 'ETH/USD', 'available': True},
+    'SOL': {'index': 9, 'name': 'SOL/USD', 'available': True},
+    'HYPE': {'index': 41, 'name': 'HYPE/USD', 'available': True},
+    'XRP': {'index': 39, 'name': 'XRP/USD', 'available': True},
+    'LINK': {'index': 42, 'name': 'LINK/USD', 'available': True},
+    'ADA': {'index': 43, 'name': 'ADA/USD', 'available': True},
+}
+
+# Status of many orders in one query
+ORDERS_BY_ID_QUERY = """
+query ordersById($ids: [ID!]!, $first: Int!) {
+  orders(where: { id_in: $ids }, first: $first) {
+    id
+    trader
+    tradeID
+    orderType
+    orderAction
+    price
+    isBuy
+    isPending
+    isCancelled
+    cancelReason
+    executedAt
+    executedTx
+    initiatedTx
+  }
+}
+"""
+
+# Open trade fields (same as SDK's get_open_trades), selected once per trader chunk
+# by build_open_trades_query
+OPEN_TRADE_FIELDS = """
+    id
+    tradeID
+    collateral
+    leverage
+    highestLeverage
+    openPrice
+    stopLossPrice
+    takeProfitPrice
+    isOpen
+    timestamp
+    isBuy
+    notional
+    tradeNotional
+    funding
+    rollover
+    trader
+    index
+    pair {
+      id
+      feed
+      from
+      to
+      accRollover
+      lastRolloverBlock
+      rolloverFeePerBlock
+      accFundingLong
+      spreadP
+      accFundingShort
+      longOI
+      shortOI
+      maxOI
+      maxLeverage
+      hillInflectionPoint
+      hillPosScale
+      hillNegScale
+      springFactor
+      sFactorUpScaleP
+      sFactorDownScaleP
+      lastFundingBlock
+      maxFundingFeePerBlock
+      lastFundingRate
+    }
+"""
+
+
+def build_open_trades_query(aliases: list) -> str:
+    """One query document with an aliased, id-paginated `trades` selection per chunk"""
+    params = ''.join(f", ${alias}_traders: [Bytes!]!, ${alias}_lastId: ID!" for alias in aliases)
+    selections = ''.join(
+        f"  {alias}: trades(where: {{ isOpen: true, trader_in: ${alias}_traders, id_gt: ${alias}_lastId }}, "
+        f"orderBy: id, orderDirection: asc, first: $first) {{{OPEN_TRADE_FIELDS}  }}\n"
+        for alias in aliases
+    )
+    return f"query tradesBatch($first: Int!{params}) {{\n{selections}}}"
+
+# SDK requires a private key even for read operations
+READ_ONLY_KEY = '0x' + '1' * 64
 
 logger.info(f"🚀 Ostium Service Starting...")
 logger.info(f"   Network: {'TESTNET' if OSTIUM_TESTNET else 'MAINNET'}")
@@ -62,12 +215,35 @@ logger.info(f"   RPC URL: {OSTIUM_RPC_URL}")
 # SDK Cache
 sdk_cache = {}
 
-# Available Markets Cache
-available_markets_cache = {
-    'markets': None,
-    'last_updated': None,
-    'ttl': 300  # 5 minutes cache
-}
+# Shared keep-alive HTTP session for OSTIUM_RPC_URL
+rpc_session = requests.Session()
+rpc_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_SIZE))
+rpc_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_SIZE))
+
+# Keep-alive session for direct subgraph queries (the SDK's client serializes its queries)
+subgraph_session = requests.Session()
+subgraph_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_SIZE))
+subgraph_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_SIZE))
+
+# Shared read-only SDK (created lazily)
+read_sdk = None
+read_sdk_lock = threading.Lock()
+
+# Background event loop for async SDK calls (created lazily)
+async_loop = None
+async_loop_lock = threading.Lock()
+
+# Postgres connection pool (created lazily) and agent key cache
+db_pool = None
+db_pool_lock = threading.Lock()
+agent_key_cache = OrderedDict()  # lowercase address -> (private_key or None, expires_at)
+agent_key_cache_lock = threading.Lock()
+
+
+def use_pooled_provider(sdk: OstiumSDK) -> OstiumSDK:
+    """Point the SDK's Web3 instance (shared by ostium/balance/faucet) at the pooled session"""
+    sdk.w3.provider = Web3.HTTPProvider(OSTIUM_RPC_URL, session=rpc_session)
+    return sdk
 
 
 def get_sdk(private_key: str, use_delegation: bool = False) -> OstiumSDK:
@@ -76,71 +252,1003 @@ def get_sdk(private_key: str, use_delegation: bool = False) -> OstiumSDK:
     
     if cache_key not in sdk_cache:
         network = 'testnet' if OSTIUM_TESTNET else 'mainnet'
-        sdk_cache[cache_key] = OstiumSDK(
+        sdk = use_pooled_provider(OstiumSDK(
             network=network,
             private_key=private_key,
             rpc_url=OSTIUM_RPC_URL,
             use_delegation=use_delegation  # CRITICAL: Enable delegation mode!
-        )
+        ))
+        # All SDK write paths (perform_trade, close_trade, withdraw, ...) take nonces from the manager
+        sdk.ostium.get_nonce = nonce_manager.allocate
+        sdk_cache[cache_key] = sdk
         logger.info(f"Created new SDK instance (delegation={use_delegation})")
     
     return sdk_cache[cache_key]
 
 
-def get_available_markets(refresh=False):
+def get_read_sdk() -> OstiumSDK:
     """
-    Fetch available markets from Database API
-    Returns dict: {
-        'BTC': {'index': 0, 'name': 'BTC/USD', 'available': True},
-        'ETH': {'index': 1, 'name': 'ETH/USD', 'available': True},
-        ...
+    Process-wide read-only SDK instance for query endpoints
+    Built once with a dummy key; contracts, ABIs and the RPC connection pool are reused
+    """
+    global read_sdk
+    if read_sdk is None:
+        with read_sdk_lock:
+            if read_sdk is None:
+                network = 'testnet' if OSTIUM_TESTNET else 'mainnet'
+                read_sdk = use_pooled_provider(OstiumSDK(
+                    network=network,
+                    private_key=READ_ONLY_KEY,
+                    rpc_url=OSTIUM_RPC_URL
+                ))
+                logger.info("Created shared read-only SDK instance")
+    return read_sdk
+
+
+def get_db_pool():
+    """Bounded, thread-safe Postgres connection pool shared by all handlers"""
+    global db_pool
+    if db_pool is None:
+        with db_pool_lock:
+            if db_pool is None:
+                if not DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL not configured")
+                from psycopg2.pool import ThreadedConnectionPool
+                db_pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, dsn=DATABASE_URL)
+                logger.info(f"Created database connection pool (max {DB_POOL_MAX})")
+    return db_pool
+
+
+@contextmanager
+def get_db_connection():
+    """Borrow a pooled connection; broken connections are discarded instead of returned"""
+    pool = get_db_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def get_agent_private_key(agent_address: str):
+    """
+    Resolve an agent's private key from wallet_pool (None if not found)
+    Results are cached in memory for AGENT_KEY_CACHE_TTL seconds; unknown
+    agents are cached as None for AGENT_KEY_NEGATIVE_TTL so repeated misses
+    do not rerun the case-insensitive fallback scan.
+    """
+    cache_key = agent_address.lower()
+    now = time.time()
+    
+    with agent_key_cache_lock:
+        entry = agent_key_cache.get(cache_key)
+        if entry is not None and entry[1] > now:
+            agent_key_cache.move_to_end(cache_key)
+            return entry[0]
+    
+    from psycopg2.extras import RealDictCursor
+    
+    try:
+        checksum_address = Web3.to_checksum_address(agent_address)
+    except Exception:
+        checksum_address = agent_address
+    
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Exact match first so the unique index on address is used
+            cur.execute(
+                "SELECT private_key FROM wallet_pool WHERE address IN (%s, %s) LIMIT 1",
+                (checksum_address, cache_key)
+            )
+            wallet = cur.fetchone()
+            if not wallet:
+                # Fall back for rows stored with unusual casing
+                cur.execute(
+                    "SELECT private_key FROM wallet_pool WHERE LOWER(address) = %s LIMIT 1",
+                    (cache_key,)
+                )
+                wallet = cur.fetchone()
+    
+    private_key = wallet['private_key'] if wallet else None
+    ttl = AGENT_KEY_CACHE_TTL if private_key else AGENT_KEY_NEGATIVE_TTL
+    with agent_key_cache_lock:
+        agent_key_cache[cache_key] = (private_key, now + ttl)
+        agent_key_cache.move_to_end(cache_key)
+        while len(agent_key_cache) > AGENT_KEY_CACHE_SIZE:
+            agent_key_cache.popitem(last=False)
+    
+    return private_key
+
+
+def invalidate_agent_key(agent_address: str = None):
+    """Drop one cached agent key (or all of them if no address is given)"""
+    with agent_key_cache_lock:
+        if agent_address is None:
+            agent_key_cache.clear()
+        else:
+            agent_key_cache.pop(agent_address.lower(), None)
+
+
+def get_async_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop running in a daemon thread, shared by all handlers"""
+    global async_loop
+    if async_loop is None:
+        with async_loop_lock:
+            if async_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='ostium-async-loop', daemon=True)
+                thread.start()
+                async_loop = loop
+                logger.info("Started background event loop for async SDK calls")
+    return async_loop
+
+
+def run_async(coro, timeout: float = ASYNC_TIMEOUT):
+    """
+    Run a coroutine on the shared event loop and block until it completes
+    Keeps the SDK's aiohttp/GraphQL sessions bound to one loop across requests.
+    Note the SDK's subgraph client holds a lock per query, so concurrent handlers
+    only overlap their non-subgraph awaits; bulk reads use subgraph_query instead.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_async_loop())
+    try:
+        return future.result(timeout)
+    except Exception:
+        future.cancel()
+        raise
+
+
+def stop_async_loop():
+    """Stop the background event loop (used on shutdown)"""
+    global async_loop
+    with async_loop_lock:
+        if async_loop is not None:
+            async_loop.call_soon_threadsafe(async_loop.stop)
+            async_loop = None
+
+
+def format_position(trade: dict, metrics: dict = None) -> dict:
+    """Format a subgraph trade as a position, merging computed metrics if available"""
+    pair_info = trade.get('pair', {})
+    market_symbol = f"{pair_info.get('from', 'UNKNOWN')}/{pair_info.get('to', 'USD')}"
+    
+    position = {
+        "market": market_symbol,
+        "side": "long" if trade.get('isBuy') else "short",
+        "size": float(int(trade.get('collateral', 0)) / 1e6),  # Collateral in USDC
+        "entryPrice": float(int(trade.get('openPrice', 0)) / 1e18),  # Price
+        "leverage": float(int(trade.get('leverage', 0)) / 100),  # Leverage
+        "unrealizedPnl": 0.0,
+        "tradeId": trade.get('tradeID', trade.get('index', '0'))
+    }
+    if metrics:
+        position.update(metrics)
+    return position
+
+
+def fetch_market_state() -> dict:
+    """Prices, block number and liquidation threshold from the price oracle's cached state"""
+    return {
+        "prices": price_oracle.snapshot(),
+        "blockNumber": price_oracle.block_number,
+        "liqMarginThresholdP": price_oracle.liq_margin_threshold_p(),
     }
+
+
+def pair_fee_accumulators(pair: dict, block_number: int) -> tuple:
+    """Current (rollover, fundingLong, fundingShort) accumulators for a pair at block_number"""
+    rollover = float(GetCurrentRolloverFee(
+        pair['accRollover'], pair['lastRolloverBlock'], pair['rolloverFeePerBlock'], str(block_number)
+    )) / 1e18
+    funding = GetFundingRate(
+        pair['accFundingLong'], pair['accFundingShort'], pair['lastFundingRate'],
+        pair['maxFundingFeePerBlock'], pair['lastFundingBlock'], str(block_number),
+        pair['longOI'], pair['shortOI'], pair['maxOI'],
+        pair['hillInflectionPoint'], pair['hillPosScale'], pair['hillNegScale'],
+        pair['springFactor'], pair['sFactorUpScaleP'], pair['sFactorDownScaleP']
+    )
+    return rollover, float(funding['accFundingLong']), float(funding['accFundingShort'])
+
+
+def compute_trade_metrics(trades: list, market_state: dict, block_number: int) -> list:
     """
-    import time
-    import requests
+    Unrealized PnL, fees, liquidation price and notional for open trades
+    Per-pair fee accumulators are computed once per pair; all trade math runs
+    as one vectorized pass. Longs are marked at bid and shorts at ask (the
+    price each would close at), falling back to mid.
+    Returns one metrics dict per trade (None where no price is available).
+    """
+    if not trades:
+        return []
+    
+    prices = market_state["prices"]
+    pair_acc = {}
+    n = len(trades)
+    collateral = np.empty(n)
+    leverage = np.empty(n)
+    highest_leverage = np.empty(n)
+    open_price = np.empty(n)
+    direction = np.empty(n)
+    current_price = np.full(n, np.nan)
+    max_leverage = np.empty(n)
+    trade_rollover = np.empty(n)
+    trade_funding = np.empty(n)
+    acc_rollover = np.empty(n)
+    acc_funding = np.empty(n)
+    
+    for i, trade in enumerate(trades):
+        pair = trade['pair']
+        is_buy = bool(trade.get('isBuy'))
+        if pair['id'] not in pair_acc:
+            pair_acc[pair['id']] = pair_fee_accumulators(pair, block_number)
+        rollover, funding_long, funding_short = pair_acc[pair['id']]
+        
+        collateral[i] = int(trade['collateral']) / 1e6
+        leverage[i] = int(trade['leverage']) / 100
+        highest_leverage[i] = int(trade.get('highestLeverage') or trade['leverage']) / 100
+        open_price[i] = int(trade['openPrice']) / 1e18
+        direction[i] = 1.0 if is_buy else -1.0
+        max_leverage[i] = int(pair.get('maxLeverage') or 0) / 100 or leverage[i]
+        trade_rollover[i] = int(trade.get('rollover') or 0) / 1e18
+        trade_funding[i] = int(trade.get('funding') or 0) / 1e18
+        acc_rollover[i] = rollover
+        acc_funding[i] = funding_long if is_buy else funding_short
+        
+        price = prices.get((pair.get('from'), pair.get('to')))
+        if price:
+            current_price[i] = float(price.get('bid' if is_buy else 'ask') or price.get('mid'))
     
-    # Check cache
-    if not refresh and available_markets_cache['markets'] is not None:
-        if available_markets_cache['last_updated'] is not None:
-            age = time.time() - available_markets_cache['last_updated']
-            if age < available_markets_cache['ttl']:
-                return available_markets_cache['markets']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        notional_open = collateral * leverage
+        
+        # Profit % (capped like the contracts), scaled back to the current leverage
+        leverage_used = np.maximum(leverage, highest_leverage)
+        profit_p = direction * (current_price - open_price) / open_price * leverage_used * 100
+        profit_p = np.minimum(profit_p, MAX_PROFIT_P) * (leverage / leverage_used)
+        pnl = collateral * profit_p / 100
+        
+        # Fees accrued since open
+        rollover_fee = (acc_rollover - trade_rollover) * notional_open
+        funding_fee = (acc_funding - trade_funding) * notional_open
+        net_pnl = pnl - rollover_fee - funding_fee
+        
+        # Liquidation price
+        liq_threshold = market_state["liqMarginThresholdP"] / 100 * leverage / max_leverage
+        collateral_after_fees = collateral - collateral * liq_threshold - rollover_fee - funding_fee
+        liq_distance = open_price * collateral_after_fees / collateral / leverage
+        liquidation_price = np.maximum(0.0, open_price - direction * liq_distance)
+        
+        notional = notional_open * current_price / open_price
     
-    logger.info("Fetching available markets from database API...")
+    metrics = []
+    for i in range(n):
+        if np.isnan(current_price[i]):
+            metrics.append(None)
+            continue
+        metrics.append({
+            "currentPrice": float(current_price[i]),
+            "unrealizedPnl": float(net_pnl[i]),
+            "grossPnl": float(pnl[i]),
+            "pnlPercent": float(net_pnl[i] / collateral[i] * 100),
+            "rolloverFee": float(rollover_fee[i]),
+            "fundingFee": float(funding_fee[i]),
+            "liquidationPrice": float(liquidation_price[i]),
+            "notional": float(notional[i]),
+        })
+    return metrics
+
+
+def positions_with_metrics(sdk: OstiumSDK, trades: list) -> list:
+    """
+    Format trades as positions with PnL, aligned with trades (None where a trade can't be parsed)
+    Falls back to bare positions if market data is unavailable
+    """
+    metrics = [None] * len(trades)
+    if trades:
+        try:
+            market_state = fetch_market_state()
+            block_number = market_state["blockNumber"] or sdk.ostium.get_block_number()
+            metrics = compute_trade_metrics(trades, market_state, block_number)
+        except Exception as e:
+            logger.warning(f"Could not compute position metrics: {e}")
     
+    positions = []
+    for trade, trade_metrics in zip(trades, metrics):
+        try:
+            positions.append(format_position(trade, trade_metrics))
+        except Exception as parse_error:
+            logger.error(f"Error parsing trade: {parse_error}")
+            positions.append(None)
+    return positions
+
+
+def subgraph_query(query: str, variables: dict = None) -> dict:
+    """POST a GraphQL query to the Ostium subgraph over the pooled session and return its data"""
+    response = subgraph_session.post(
+        get_read_sdk().network_config.graph_url,
+        json={"query": query, "variables": variables or {}},
+        timeout=SUBGRAPH_TIMEOUT,
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body.get('errors'):
+        raise RuntimeError(f"Subgraph query failed: {body['errors'][0].get('message')}")
+    return body.get('data') or {}
+
+
+def fetch_open_trades_batch(traders: list) -> list:
+    """
+    Fetch open trades for many traders in as few subgraph requests as possible
+    Traders are split into chunks of BATCH_CHUNK_SIZE, each an aliased selection
+    of one query document; follow-up requests carry only chunks with more pages.
+    """
+    chunks = {f"c{i}": traders[start:start + BATCH_CHUNK_SIZE]
+              for i, start in enumerate(range(0, len(traders), BATCH_CHUNK_SIZE))}
+    last_ids = {alias: '' for alias in chunks}
+    trades = []
+    while last_ids:
+        variables = {"first": SUBGRAPH_PAGE_SIZE}
+        for alias, last_id in last_ids.items():
+            variables[f"{alias}_traders"] = chunks[alias]
+            variables[f"{alias}_lastId"] = last_id
+        data = subgraph_query(build_open_trades_query(list(last_ids)), variables)
+        for alias in list(last_ids):
+            page = data.get(alias) or []
+            trades.extend(page)
+            if len(page) < SUBGRAPH_PAGE_SIZE:
+                del last_ids[alias]
+            else:
+                last_ids[alias] = page[-1]['id']
+    return trades
+
+
+class PriceOracle:
+    """
+    Latest Ostium pair prices kept in memory
+    A background thread refreshes them every PRICE_REFRESH_INTERVAL seconds
+    from the SDK price feed; readers get the last snapshot plus its age and
+    only block on a fetch when the snapshot is older than PRICE_MAX_AGE.
+    The chain head and the protocol liquidation threshold are cached alongside,
+    so position metrics cost no per-request RPC or subgraph call.
+    The thread pauses when nobody has read for idle_after seconds (the next
+    read wakes it) and exits on stop().
+    """
+
+    def __init__(self, refresh_interval, max_age, liq_threshold_ttl, idle_after):
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.liq_threshold_ttl = liq_threshold_ttl
+        self.idle_after = idle_after
+        self.last_access = time.time()
+        self.prices = {}  # (from, to) -> price data (bid/mid/ask/isMarketOpen/timestampSeconds)
+        self.block_number = None  # chain head at the last refresh (fee accrual for metrics)
+        self.updated_at = None
+        self.last_error = None
+        self._liq_threshold = None  # (liqMarginThresholdP, fetched_at)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def refresh(self):
+        """Fetch all latest prices (and the block number) and replace the snapshot"""
+        sdk = get_read_sdk()
+        prices = run_async(sdk.price.get_latest_prices())
+        snapshot = {(p.get('from'), p.get('to')): p for p in prices}
+        try:
+            block_number = sdk.ostium.get_block_number()
+        except Exception as e:
+            logger.warning(f"Block number refresh failed: {e}")
+            block_number = self.block_number
+        with self._lock:
+            self.prices = snapshot
+            self.block_number = block_number
+            self.updated_at = time.time()
+            self.last_error = None
+        return snapshot
+
+    def liq_margin_threshold_p(self) -> float:
+        """Protocol liquidation threshold, refetched from the subgraph every liq_threshold_ttl seconds"""
+        cached = self._liq_threshold
+        if cached is None or time.time() - cached[1] > self.liq_threshold_ttl:
+            value = float(run_async(get_read_sdk().subgraph.get_liq_margin_threshold_p()))
+            cached = self._liq_threshold = (value, time.time())
+        return cached[0]
+
+    def age(self):
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+    def idle(self) -> bool:
+        return time.time() - self.last_access > self.idle_after
+
+    def snapshot(self, max_age: float = None) -> dict:
+        """Current price table, refreshed synchronously if older than max_age"""
+        was_idle = self.idle()
+        self.last_access = time.time()
+        self.start()
+        if was_idle:
+            self._wake.set()
+        max_age = self.max_age if max_age is None else max_age
+        age = self.age()
+        if age is None or age > max_age:
+            self.refresh()
+        return self.prices
+
+    def get_price(self, symbol: str, quote: str = 'USD'):
+        """Price data for a market symbol (e.g. 'BTC'), or None if Ostium has no feed for it"""
+        return self.snapshot().get((symbol.upper(), quote))
+
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='ostium-price-oracle', daemon=True)
+            self._thread.start()
+        logger.info(f"📈 Price oracle started (refresh every {self.refresh_interval}s)")
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.idle():
+                # Nobody is reading: wait for the next reader instead of polling
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Price refresh failed: {e}")
+            self._stop.wait(self.refresh_interval)
+
+    def stats(self):
+        return {
+            "pairs": len(self.prices),
+            "age": self.age(),
+            "blockNumber": self.block_number,
+            "idle": self.idle(),
+            "refreshInterval": self.refresh_interval,
+            "maxAge": self.max_age,
+            "lastError": self.last_error,
+        }
+
+
+price_oracle = PriceOracle(PRICE_REFRESH_INTERVAL, PRICE_MAX_AGE, LIQ_THRESHOLD_TTL, PRICE_IDLE_AFTER)
+
+
+class OrderTracker:
+    """
+    Watches pending Ostium orders until the keeper fills or cancels them
+    One background thread polls the subgraph for every pending order id (one
+    query per SUBGRAPH_PAGE_SIZE ids); waiters block on a condition instead of
+    polling the API. Only orders submitted through this service are tracked.
+    Status: pending -> filled | cancelled | timeout
+    """
+
+    TERMINAL = ('filled', 'cancelled', 'timeout')
+
+    def __init__(self, poll_interval, timeout, retention):
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.retention = retention
+        self.orders = {}  # order_id (str) -> record
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def track(self, order_id, **details) -> dict:
+        """Start tracking an order (no-op if already tracked)"""
+        order_id = str(order_id)
+        with self._cond:
+            if order_id not in self.orders:
+                self.orders[order_id] = {
+                    "orderId": order_id,
+                    "status": "pending",
+                    "submittedAt": time.time(),
+                    "updatedAt": time.time(),
+                    **details,
+                }
+            record = dict(self.orders[order_id])
+        self.start()
+        return record
+
+    def get(self, order_id):
+        with self._cond:
+            record = self.orders.get(str(order_id))
+            return dict(record) if record else None
+
+    def wait(self, order_id, timeout: float) -> dict:
+        """Block until the order reaches a terminal status or timeout elapses"""
+        order_id = str(order_id)
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                record = self.orders.get(order_id)
+                if record is None or record["status"] in self.TERMINAL:
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return dict(record) if record else None
+
+    def start(self):
+        """Start the background poller (idempotent)"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='ostium-order-tracker', daemon=True)
+            self._thread.start()
+        logger.info(f"📦 Order tracker started (poll every {self.poll_interval}s)")
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Order tracker poll failed: {e}")
+            time.sleep(self.poll_interval)
+
+    def poll(self):
+        """Refresh all pending orders, SUBGRAPH_PAGE_SIZE ids per subgraph query"""
+        now = time.time()
+        with self._cond:
+            # Drop resolved orders past retention
+            for order_id in [oid for oid, r in self.orders.items()
+                             if r["status"] in self.TERMINAL and now - r["updatedAt"] > self.retention]:
+                del self.orders[order_id]
+            # Time out stale orders even if the subgraph is unreachable
+            for record in self.orders.values():
+                if record["status"] == "pending" and now - record["submittedAt"] > self.timeout:
+                    record.update({"status": "timeout", "updatedAt": now})
+                    logger.warning(f"Order {record['orderId']} not filled after {self.timeout}s")
+            self._cond.notify_all()
+            pending = [oid for oid, r in self.orders.items() if r["status"] == "pending"]
+        if not pending:
+            return
+        
+        found = {}
+        for start in range(0, len(pending), SUBGRAPH_PAGE_SIZE):
+            # At most one order per id, so a page of ids always fits in one response
+            ids = pending[start:start + SUBGRAPH_PAGE_SIZE]
+            result = subgraph_query(ORDERS_BY_ID_QUERY, {"ids": ids, "first": SUBGRAPH_PAGE_SIZE})
+            found.update((order["id"], order) for order in result.get("orders", []))
+        
+        with self._cond:
+            for order_id in pending:
+                record = self.orders.get(order_id)
+                if record is None:
+                    continue
+                order = found.get(order_id)
+                if order and not order.get("isPending", True):
+                    cancelled = order.get("isCancelled", False)
+                    record.update({
+                        "status": "cancelled" if cancelled else "filled",
+                        "tradeId": order.get("tradeID"),
+                        "cancelReason": order.get("cancelReason") if cancelled else None,
+                        "executedAt": order.get("executedAt"),
+                        "executedTx": order.get("executedTx"),
+                        "executionPrice": float(int(order["price"]) / 1e18) if order.get("price") else None,
+                        "updatedAt": now,
+                    })
+                    logger.info(f"Order {order_id} {record['status']}")
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            counts = {}
+            for record in self.orders.values():
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+
+order_tracker = OrderTracker(ORDER_POLL_INTERVAL, ORDER_TIMEOUT, ORDER_RETENTION)
+
+
+class NonceManager:
+    """
+    Process-wide nonce allocator keyed by signer address
+    Nonces are handed out locally so one signer can have many transactions
+    in flight at once. The first allocation (and any resync) starts from the
+    chain's pending count, which already includes this signer's transactions
+    in the node's mempool, so nothing is persisted across restarts.
+    Run sends inside execute() so unsent nonces are released and
+    "nonce too low" errors resync and retry.
+    """
+
+    def __init__(self):
+        self.next = {}  # lowercase address -> next nonce to hand out
+        self.released = {}  # lowercase address -> set of nonces to reuse
+        self.resyncs = 0
+        self._lock = threading.Lock()
+        self._signer_locks = {}
+        self._local = threading.local()
+
+    def _signer_lock(self, key):
+        with self._lock:
+            return self._signer_locks.setdefault(key, threading.Lock())
+
+    def _chain_nonce(self, address):
+        return get_read_sdk().w3.eth.get_transaction_count(Web3.to_checksum_address(address), 'pending')
+
+    def allocate(self, address: str) -> int:
+        """Next nonce for address (drop-in for the SDK's get_nonce)"""
+        key = address.lower()
+        with self._signer_lock(key):
+            released = self.released.get(key)
+            if released:
+                nonce = min(released)
+                released.discard(nonce)
+            else:
+                if key not in self.next:
+                    self.next[key] = self._chain_nonce(address)
+                nonce = self.next[key]
+                self.next[key] = nonce + 1
+        allocations = getattr(self._local, 'allocations', None)
+        if allocations is not None:
+            allocations.append((address, nonce))
+        return nonce
+
+    def release(self, address: str, nonce: int):
+        """Return a nonce that was never accepted by the node so the next tx fills the gap"""
+        key = address.lower()
+        with self._signer_lock(key):
+            if key in self.next and nonce < self.next[key]:
+                self.released.setdefault(key, set()).add(nonce)
+
+    def resync(self, address: str):
+        """Forget local state for address; the next allocation re-reads the chain"""
+        key = address.lower()
+        with self._signer_lock(key):
+            self.next.pop(key, None)
+            self.released.pop(key, None)
+        self.resyncs += 1
+        logger.warning(f"Resynced nonce for {address}")
+
+    def execute(self, fn, retries: int = 1):
+        """
+        Run a send (e.g. lambda: sdk.ostium.perform_trade(...)) with nonce bookkeeping
+        Nonce errors resync the signer and retry when the node rejected the tx;
+        other errors release any nonce the chain has not consumed.
+        """
+        for attempt in range(retries + 1):
+            self._local.allocations = []
+            try:
+                return fn()
+            except Exception as e:
+                # The SDK re-raises RPC errors as a parsed Exception; check the original too
+                message = ' '.join(str(err) for err in (e, e.__cause__, e.__context__) if err).lower()
+                allocations = self._local.allocations
+                if any(err in message for err in NONCE_ERRORS):
+                    for address in {address for address, _ in allocations}:
+                        self.resync(address)
+                    if attempt < retries and any(err in message for err in NONCE_RETRYABLE):
+                        logger.info(f"Retrying after nonce error: {e}")
+                        continue
+                else:
+                    for address, nonce in allocations:
+                        try:
+                            if self._chain_nonce(address) <= nonce:
+                                self.release(address, nonce)
+                        except Exception:
+                            self.resync(address)
+                raise
+            finally:
+                self._local.allocations = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "signers": len(self.next),
+                "released": sum(len(nonces) for nonces in self.released.values()),
+                "resyncs": self.resyncs
+            }
+
+
+nonce_manager = NonceManager()
+
+
+def estimate_fees(web3: Web3) -> dict:
+    """EIP-1559 fee fields: maxFee = 2 x latest base fee + priority fee"""
+    base_fee = web3.eth.get_block('latest').get('baseFeePerGas', 0)
     try:
-        # Fetch from database API
-        api_url = os.getenv('NEXTJS_API_URL', 'http://localhost:3000')
-        response = requests.get(f"{api_url}/api/venue-markets/available?venue=OSTIUM", timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success') and data.get('markets'):
-                markets = data['markets']
-                available_markets_cache['markets'] = markets
-                available_markets_cache['last_updated'] = time.time()
-                logger.info(f"✅ Loaded {len(markets)} available markets from database")
-                return markets
-        
-        # If API call fails, use fallback
-        raise Exception(f"API returned status {response.status_code}")
-        
-    except Exception as e:
-        logger.error(f"Failed to fetch markets from API: {e}")
-        # Return known markets as fallback
-        fallback = {
-            'BTC': {'index': 0, 'name': 'BTC/USD', 'available': True},
-            'ETH': {'index': 1, 'name': 'ETH/USD', 'available': True},
-            'SOL': {'index': 9, 'name': 'SOL/USD', 'available': True},
-            'HYPE': {'index': 41, 'name': 'HYPE/USD', 'available': True},
-            'XRP': {'index': 39, 'name': 'XRP/USD', 'available': True},
-            'LINK': {'index': 42, 'name': 'LINK/USD', 'available': True},
-            'ADA': {'index': 43, 'name': 'ADA/USD', 'available': True},
+        priority_fee = web3.eth.max_priority_fee
+    except Exception:
+        priority_fee = 0  # Arbitrum ignores the tip; some RPCs don't expose it
+    return {
+        'maxPriorityFeePerGas': priority_fee,
+        'maxFeePerGas': 2 * base_fee + priority_fee,
+    }
+
+
+class TransactionQueue:
+    """
+    Background pipeline for on-chain writes
+    submit() returns a job id immediately. Worker threads build (EIP-1559
+    fees, estimated gas), sign and send each transaction; one poller thread
+    fetches receipts for all in-flight transactions in a single JSON-RPC
+    batch per interval. Used for approvals and USDC transfers; trades and
+    closes stay on the request thread because their response carries the
+    order id decoded from the receipt.
+    Status: queued -> submitted -> confirmed | reverted | failed | timeout
+    """
+
+    TERMINAL = ('confirmed', 'reverted', 'failed', 'timeout')
+
+    def __init__(self, workers, poll_interval, receipt_timeout, retention):
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.retention = retention
+        self.jobs = {}  # job id -> record
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ostium-tx')
+        self._thread = None
+
+    def submit(self, kind: str, contract_fn, private_key: str, **details) -> dict:
+        """Queue a contract call signed by private_key"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        record = {
+            "jobId": job_id,
+            "type": kind,
+            "status": "queued",
+            "txHash": None,
+            "createdAt": now,
+            "updatedAt": now,
+            **details,
+        }
+        with self._lock:
+            self.jobs[job_id] = record
+        self._executor.submit(self._send, job_id, contract_fn, private_key)
+        self.start()
+        return dict(record)
+
+    def get(self, job_id):
+        with self._lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record else None
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            record = self.jobs.get(job_id)
+            if record is not None:
+                record.update(fields, updatedAt=time.time())
+
+    def _send(self, job_id, contract_fn, private_key):
+        try:
+            web3 = get_read_sdk().w3
+            account = web3.eth.account.from_key(private_key)
+            tx_params = {
+                'from': account.address,
+                **estimate_fees(web3),
+            }
+            tx_params['gas'] = int(contract_fn.estimate_gas({'from': account.address}) * TX_GAS_MULTIPLIER)
+            
+            def send():
+                tx = contract_fn.build_transaction({**tx_params, 'nonce': nonce_manager.allocate(account.address)})
+                signed_tx = account.sign_transaction(tx)
+                return web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            
+            tx_hash = nonce_manager.execute(send).hex()
+            if not tx_hash.startswith('0x'):
+                tx_hash = '0x' + tx_hash
+            self._update(job_id, status="submitted", txHash=tx_hash, submittedAt=time.time(), sender=account.address)
+            logger.info(f"Transaction submitted: {tx_hash} (job {job_id})")
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e))
+            logger.error(f"Transaction job {job_id} failed: {e}")
+
+    def start(self):
+        """Start the receipt poller (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='ostium-tx-receipts', daemon=True)
+            self._thread.start()
+        logger.info(f"🧾 Transaction queue started ({TX_WORKERS} workers)")
+
+    def _run(self):
+        while True:
+            try:
+                self.poll_receipts()
+            except Exception as e:
+                logger.error(f"Receipt poll failed: {e}")
+            time.sleep(self.poll_interval)
+
+    def poll_receipts(self):
+        """Fetch receipts for all submitted transactions in one JSON-RPC batch"""
+        now = time.time()
+        with self._lock:
+            for job_id in [jid for jid, r in self.jobs.items()
+                           if r["status"] in self.TERMINAL and now - r["updatedAt"] > self.retention]:
+                del self.jobs[job_id]
+            in_flight = [(jid, r["txHash"], r["submittedAt"]) for jid, r in self.jobs.items() if r["status"] == "submitted"]
+        if not in_flight:
+            return
+        
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [tx_hash]}
+            for i, (_, tx_hash, _) in enumerate(in_flight)
+        ]
+        response = rpc_session.post(OSTIUM_RPC_URL, json=batch, timeout=30)
+        response.raise_for_status()
+        receipts = {item.get("id"): item.get("result") for item in response.json()}
+        
+        for i, (job_id, tx_hash, submitted_at) in enumerate(in_flight):
+            receipt = receipts.get(i)
+            if receipt:
+                status = "confirmed" if int(receipt["status"], 16) == 1 else "reverted"
+                self._update(
+                    job_id,
+                    status=status,
+                    blockNumber=int(receipt["blockNumber"], 16),
+                    gasUsed=int(receipt["gasUsed"], 16)
+                )
+                logger.info(f"Transaction {status}: {tx_hash} (job {job_id})")
+            elif now - submitted_at > self.receipt_timeout:
+                self._update(job_id, status="timeout")
+                logger.warning(f"No receipt for {tx_hash} after {self.receipt_timeout}s (job {job_id})")
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs; by default block until queued sends have gone out"""
+        self._executor.shutdown(wait=wait)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for record in self.jobs.values():
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+
+tx_queue = TransactionQueue(TX_WORKERS, TX_RECEIPT_POLL_INTERVAL, TX_RECEIPT_TIMEOUT, TX_RETENTION)
+
+
+class MarketCatalog:
+    """
+    Available Ostium markets, never fetched on a request path
+    The list is loaded from a snapshot file at startup (written by this
+    service or by fetch-all-ostium-markets.py --snapshot). Reads return it
+    immediately; once it is older than the TTL, the first read starts a
+    single background refresh from the database API (stale-while-revalidate)
+    that replaces the list and rewrites the snapshot.
+    """
+
+    def __init__(self, snapshot_file, ttl, retry_interval):
+        self.snapshot_file = snapshot_file
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.markets = None
+        self.updated_at = None
+        self.source = None
+        self.last_error = None
+        self.failed_at = None
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.snapshot_file) as f:
+                snapshot = json.load(f)
+            if snapshot.get('markets'):
+                self.markets = snapshot['markets']
+                self.updated_at = snapshot.get('updatedAt')
+                self.source = snapshot.get('source', 'snapshot')
+                logger.info(f"Loaded {len(self.markets)} markets from {self.snapshot_file}")
+        except FileNotFoundError:
+            logger.info(f"No market snapshot at {self.snapshot_file}, using fallback markets until the first refresh")
+        except Exception as e:
+            logger.warning(f"Could not load market snapshot from {self.snapshot_file}: {e}")
+
+    def _save(self, snapshot):
+        """Write the snapshot atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file) or '.', exist_ok=True)
+            tmp_path = f"{self.snapshot_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_file)
+        except Exception as e:
+            logger.warning(f"Could not persist market snapshot: {e}")
+
+    def age(self):
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+    def refresh(self):
+        """Fetch available markets from the database API and replace the list (blocking)"""
+        response = requests.get(
+            f"{NEXTJS_API_URL}/api/venue-markets/available?venue=OSTIUM",
+            timeout=MARKETS_FETCH_TIMEOUT
+        )
+        data = response.json() if response.status_code == 200 else {}
+        if not (data.get('success') and data.get('markets')):
+            raise Exception(f"API returned status {response.status_code}")
+
+        snapshot = {'markets': data['markets'], 'updatedAt': time.time(), 'source': 'api'}
+        with self._lock:
+            self.markets = snapshot['markets']
+            self.updated_at = snapshot['updatedAt']
+            self.source = snapshot['source']
+            self.last_error = None
+            self.failed_at = None
+            self.refreshes += 1
+        self._save(snapshot)
+        logger.info(f"✅ Loaded {len(self.markets)} available markets from database")
+        return self.markets
+
+    def revalidate(self, force: bool = False):
+        """Start a background refresh unless one is running (or the last one just failed)"""
+        with self._lock:
+            if self._refreshing:
+                return
+            if not force and self.failed_at is not None and time.time() - self.failed_at < self.retry_interval:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._run_refresh, name='ostium-markets-refresh', daemon=True).start()
+
+    def _run_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            with self._lock:
+                self.last_error = str(e)
+                self.failed_at = time.time()
+            logger.error(f"Failed to fetch markets from API: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self, refresh: bool = False) -> dict:
+        """Current markets; stale (or refresh=True) schedules a background refresh"""
+        age = self.age()
+        if refresh or age is None or age > self.ttl:
+            self.revalidate(force=refresh)
+        return self.markets if self.markets is not None else FALLBACK_MARKETS
+
+    def stats(self):
+        return {
+            "markets": len(self.markets) if self.markets is not None else 0,
+            "source": self.source or "fallback",
+            "age": self.age(),
+            "ttl": self.ttl,
+            "refreshing": self._refreshing,
+            "refreshes": self.refreshes,
+            "lastError": self.last_error,
         }
-        available_markets_cache['markets'] = fallback
-        available_markets_cache['last_updated'] = time.time()
-        logger.info(f"⚠️  Using fallback markets ({len(fallback)} markets)")
-        return fallback
+
+
+market_catalog = MarketCatalog(MARKETS_SNAPSHOT_FILE, MARKETS_TTL, MARKETS_RETRY_INTERVAL)
+
+
+def get_available_markets(refresh=False):
+    """
+    Available markets from the in-memory catalog (never blocks on the API)
+    Returns dict: {
+        'BTC': {'index': 0, 'name': 'BTC/USD', 'available': True},
+        'ETH': {'index': 1, 'name': 'ETH/USD', 'available': True},
+        ...
+    }
+    refresh=True starts a background refresh; the current list is returned.
+    """
+    return market_catalog.get(refresh=refresh)
 
 
 def validate_market(token_symbol: str):
@@ -166,7 +1274,12 @@ def health():
         "status": "ok",
         "service": "ostium",
         "network": "testnet" if OSTIUM_TESTNET else "mainnet",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "priceOracle": price_oracle.stats(),
+        "orders": order_tracker.stats(),
+        "transactions": tx_queue.stats(),
+        "nonces": nonce_manager.stats(),
+        "markets": market_catalog.stats()
     })
 
 
@@ -189,11 +1302,8 @@ def get_balance():
         except Exception as e:
             return jsonify({"success": False, "error": f"Invalid address format: {str(e)}"}), 400
         
-        # Use a dummy key for read-only operations  
-        # SDK requires a private key even for read operations
-        dummy_key = '0x' + '1' * 64
-        network = 'testnet' if OSTIUM_TESTNET else 'mainnet'
-        sdk = OstiumSDK(network=network, private_key=dummy_key, rpc_url=OSTIUM_RPC_URL)
+        # Shared read-only SDK
+        sdk = get_read_sdk()
         
         # Get balances
         usdc_balance = sdk.balance.get_usdc_balance(address)
@@ -233,42 +1343,19 @@ def get_positions():
         except Exception as e:
             return jsonify({"success": False, "error": f"Invalid address format: {str(e)}"}), 400
         
-        # Create SDK instance
-        dummy_key = '0x' + '1' * 64
-        network = 'testnet' if OSTIUM_TESTNET else 'mainnet'
-        sdk = OstiumSDK(network=network, private_key=dummy_key, rpc_url=OSTIUM_RPC_URL)
+        # Shared read-only SDK
+        sdk = get_read_sdk()
         
-        # Get open trades using SDK (it's async, so we need to run it)
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(sdk.get_open_trades(trader_address=address))
-        loop.close()
+        # Get open trades using SDK (async, runs on the shared event loop)
+        result = run_async(sdk.get_open_trades(trader_address=address))
         
         # Parse result - SDK returns tuple (trades_list, trader_address)
         open_trades = []
         if isinstance(result, tuple) and len(result) > 0:
             open_trades = result[0] if isinstance(result[0], list) else []
         
-        # Format positions
-        positions = []
-        for trade in open_trades:
-            try:
-                pair_info = trade.get('pair', {})
-                market_symbol = f"{pair_info.get('from', 'UNKNOWN')}/{pair_info.get('to', 'USD')}"
-                
-                positions.append({
-                    "market": market_symbol,
-                    "side": "long" if trade.get('isBuy') else "short",
-                    "size": float(int(trade.get('collateral', 0)) / 1e6),  # Collateral in USDC
-                    "entryPrice": float(int(trade.get('openPrice', 0)) / 1e18),  # Price
-                    "leverage": float(int(trade.get('leverage', 0)) / 100),  # Leverage
-                    "unrealizedPnl": 0.0,  # TODO: Calculate PnL
-                    "tradeId": trade.get('tradeID', trade.get('index', '0'))
-                })
-            except Exception as parse_error:
-                logger.error(f"Error parsing trade: {parse_error}")
-                continue
+        # Format positions with PnL, liquidation price and notional
+        positions = [p for p in positions_with_metrics(sdk, open_trades) if p is not None]
         
         logger.info(f"Found {len(positions)} open positions for {address}")
         
@@ -283,6 +1370,63 @@ def get_positions():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/positions/batch', methods=['POST'])
+def get_positions_batch():
+    """
+    Get open positions for many addresses in one call
+    Body: { "addresses": ["0x...", "0x...", ...] }
+    Returns: { "success": true, "results": { "<address as sent>": { "success": true, "positions": [...] } } }
+    """
+    try:
+        data = request.json or {}
+        addresses = data.get('addresses')
+        
+        if not addresses or not isinstance(addresses, list):
+            return jsonify({"success": False, "error": "addresses (list) required"}), 400
+        
+        if len(addresses) > BATCH_MAX_ADDRESSES:
+            return jsonify({
+                "success": False,
+                "error": f"Too many addresses (max {BATCH_MAX_ADDRESSES})"
+            }), 400
+        
+        # Validate addresses; subgraph stores traders lowercase
+        results = {}
+        requested = {}  # lowercase trader -> addresses as sent
+        for address in dict.fromkeys(addresses):
+            try:
+                trader = Web3.to_checksum_address(address).lower()
+            except Exception as e:
+                results[address] = {"success": False, "error": f"Invalid address format: {str(e)}"}
+                continue
+            requested.setdefault(trader, []).append(address)
+            results[address] = {"success": True, "positions": []}
+        
+        sdk = get_read_sdk()
+        open_trades = fetch_open_trades_batch(list(requested.keys()))
+        
+        # One price fetch and one vectorized metrics pass for the whole batch
+        positions = positions_with_metrics(sdk, open_trades)
+        for trade, position in zip(open_trades, positions):
+            if position is None:
+                continue
+            for address in requested.get(str(trade.get('trader', '')).lower(), []):
+                results[address]["positions"].append(position)
+        
+        logger.info(f"Batch positions: {len(open_trades)} open trades across {len(requested)} addresses")
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "count": len(results)
+        })
+    
+    except Exception as e:
+        logger.error(f"Batch positions error: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/open-position', methods=['POST'])
 def open_position():
     """
@@ -317,36 +1461,21 @@ def open_position():
         # If agentAddress is provided, look up agent's private key from database
         if agent_address:
             try:
-                # Import here to avoid circular dependency
-                import psycopg2
-                from psycopg2.extras import RealDictCursor
-                
-                # Get database URL from environment
-                database_url = os.getenv('DATABASE_URL')
-                if not database_url:
+                if not DATABASE_URL:
                     return jsonify({
                         "success": False,
                         "error": "DATABASE_URL not configured"
                     }), 500
                 
-                # Query wallet pool for agent's private key
-                conn = psycopg2.connect(database_url)
-                cur = conn.cursor(cursor_factory=RealDictCursor)
-                cur.execute(
-                    "SELECT private_key FROM wallet_pool WHERE LOWER(address) = LOWER(%s)",
-                    (agent_address,)
-                )
-                wallet = cur.fetchone()
-                cur.close()
-                conn.close()
+                # Query wallet pool for agent's private key (pooled connection + cache)
+                private_key = get_agent_private_key(agent_address)
                 
-                if not wallet:
+                if not private_key:
                     return jsonify({
                         "success": False,
                         "error": f"Agent address {agent_address} not found in wallet pool"
                     }), 404
                 
-                private_key = wallet['private_key']
                 use_delegation = True
                 logger.info(f"Found agent key for {agent_address} in wallet pool")
                 
@@ -427,24 +1556,19 @@ def open_position():
         if use_delegation:
             trade_params['trader_address'] = user_address
         
-        # Try to get current price from a price oracle or default
-        # For testnet, use reasonable defaults
-        try:
-            # TODO: Integrate with price oracle (CoinGecko, Chainlink, etc.)
-            price_defaults = {
-                'BTC': 90000.0,
-                'ETH': 3000.0,
-                'SOL': 200.0,
-            }
-            current_price = price_defaults.get(market.upper(), 100.0)
-            logger.info(f"Using reference price for {market}: ${current_price}")
-        except Exception as e:
-            logger.warning(f"Could not fetch price for {market}, using default: {e}")
-            current_price = 100.0
+        # Reference price from the in-memory price oracle (bounds slippage on-chain)
+        price_data = price_oracle.get_price(market)
+        if not price_data or not price_data.get('mid'):
+            return jsonify({
+                "success": False,
+                "error": f"No live price available for {market}"
+            }), 503
+        current_price = float(price_data['mid'])
+        logger.info(f"Using oracle price for {market}: ${current_price} (age {price_oracle.age():.1f}s)")
         
         # Execute trade
         logger.info(f"📤 Calling perform_trade with params: {trade_params}, price: {current_price}")
-        result = sdk.ostium.perform_trade(trade_params, at_price=current_price)
+        result = nonce_manager.execute(lambda: sdk.ostium.perform_trade(trade_params, at_price=current_price))
         
         # Extract order_id and receipt
         order_id = result.get('order_id') if isinstance(result, dict) else None
@@ -455,8 +1579,15 @@ def open_position():
         if not order_id:
             raise Exception("No order_id returned from SDK - trade may have failed")
         
-        # TODO: Track order until filled
-        # For now, return the order_id
+        # Track the order in the background until the keeper fills or cancels it
+        order_tracker.track(
+            order_id,
+            market=market,
+            side=side,
+            collateral=position_size,
+            leverage=leverage,
+            trader=user_address if use_delegation else sdk.ostium.get_public_address()
+        )
         logger.info(f"✅ Order submitted: {order_id} (waiting for keeper to fill)")
         
         # Convert Web3 AttributeDict to regular dict for JSON serialization
@@ -474,6 +1605,7 @@ def open_position():
             "txHash": str(tx_hash) if tx_hash else '',  # Alias for compatibility
             "status": "pending",
             "message": "Order created, waiting for keeper to fill position",
+            "statusUrl": f"/orders/{order_id}",
             "result": {
                 "market": market,
                 "side": side,
@@ -488,6 +1620,35 @@ def open_position():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/orders/<order_id>', methods=['GET'])
+def get_order_status(order_id):
+    """
+    Status of a submitted order: pending, filled, cancelled or timeout
+    Only orders opened through this service are known (404 otherwise)
+    """
+    record = order_tracker.get(order_id)
+    if record is None:
+        return jsonify({"success": False, "error": f"Order {order_id} is not tracked"}), 404
+    return jsonify({"success": True, "order": record})
+
+
+@app.route('/orders/<order_id>/wait', methods=['GET'])
+def wait_for_order(order_id):
+    """
+    Long-poll until the order is filled, cancelled or times out
+    GET /orders/<id>/wait?timeout=30 (seconds, max 60)
+    """
+    timeout = min(request.args.get('timeout', default=30, type=float), ORDER_WAIT_MAX)
+    if order_tracker.get(order_id) is None:
+        return jsonify({"success": False, "error": f"Order {order_id} is not tracked"}), 404
+    record = order_tracker.wait(order_id, timeout)
+    return jsonify({
+        "success": True,
+        "order": record,
+        "resolved": record is not None and record["status"] in OrderTracker.TERMINAL
+    })
+
+
 @app.route('/close-position', methods=['POST'])
 def close_position():
     """
@@ -517,7 +1678,7 @@ def close_position():
         
         # Check if position exists
         address_to_check = user_address if use_delegation else sdk.ostium.get_public_address()
-        open_trades = sdk.get_open_trades(address_to_check)
+        open_trades, _ = run_async(sdk.get_open_trades(address_to_check))
         
         # Find matching trade
         trade_to_close = None
@@ -539,7 +1700,7 @@ def close_position():
         trade_index = trade_to_close.get('index')
         logger.info(f"Closing position: {market} (index: {trade_index})")
         
-        result = sdk.ostium.close_trade(trade_index)
+        result = nonce_manager.execute(lambda: sdk.ostium.close_trade(trade_index))
         
         # Get realized PnL from result
         realized_pnl = float(trade_to_close.get('pnl', 0))
@@ -562,10 +1723,21 @@ def close_position():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def is_private_key(private_key) -> bool:
+    """True if private_key parses as a signing key (checked before queueing a transaction)"""
+    try:
+        Web3().eth.account.from_key(private_key)
+        return True
+    except Exception:
+        return False
+
+
 @app.route('/transfer', methods=['POST'])
 def transfer_usdc():
     """
     Transfer USDC (for profit share collection)
+    The transfer is queued and the call returns immediately;
+    poll GET /tx/<jobId> for the receipt.
     Body: {
         "agentPrivateKey": "0x...",   # Agent's key
         "toAddress": "0x...",          # Platform wallet
@@ -586,30 +1758,39 @@ def transfer_usdc():
                 "error": "Missing required fields: agentPrivateKey, toAddress, amount"
             }), 400
         
-        # Get SDK with delegation if vault_address provided
-        use_delegation = vault_address is not None
-        sdk = get_sdk(agent_key, use_delegation)
+        if not is_private_key(agent_key):
+            return jsonify({"success": False, "error": "Invalid agentPrivateKey format"}), 400
+        
+        try:
+            to_address = Web3.to_checksum_address(to_address)
+        except Exception as e:
+            return jsonify({"success": False, "error": f"Invalid toAddress format: {str(e)}"}), 400
         
         logger.info(f"Transferring {amount} USDC to {to_address}")
         if vault_address:
             logger.info(f"   From user: {vault_address} (via delegation)")
         
-        # Execute transfer (withdraw to platform wallet)
-        result = sdk.ostium.withdraw(
+        # Same USDC transfer as the SDK's withdraw(), sent through the transaction queue
+        usdc_contract = get_read_sdk().ostium.usdc_contract
+        job = tx_queue.submit(
+            'transfer',
+            usdc_contract.functions.transfer(to_address, int(round(amount * 1e6))),
+            agent_key,
             amount=amount,
-            destination=to_address
+            to=to_address
         )
         
-        logger.info(f"✅ Transfer complete: {result.get('transactionHash')}")
-        
         return jsonify({
             "success": True,
+            "message": "Transfer queued",
+            "jobId": job["jobId"],
+            "status": job["status"],
+            "statusUrl": f"/tx/{job['jobId']}",
             "result": {
-                "txHash": result.get('transactionHash', ''),
                 "amount": amount,
                 "to": to_address
             }
-        })
+        }), 202
     
     except Exception as e:
         logger.error(f"Transfer error: {str(e)}")
@@ -621,6 +1802,8 @@ def transfer_usdc():
 def approve_agent():
     """
     User approves agent to trade on their behalf
+    The setDelegate transaction is queued and the call returns immediately;
+    poll GET /tx/<jobId> for the receipt.
     Body: {
         "userPrivateKey": "0x...",  # User's key
         "agentAddress": "0x..."      # Agent to approve
@@ -637,59 +1820,33 @@ def approve_agent():
                 "error": "Missing required fields: userPrivateKey, agentAddress"
             }), 400
         
-        # User SDK (no delegation)
-        network = 'testnet' if OSTIUM_TESTNET else 'mainnet'
-        sdk = OstiumSDK(
-            network=network,
-            private_key=user_key,
-            rpc_url=OSTIUM_RPC_URL
-        )
+        try:
+            agent_address = Web3.to_checksum_address(agent_address)
+        except Exception as e:
+            return jsonify({"success": False, "error": f"Invalid agentAddress format: {str(e)}"}), 400
+        
+        if not is_private_key(user_key):
+            return jsonify({"success": False, "error": "Invalid userPrivateKey format"}), 400
         
         logger.info(f"User approving agent: {agent_address}")
         
         # Call setDelegate on the Ostium Trading contract
-        trading_contract = sdk.ostium.ostium_trading_contract
-        web3 = sdk.ostium.web3
-        
-        # Get user account
-        user_account = web3.eth.account.from_key(user_key)
-        
-        # Build the transaction
-        tx = trading_contract.functions.setDelegate(agent_address).build_transaction({
-            'from': user_account.address,
-            'nonce': web3.eth.get_transaction_count(user_account.address),
-            'gas': 200000,
-            'gasPrice': web3.eth.gas_price,
-        })
-        
-        # Sign the transaction
-        signed_tx = web3.eth.account.sign_transaction(tx, user_key)
-        
-        # Send the transaction
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
-        # Wait for receipt
-        logger.info(f"Transaction sent: {tx_hash.hex()}")
-        receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        trading_contract = get_read_sdk().ostium.ostium_trading_contract
+        job = tx_queue.submit(
+            'approve-agent',
+            trading_contract.functions.setDelegate(agent_address),
+            user_key,
+            agentAddress=agent_address
+        )
         
-        if receipt['status'] == 1:
-            logger.info(f"✅ Agent approved! Tx hash: {tx_hash.hex()}")
-            
-            return jsonify({
-                "success": True,
-                "message": "Agent approved successfully on Ostium smart contracts",
-                "agentAddress": agent_address,
-                "transactionHash": tx_hash.hex(),
-                "blockNumber": receipt['blockNumber'],
-                "gasUsed": receipt['gasUsed']
-            })
-        else:
-            logger.error(f"Transaction failed: {tx_hash.hex()}")
-            return jsonify({
-                "success": False,
-                "error": "Transaction reverted",
-                "transactionHash": tx_hash.hex()
-            }), 500
+        return jsonify({
+            "success": True,
+            "message": "Agent approval queued",
+            "agentAddress": agent_address,
+            "jobId": job["jobId"],
+            "status": job["status"],
+            "statusUrl": f"/tx/{job['jobId']}"
+        }), 202
     
     except Exception as e:
         logger.error(f"Approval error: {str(e)}")
@@ -697,6 +1854,28 @@ def approve_agent():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/tx/<job_id>', methods=['GET'])
+def get_transaction_status(job_id):
+    """Status of a queued on-chain write: queued, submitted, confirmed, reverted, failed or timeout"""
+    record = tx_queue.get(job_id)
+    if record is None:
+        return jsonify({"success": False, "error": f"Unknown job {job_id}"}), 404
+    return jsonify({"success": True, "job": record})
+
+
+@app.route('/agent-keys/invalidate', methods=['POST'])
+def invalidate_agent_keys():
+    """
+    Drop cached agent keys after wallet_pool changes
+    Body: { "agentAddress": "0x..." }  (omit to clear the whole cache)
+    """
+    data = request.json or {}
+    agent_address = data.get('agentAddress')
+    invalidate_agent_key(agent_address)
+    logger.info(f"Invalidated agent key cache: {agent_address or 'all'}")
+    return jsonify({"success": True, "invalidated": agent_address or "all"})
+
+
 @app.route('/faucet', methods=['POST'])
 def request_faucet():
     """
@@ -752,11 +1931,10 @@ def request_faucet():
 def get_market_info():
     """Get available trading pairs and market info"""
     try:
-        network = NetworkConfig.testnet() if OSTIUM_TESTNET else NetworkConfig.mainnet()
-        sdk = OstiumSDK(network=network, rpc_url=OSTIUM_RPC_URL)
+        sdk = get_read_sdk()
         
         # Get available pairs
-        pairs = sdk.get_formatted_pairs_details()
+        pairs = run_async(sdk.get_formatted_pairs_details())
         
         return jsonify({
             "success": True,
@@ -770,11 +1948,39 @@ def get_market_info():
 
 
 
+@app.route('/prices', methods=['GET'])
+def get_prices():
+    """
+    Latest prices from the in-memory oracle
+    GET /prices?market=BTC (optional: single market)
+    """
+    try:
+        market = request.args.get('market')
+        snapshot = price_oracle.snapshot()
+        if market:
+            price_data = snapshot.get((market.upper(), 'USD'))
+            if not price_data:
+                return jsonify({"success": False, "error": f"No price for {market}"}), 404
+            prices = {market.upper(): price_data}
+        else:
+            prices = {f"{base}/{quote}": data for (base, quote), data in snapshot.items()}
+        
+        return jsonify({
+            "success": True,
+            "prices": prices,
+            "age": price_oracle.age(),
+            "updatedAt": price_oracle.updated_at
+        })
+    except Exception as e:
+        logger.error(f"Prices error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/available-markets', methods=['GET'])
 def available_markets():
     """
     Get list of available trading markets
-    GET /available-markets?refresh=true (optional: refresh cache)
+    GET /available-markets?refresh=true (optional: refresh in the background)
     Returns: { "success": true, "markets": { "BTC": {...}, "ETH": {...}, ... }, "count": 3 }
     """
     try:
@@ -818,6 +2024,22 @@ def validate_market_endpoint():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def start_services():
+    """Start background workers (called once per process: dev server or each WSGI worker)"""
+    get_read_sdk()  # build contracts and ABIs before the first request
+    price_oracle.start()
+    market_catalog.get()  # revalidate the snapshot loaded at import if it is stale
+
+
+def stop_services():
+    """Stop the price oracle, let queued transactions finish sending, then release the event loop and DB pool"""
+    price_oracle.stop()
+    tx_queue.shutdown()
+    stop_async_loop()
+    if db_pool is not None:
+        db_pool.closeall()
+
+
 if __name__ == '__main__':
     # Create logs directory
     os.makedirs('logs', exist_ok=True)
@@ -825,6 +2047,8 @@ if __name__ == '__main__':
     logger.info(f"🚀 Starting Ostium Service on port {PORT}")
     logger.info(f"   Network: {'TESTNET (Arbitrum Sepolia)' if OSTIUM_TESTNET else 'MAINNET'}")
     
+    start_services()
+    
     app.run(
         host='0.0.0.0',
         port=PORT,
@@ -18,30 +18,55 @@ fi
 # Get absolute path to services directory
 SERVICES_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 
-# Start Hyperliquid service
+# Production: gunicorn (see gunicorn.conf.py / wsgi.py); fallback: Flask dev server
+# SERVER=dev forces the dev server
+if [ "${SERVER:-gunicorn}" = "gunicorn" ] && command -v gunicorn >/dev/null 2>&1; then
+    USE_GUNICORN=true
+    echo "Using gunicorn (workers: ${GUNICORN_WORKERS:-2}, threads: ${GUNICORN_THREADS:-16})"
+else
+    USE_GUNICORN=false
+    echo "⚠️  gunicorn not found (or SERVER=dev) - using the Flask development server"
+fi
+
+cd "$SERVICES_DIR"
+
+# start_service <name> <port> <script> [gunicorn workers override]
+start_service() {
+    local name=$1 port=$2 script=$3 workers=$4
+    if [ "$USE_GUNICORN" = true ]; then
+        GUNICORN_WORKERS=${workers:-${GUNICORN_WORKERS:-2}} \
+            gunicorn -c gunicorn.conf.py --bind "0.0.0.0:$port" "wsgi:create_app(\"$name\")" &
+    else
+        PORT=$port HYPERLIQUID_SERVICE_PORT=$port OSTIUM_SERVICE_PORT=$port TWITTER_PROXY_PORT=$port \
+            python3 "$script" &
+    fi
+}
+
+# Start Hyperliquid service (HYPERLIQUID_ASGI=true serves read endpoints async via uvicorn)
 echo "Starting Hyperliquid service on port $HYPERLIQUID_PORT..."
-cd "$SERVICES_DIR/hyperliquid-service"
-PORT=$HYPERLIQUID_PORT python3 app.py &
+if [ "${HYPERLIQUID_ASGI:-false}" = "true" ] && command -v uvicorn >/dev/null 2>&1; then
+    uvicorn hyperliquid_asgi:app --host 0.0.0.0 --port $HYPERLIQUID_PORT --workers ${GUNICORN_WORKERS:-2} &
+else
+    start_service hyperliquid $HYPERLIQUID_PORT hyperliquid-service.py
+fi
 HYPERLIQUID_PID=$!
 echo "✅ Hyperliquid service started (PID: $HYPERLIQUID_PID)"
 
 # Wait for Hyperliquid to start
 sleep 3
 
-# Start Ostium service
+# Start Ostium service (single process: nonce manager and tx queue are per-process)
 echo "Starting Ostium service on port $OSTIUM_PORT..."
-cd "$SERVICES_DIR"
-PORT=$OSTIUM_PORT python3 ostium-service.py &
+start_service ostium $OSTIUM_PORT ostium-service.py 1
 OSTIUM_PID=$!
 echo "✅ Ostium service started (PID: $OSTIUM_PID)"
 
 # Wait for Ostium to start
 sleep 3
 
-# Start Twitter proxy
+# Start Twitter proxy (single process: rate-limit scheduler, caches and watch poller are per-process)
 echo "Starting Twitter proxy on port $TWITTER_PORT..."
-cd "$SERVICES_DIR"
-TWITTER_PROXY_PORT=$TWITTER_PORT python3 twitter-proxy.py &
+start_service twitter $TWITTER_PORT twitter-proxy.py 1
 TWITTER_PID=$!
 echo "✅ Twitter proxy started (PID: $TWITTER_PID)"
 
@@ -62,8 +87,8 @@ echo ""
 echo "Press Ctrl+C to stop all services"
 echo ""
 
-# Handle shutdown gracefully
-trap "kill $HYPERLIQUID_PID $OSTIUM_PID $TWITTER_PID 2>/dev/null" EXIT
+# Handle shutdown gracefully (SIGTERM lets gunicorn finish in-flight requests)
+trap "kill -TERM $HYPERLIQUID_PID $OSTIUM_PID $TWITTER_PID 2>/dev/null; wait" EXIT
 
 # Wait for all processes
 wait
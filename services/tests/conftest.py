@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the service tests
+Services are loaded through wsgi.load_service, with the Hyperliquid SDK's
+Info constructor patched out (it fetches metadata over the network).
+"""
+
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wsgi  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def hl():
+    """The hyperliquid service module (loaded once, without network access)"""
+    import hyperliquid.info
+    with mock.patch.object(hyperliquid.info.Info, '__init__', lambda self, *args, **kwargs: None):
+        return wsgi.load_service('hyperliquid')
+
+
+@pytest.fixture(scope='session')
+def ostium():
+    """The ostium service module"""
+    return wsgi.load_service('ostium')
+
+
+@pytest.fixture(scope='session')
+def twitter():
+    """The twitter proxy module"""
+    return wsgi.load_service('twitter')
@@ -0,0 +1,98 @@
+"""
+FillStore incremental sync, dedup and cursor paging
+"""
+
+import pytest
+
+ADDRESS = '0xAbC0000000000000000000000000000000000001'
+
+
+class FakeInfo:
+    """user_fills_by_time over a fixed list, at most `page` fills per call (oldest first)"""
+
+    def __init__(self, fills, page):
+        self.fills = fills
+        self.page = page
+        self.calls = []
+
+    def user_fills_by_time(self, address, start_time):
+        self.calls.append(start_time)
+        return [f for f in sorted(self.fills, key=lambda f: f["time"]) if f["time"] >= start_time][:self.page]
+
+
+def fill(tid, time):
+    return {"tid": tid, "time": time, "coin": "BTC", "side": "B", "px": "60000", "sz": "0.1",
+            "closedPnl": "0", "fee": "0.01", "oid": tid * 10}
+
+
+@pytest.fixture
+def make_store(hl, tmp_path, monkeypatch):
+    monkeypatch.setattr(hl, 'FILLS_UPSTREAM_PAGE', 3)
+
+    def make(fills, sync_interval=0):
+        info = FakeInfo(fills, page=3)
+        return hl.FillStore(info, str(tmp_path / 'fills.db'), sync_interval), info
+    return make
+
+
+def test_sync_pages_upstream_and_dedups(make_store):
+    # Times repeat across page boundaries; the inclusive restart must not duplicate
+    fills = [fill(1, 100), fill(2, 100), fill(3, 200), fill(4, 200), fill(5, 300), fill(6, 400), fill(7, 400)]
+    store, info = make_store(fills)
+
+    store.sync(ADDRESS)
+
+    assert [f["tid"] for f in store.latest(ADDRESS)] == [7, 6, 5, 4, 3, 2, 1]
+    assert info.calls == [0, 200, 300, 400]
+    assert store.stats()["fills"] == 7
+
+
+def test_sync_resumes_from_last_stored_time(make_store):
+    fills = [fill(1, 100), fill(2, 200)]
+    store, info = make_store(fills)
+    store.sync(ADDRESS)
+    fills.append(fill(3, 300))
+    info.calls.clear()
+
+    store.sync(ADDRESS.lower())
+
+    assert info.calls == [200]
+    assert [f["tid"] for f in store.latest(ADDRESS)] == [3, 2, 1]
+
+
+def test_sync_is_throttled_per_address(make_store):
+    store, info = make_store([fill(1, 100)], sync_interval=60)
+    store.sync(ADDRESS)
+    store.sync(ADDRESS)
+    assert info.calls == [0]
+    assert store.upstream_calls == 1
+
+
+def test_page_walks_all_fills_in_order(make_store):
+    fills = [fill(tid, 100 * (tid // 2)) for tid in range(1, 8)]  # time ties within pairs
+    store, _ = make_store(fills)
+    store.sync(ADDRESS)
+
+    seen, cursor, has_more = [], None, True
+    while has_more:
+        page, cursor, has_more = store.page(ADDRESS, cursor=cursor, limit=3)
+        seen.extend(f["tid"] for f in page)
+    assert seen == [1, 2, 3, 4, 5, 6, 7]
+
+    # Nothing new after the last cursor; the cursor is returned unchanged
+    assert store.page(ADDRESS, cursor=cursor, limit=3) == ([], cursor, False)
+
+
+def test_page_since_time(make_store):
+    store, _ = make_store([fill(1, 100), fill(2, 200), fill(3, 300)])
+    store.sync(ADDRESS)
+    page, _, has_more = store.page(ADDRESS, since_time=200)
+    assert [f["tid"] for f in page] == [2, 3]
+    assert not has_more
+
+
+def test_address_locks_are_a_fixed_stripe_set(make_store, hl):
+    store, _ = make_store([])
+    locks = {id(store._address_lock(f"0x{i:040x}")) for i in range(1000)}
+    assert len(locks) <= hl.FILLS_LOCK_STRIPES
+    assert store._address_lock(ADDRESS.lower()) is store._address_lock(ADDRESS.lower())
@@ -0,0 +1,101 @@
+"""
+MarketCatalog snapshot loading and stale-while-revalidate refreshes
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+SNAPSHOT_MARKETS = {'BTC': {'index': 0, 'name': 'BTC/USD', 'available': True}}
+API_MARKETS = {**SNAPSHOT_MARKETS, 'ETH': {'index': 1, 'name': 'ETH/USD', 'available': True}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def api(ostium, monkeypatch):
+    """Fake database API; set api.response / api.gate to control it"""
+    class Api:
+        calls = 0
+        gate = None
+        response = FakeResponse(200, {'success': True, 'markets': API_MARKETS})
+
+        def get(self, url, timeout):
+            Api.calls += 1
+            if self.gate is not None:
+                self.gate.wait(5)
+            return self.response
+
+    fake = Api()
+    monkeypatch.setattr(ostium.requests, 'get', fake.get)
+    return fake
+
+
+def write_snapshot(path, age):
+    path.write_text(json.dumps({'markets': SNAPSHOT_MARKETS, 'updatedAt': time.time() - age, 'source': 'api'}))
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fresh_snapshot_is_served_without_fetching(ostium, api, tmp_path):
+    write_snapshot(tmp_path / 'markets.json', age=10)
+    catalog = ostium.MarketCatalog(str(tmp_path / 'markets.json'), ttl=300, retry_interval=30)
+    assert catalog.get() == SNAPSHOT_MARKETS
+    assert api.calls == 0
+
+
+def test_missing_snapshot_falls_back_and_refreshes(ostium, api, tmp_path):
+    catalog = ostium.MarketCatalog(str(tmp_path / 'markets.json'), ttl=300, retry_interval=30)
+    api.gate = threading.Event()
+    assert catalog.get() == ostium.FALLBACK_MARKETS
+    api.gate.set()
+    wait_until(lambda: catalog.refreshes == 1)
+    assert catalog.get() == API_MARKETS
+
+
+def test_stale_snapshot_is_served_while_one_refresh_runs(ostium, api, tmp_path):
+    path = tmp_path / 'markets.json'
+    write_snapshot(path, age=600)
+    catalog = ostium.MarketCatalog(str(path), ttl=300, retry_interval=30)
+    api.gate = threading.Event()
+
+    assert catalog.get() == SNAPSHOT_MARKETS  # stale, returned immediately
+    assert catalog.get() == SNAPSHOT_MARKETS
+    wait_until(lambda: api.calls == 1)
+    assert catalog.stats()["refreshing"] is True
+
+    api.gate.set()
+    wait_until(lambda: not catalog.stats()["refreshing"])
+    assert api.calls == 1
+    assert catalog.get() == API_MARKETS
+    assert json.loads(path.read_text())['markets'] == API_MARKETS  # snapshot rewritten
+
+
+def test_failed_refresh_waits_for_retry_interval(ostium, api, tmp_path):
+    write_snapshot(tmp_path / 'markets.json', age=600)
+    catalog = ostium.MarketCatalog(str(tmp_path / 'markets.json'), ttl=300, retry_interval=30)
+    api.response = FakeResponse(503, {})
+
+    catalog.get()
+    wait_until(lambda: catalog.last_error is not None and not catalog.stats()["refreshing"])
+    catalog.get()  # within retry_interval: no new attempt
+    time.sleep(0.05)
+    assert api.calls == 1
+    assert catalog.get() == SNAPSHOT_MARKETS
+
+    catalog.get(refresh=True)  # forced refreshes ignore the retry interval
+    wait_until(lambda: api.calls == 2)
@@ -0,0 +1,112 @@
+"""
+MidsFeed against a local websocket stand-in for the Hyperliquid allMids stream
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+MIDS = {"BTC": "64250.5", "ETH": "3120.25", "SOL": "145.1"}
+
+
+class FakeInfo:
+    """REST all_mids() returning the same snapshot the websocket pushes"""
+
+    def meta(self):
+        return {"universe": [{"name": coin, "szDecimals": 2} for coin in MIDS]}
+
+    def all_mids(self):
+        return dict(MIDS)
+
+
+class StandIn:
+    """allMids websocket server on a background event loop"""
+
+    def __init__(self):
+        self.connections = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _handler(self, ws):
+        self.connections += 1
+        async for raw in ws:
+            if json.loads(raw).get("subscription", {}).get("type") == "allMids":
+                await ws.send(json.dumps({"channel": "allMids", "data": {"mids": MIDS}}))
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+
+        async def serve():
+            self._server = await websockets.serve(self._handler, '127.0.0.1', 0)
+            self.port = self._server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._server.wait_closed()
+
+        self._loop.run_until_complete(serve())
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return f"ws://127.0.0.1:{self.port}"
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._thread.join(5)
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    url = server.start()
+    yield server, url
+    server.close()
+
+
+def test_feed_matches_polling(hl, stand_in):
+    server, url = stand_in
+    polled = hl.MarketMetadataStore(FakeInfo(), 300, 1, 3, 60)
+    polled.refresh_mids()
+
+    pushed = hl.MarketMetadataStore(FakeInfo(), 300, 1, 3, 60)
+    feed = hl.MidsFeed(pushed, url)
+    pushed.feed = feed
+    feed.start()
+    try:
+        assert wait_for(lambda: pushed.mids_source == 'ws')
+        assert pushed.mids == polled.mids
+        assert pushed.feed_healthy()
+    finally:
+        feed.stop()
+
+
+def test_stop_ends_reconnect_loop(hl, stand_in):
+    server, url = stand_in
+    store = hl.MarketMetadataStore(FakeInfo(), 300, 1, 3, 60)
+    feed = hl.MidsFeed(store, url)
+    feed.start()
+    assert wait_for(lambda: feed.connected)
+    thread = feed._thread
+
+    feed.stop()
+
+    assert not thread.is_alive()
+    assert not feed.connected
+    connections = server.connections
+    time.sleep(1.5)  # longer than the first reconnect backoff
+    assert server.connections == connections
+    assert feed.reconnects == 0
@@ -0,0 +1,72 @@
+"""
+NonceManager allocation, release, resync and nonce-error retries
+"""
+
+import pytest
+
+SIGNER = '0x' + 'ab' * 20
+
+
+@pytest.fixture
+def manager(ostium):
+    nonces = ostium.NonceManager()
+    nonces.chain = {SIGNER.lower(): 7}
+    nonces._chain_nonce = lambda address: nonces.chain[address.lower()]
+    return nonces
+
+
+def test_allocate_counts_up_from_chain(manager):
+    assert [manager.allocate(SIGNER) for _ in range(3)] == [7, 8, 9]
+    assert manager.allocate(SIGNER.upper().replace('0X', '0x')) == 10  # case-insensitive
+
+
+def test_released_nonces_are_reused_lowest_first(manager):
+    allocated = [manager.allocate(SIGNER) for _ in range(4)]  # 7..10
+    manager.release(SIGNER, allocated[2])
+    manager.release(SIGNER, allocated[1])
+    manager.release(SIGNER, 99)  # never handed out: ignored
+    assert [manager.allocate(SIGNER) for _ in range(3)] == [8, 9, 11]
+
+
+def test_resync_rereads_chain(manager):
+    manager.allocate(SIGNER)
+    manager.allocate(SIGNER)
+    manager.chain[SIGNER.lower()] = 20
+    manager.resync(SIGNER)
+    assert manager.allocate(SIGNER) == 20
+    assert manager.stats()["resyncs"] == 1
+
+
+def test_execute_retries_after_nonce_too_low(manager):
+    attempts = []
+
+    def send():
+        nonce = manager.allocate(SIGNER)
+        attempts.append(nonce)
+        if len(attempts) == 1:
+            manager.chain[SIGNER.lower()] = 12  # another sender used 7..11
+            raise ValueError("nonce too low: next nonce 12, tx nonce 7")
+        return nonce
+
+    assert manager.execute(send) == 12
+    assert attempts == [7, 12]
+
+
+def test_execute_releases_unsent_nonce_on_other_errors(manager):
+    def send():
+        manager.allocate(SIGNER)
+        raise RuntimeError("insufficient funds for gas")
+
+    with pytest.raises(RuntimeError):
+        manager.execute(send)
+    assert manager.allocate(SIGNER) == 7  # chain never consumed it
+
+
+def test_execute_gives_up_after_retries(manager):
+    def send():
+        manager.allocate(SIGNER)
+        raise ValueError("invalid nonce")
+
+    with pytest.raises(ValueError):
+        manager.execute(send, retries=1)
+    assert manager.stats()["resyncs"] == 2
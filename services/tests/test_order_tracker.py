@@ -0,0 +1,106 @@
+"""
+OrderTracker status transitions, paging, waiting and the /orders endpoints
+"""
+
+import threading
+import time
+
+import pytest
+
+
+class Orders(dict):
+    """Fake subgraph: order id -> order row, plus the ids of each query"""
+
+    def __init__(self):
+        super().__init__()
+        self.queries = []
+
+
+@pytest.fixture
+def subgraph(ostium, monkeypatch):
+    orders = Orders()
+
+    def query(document, variables):
+        orders.queries.append(variables["ids"])
+        return {"orders": [orders[oid] for oid in variables["ids"] if oid in orders]}
+
+    monkeypatch.setattr(ostium, 'subgraph_query', query)
+    return orders
+
+
+@pytest.fixture
+def tracker(ostium, monkeypatch, subgraph):
+    tracker = ostium.OrderTracker(poll_interval=1, timeout=60, retention=60)
+    monkeypatch.setattr(tracker, 'start', lambda: None)  # tests drive poll() themselves
+    return tracker
+
+
+def filled(order_id, price=61000.5, trade_id='7'):
+    return {"id": order_id, "isPending": False, "isCancelled": False, "tradeID": trade_id,
+            "price": str(int(price * 10**18)), "executedTx": "0xtx"}
+
+
+def test_poll_resolves_filled_and_cancelled_orders(tracker, subgraph):
+    for order_id in ('1', '2', '3'):
+        tracker.track(order_id, market='BTC')
+    subgraph['1'] = filled('1')
+    subgraph['2'] = {"id": '2', "isPending": False, "isCancelled": True, "cancelReason": "SLIPPAGE"}
+    subgraph['3'] = {"id": '3', "isPending": True}
+
+    tracker.poll()
+
+    assert tracker.get('1')["status"] == "filled"
+    assert tracker.get('1')["executionPrice"] == pytest.approx(61000.5)
+    assert tracker.get('1')["market"] == 'BTC'
+    assert tracker.get('2')["status"] == "cancelled"
+    assert tracker.get('2')["cancelReason"] == "SLIPPAGE"
+    assert tracker.get('3')["status"] == "pending"
+    assert tracker.stats() == {"filled": 1, "cancelled": 1, "pending": 1}
+
+    tracker.poll()  # only the pending order is queried again
+    assert subgraph.queries[-1] == ['3']
+
+
+def test_poll_pages_ids(tracker, subgraph, ostium, monkeypatch):
+    monkeypatch.setattr(ostium, 'SUBGRAPH_PAGE_SIZE', 2)
+    for order_id in range(5):
+        tracker.track(order_id)
+    tracker.poll()
+    assert subgraph.queries == [['0', '1'], ['2', '3'], ['4']]
+
+
+def test_stale_orders_time_out_and_expire(tracker, subgraph):
+    tracker.track('1')
+    tracker.orders['1']["submittedAt"] -= 61
+    tracker.poll()
+    assert tracker.get('1')["status"] == "timeout"
+    assert subgraph.queries == []  # nothing left pending to query
+
+    tracker.orders['1']["updatedAt"] -= 61
+    tracker.poll()
+    assert tracker.get('1') is None
+
+
+def test_wait_returns_when_the_order_resolves(tracker, subgraph):
+    tracker.track('1')
+    subgraph['1'] = filled('1')
+    threading.Timer(0.1, tracker.poll).start()
+
+    started = time.time()
+    record = tracker.wait('1', timeout=5)
+
+    assert record["status"] == "filled"
+    assert time.time() - started < 2
+    assert tracker.wait('unknown', timeout=5) is None
+
+
+def test_order_endpoints_404_for_untracked_ids(ostium, tracker, monkeypatch):
+    monkeypatch.setattr(ostium, 'order_tracker', tracker)
+    tracker.track('1')
+    client = ostium.app.test_client()
+
+    assert client.get('/orders/1').get_json()["order"]["status"] == "pending"
+    assert client.get('/orders/2').status_code == 404
+    assert client.get('/orders/2/wait?timeout=0').status_code == 404
+    body = client.get('/orders/1/wait?timeout=0').get_json()
+    assert body["resolved"] is False
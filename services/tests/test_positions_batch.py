@@ -0,0 +1,78 @@
+"""
+Batched open-trades reads and POST /positions/batch
+"""
+
+import pytest
+
+ALICE = '0x' + 'aa' * 20
+BOB = '0x' + 'bB' * 20
+
+
+class FakeSubgraph:
+    """Serves aliased `trades` selections from a per-trader list, paging by id like The Graph"""
+
+    def __init__(self, trades_by_trader):
+        self.trades_by_trader = trades_by_trader
+        self.requests = []
+
+    def __call__(self, query, variables):
+        self.requests.append(variables)
+        data = {}
+        for key, traders in variables.items():
+            if not key.endswith('_traders'):
+                continue
+            alias = key[:-len('_traders')]
+            matching = sorted(
+                (t for trader in traders for t in self.trades_by_trader.get(trader, [])),
+                key=lambda t: t['id']
+            )
+            last_id = variables[f"{alias}_lastId"]
+            data[alias] = [t for t in matching if t['id'] > last_id][:variables['first']]
+        return data
+
+
+def trades_for(trader, count):
+    return [{'id': f"{trader}-{i:03d}", 'trader': trader} for i in range(count)]
+
+
+def test_fetch_open_trades_batch_chunks_and_pages(ostium, monkeypatch):
+    traders = [f"0x{i:040x}" for i in range(5)]
+    counts = {0: 3, 2: 1, 4: 1}  # only the first chunk (traders 0-1) needs a second page
+    subgraph = FakeSubgraph({trader: trades_for(trader, counts.get(i, 0)) for i, trader in enumerate(traders)})
+    monkeypatch.setattr(ostium, 'subgraph_query', subgraph)
+    monkeypatch.setattr(ostium, 'BATCH_CHUNK_SIZE', 2)
+    monkeypatch.setattr(ostium, 'SUBGRAPH_PAGE_SIZE', 2)
+
+    trades = ostium.fetch_open_trades_batch(traders)
+
+    assert sorted(t['id'] for t in trades) == sorted(t['id'] for ts in subgraph.trades_by_trader.values() for t in ts)
+    # Chunks c0..c2 go in one request; only chunks with a full page are asked again
+    assert {k for k in subgraph.requests[0] if k.endswith('_traders')} == {'c0_traders', 'c1_traders', 'c2_traders'}
+    assert len(subgraph.requests) == 2
+    assert all({k for k in request if k.endswith('_traders')} == {'c0_traders'} for request in subgraph.requests[1:])
+
+
+@pytest.fixture
+def client(ostium, monkeypatch):
+    trades = trades_for(ALICE, 2) + trades_for(BOB.lower(), 1)
+    monkeypatch.setattr(ostium, 'get_read_sdk', lambda: None)
+    monkeypatch.setattr(ostium, 'fetch_open_trades_batch', lambda traders: [t for t in trades if t['trader'] in traders])
+    monkeypatch.setattr(ostium, 'positions_with_metrics', lambda sdk, trades: [{"tradeId": t['id']} for t in trades])
+    return ostium.app.test_client()
+
+
+def test_positions_batch_groups_by_address_as_sent(client):
+    response = client.post('/positions/batch', json={"addresses": [ALICE, BOB, 'not-an-address', ALICE]})
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body["count"] == 3
+    assert [p["tradeId"] for p in body["results"][ALICE]["positions"]] == [f"{ALICE}-000", f"{ALICE}-001"]
+    assert [p["tradeId"] for p in body["results"][BOB]["positions"]] == [f"{BOB.lower()}-000"]
+    assert body["results"]['not-an-address']["success"] is False
+
+
+def test_positions_batch_rejects_bad_requests(client, ostium, monkeypatch):
+    assert client.post('/positions/batch', json={"addresses": ALICE}).status_code == 400
+    monkeypatch.setattr(ostium, 'BATCH_MAX_ADDRESSES', 1)
+    assert client.post('/positions/batch', json={"addresses": [ALICE, BOB]}).status_code == 400
@@ -0,0 +1,92 @@
+"""
+RateLimitScheduler pacing, rate-limit windows, 429 holds and priorities
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+URL = 'https://api.example/2/users/1/tweets'
+
+
+def response(status_code=200, **headers):
+    return SimpleNamespace(url=URL, status_code=status_code,
+                           headers={f"x-rate-limit-{k}": str(v) for k, v in headers.items()})
+
+
+def timed(fn):
+    started = time.time()
+    fn()
+    return time.time() - started
+
+
+def test_token_bucket_allows_burst_then_paces(twitter):
+    scheduler = twitter.RateLimitScheduler(rate=10, burst=2)
+    endpoint = twitter.endpoint_for(URL)
+    assert timed(lambda: [scheduler.acquire(endpoint) for _ in range(2)]) < 0.05
+    assert 0.05 < timed(lambda: scheduler.acquire(endpoint)) < 0.5
+    assert scheduler.stats()["calls"] == 3
+
+
+def test_acquire_throttles_beyond_max_wait(twitter):
+    scheduler = twitter.RateLimitScheduler(rate=0.1, burst=1)
+    endpoint = twitter.endpoint_for(URL)
+    scheduler.acquire(endpoint)
+    with pytest.raises(twitter.Throttled) as raised:
+        scheduler.acquire(endpoint, max_wait=0.5)
+    assert raised.value.retry_after > 0.5
+    assert scheduler.stats()["throttled"] == 1
+    assert scheduler.stats()["waiting"] == 0
+
+
+def test_exhausted_window_holds_until_reset(twitter):
+    scheduler = twitter.RateLimitScheduler(rate=0, burst=1)
+    endpoint = twitter.endpoint_for(URL)
+    scheduler.observe(response(limit=10, remaining=0, reset=time.time() + 0.3))
+
+    assert scheduler.stats()["windows"][endpoint]["remaining"] == 0
+    assert 0.2 < timed(lambda: scheduler.acquire(endpoint, max_wait=2)) < 1
+    scheduler.acquire('another-endpoint', max_wait=0)  # other endpoints are unaffected
+
+
+def test_over_half_used_window_is_spread_until_reset(twitter):
+    scheduler = twitter.RateLimitScheduler(rate=0, burst=1)
+    endpoint = twitter.endpoint_for(URL)
+    scheduler.observe(response(limit=10, remaining=2, reset=time.time() + 0.4))
+    scheduler.acquire(endpoint)
+    assert 0.1 < timed(lambda: scheduler.acquire(endpoint, max_wait=2)) < 0.5  # ~0.4s / 2 remaining
+
+
+def test_429_without_headers_backs_off(twitter, monkeypatch):
+    monkeypatch.setattr(twitter, 'RATE_LIMIT_BACKOFF', 60)
+    scheduler = twitter.RateLimitScheduler(rate=0, burst=1)
+    endpoint = twitter.endpoint_for(URL)
+    scheduler.observe(response(status_code=429))
+
+    with pytest.raises(twitter.Throttled):
+        scheduler.acquire(endpoint, max_wait=1)
+    assert scheduler.stats()["rate_limited"] == 1
+    assert scheduler.stats()["windows"][endpoint]["resets_in"] > 50
+
+
+def test_fresh_polls_are_released_before_backfills(twitter):
+    scheduler = twitter.RateLimitScheduler(rate=0, burst=1)
+    endpoint = twitter.endpoint_for(URL)
+    scheduler.observe(response(limit=10, remaining=0, reset=time.time() + 0.3))
+    order = []
+
+    def acquire(name, priority):
+        scheduler.acquire(endpoint, priority=priority, max_wait=5)
+        order.append(name)
+
+    backfill = threading.Thread(target=acquire, args=('backfill', twitter.PRIORITY_BACKFILL))
+    backfill.start()
+    time.sleep(0.05)
+    fresh = threading.Thread(target=acquire, args=('fresh', twitter.PRIORITY_FRESH))
+    fresh.start()
+    backfill.join(5)
+    fresh.join(5)
+
+    assert order == ['fresh', 'backfill']
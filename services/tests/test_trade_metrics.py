@@ -0,0 +1,76 @@
+"""
+compute_trade_metrics against the Ostium SDK's per-trade formulae
+"""
+
+from decimal import Decimal
+
+import pytest
+from ostium_python_sdk.formulae import CurrentTotalProfitRaw, GetTradeFundingFee, GetTradeRolloverFee
+
+PAIR = {'id': '0', 'from': 'BTC', 'to': 'USD', 'maxLeverage': '10000'}
+ACCUMULATORS = {'0': (0.0003, 0.0002, -0.0001)}  # pair id -> (rollover, fundingLong, fundingShort)
+PRICES = {('BTC', 'USD'): {'bid': '60900', 'mid': '61000', 'ask': '61100'}}
+
+
+def trade(is_buy, open_price, collateral, leverage, highest_leverage=None, rollover=0.0001, funding=0.00005):
+    return {
+        'pair': PAIR,
+        'isBuy': is_buy,
+        'openPrice': str(int(open_price * 10**18)),
+        'collateral': str(int(collateral * 10**6)),
+        'leverage': str(int(leverage * 100)),
+        'highestLeverage': str(int((highest_leverage or leverage) * 100)),
+        'rollover': str(int(rollover * 10**18)),
+        'funding': str(int(funding * 10**18)),
+    }
+
+
+@pytest.fixture
+def metrics(ostium, monkeypatch):
+    monkeypatch.setattr(ostium, 'pair_fee_accumulators', lambda pair, block_number: ACCUMULATORS[pair['id']])
+    market_state = {"prices": PRICES, "liqMarginThresholdP": 90}
+    return lambda trades: ostium.compute_trade_metrics(trades, market_state, 1)
+
+
+def sdk_total_pnl(t, current_price, acc_funding):
+    collateral = Decimal(t['collateral']) / 10**6
+    leverage = Decimal(t['leverage']) / 100
+    rollover_fee = GetTradeRolloverFee(
+        Decimal(t['rollover']) / 10**18, Decimal(str(ACCUMULATORS['0'][0])), collateral, leverage)
+    funding_fee = GetTradeFundingFee(
+        Decimal(t['funding']) / 10**18, Decimal(str(acc_funding)), collateral, leverage)
+    return CurrentTotalProfitRaw(
+        Decimal(t['openPrice']) / 10**18, Decimal(current_price), t['isBuy'], leverage,
+        Decimal(t['highestLeverage']) / 100, collateral, rollover_fee, funding_fee
+    ), rollover_fee, funding_fee
+
+
+@pytest.mark.parametrize('t, mark, acc_funding', [
+    (trade(True, 60000, 100, 5), '60900', 0.0002),  # long closes at bid
+    (trade(False, 62000, 250, 20, highest_leverage=25), '61100', -0.0001),  # short closes at ask
+    (trade(True, 65000, 50, 3), '60900', 0.0002),  # losing long
+])
+def test_matches_sdk_formulae(metrics, t, mark, acc_funding):
+    [result] = metrics([t])
+    total, rollover_fee, funding_fee = sdk_total_pnl(t, mark, acc_funding)
+
+    assert result["currentPrice"] == float(mark)
+    assert result["unrealizedPnl"] == pytest.approx(float(total), rel=1e-9)
+    assert result["rolloverFee"] == pytest.approx(float(rollover_fee), rel=1e-9)
+    assert result["fundingFee"] == pytest.approx(float(funding_fee), rel=1e-9)
+
+
+def test_profit_is_capped_like_the_contracts(metrics, ostium):
+    [result] = metrics([trade(True, 1000, 100, 100)])  # +5990% before the cap
+    assert result["grossPnl"] == pytest.approx(100 * ostium.MAX_PROFIT_P / 100)
+
+
+def test_liquidation_price_sits_on_the_losing_side(metrics):
+    long_metrics, short_metrics = metrics([trade(True, 60000, 100, 10), trade(False, 60000, 100, 10)])
+    assert 0 < long_metrics["liquidationPrice"] < 60000 < short_metrics["liquidationPrice"]
+
+
+def test_trades_without_a_price_get_none(metrics):
+    unpriced = dict(trade(True, 60000, 100, 5), pair={**PAIR, 'from': 'DOGE'})
+    assert metrics([unpriced, trade(True, 60000, 100, 5)])[0] is None
+    assert metrics([]) == []
@@ -0,0 +1,143 @@
+"""
+TweetResponseCache hits, derived answers and single-flight fetches
+"""
+
+import threading
+import time
+
+import pytest
+
+
+def tweets(*ids):
+    return [{'id': str(i), 'text': f"tweet {i}"} for i in ids]
+
+
+class Upstream:
+    """fetch() factory that records each upstream call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def returning(self, user_id, result):
+        def fetch():
+            self.calls.append((user_id, result))
+            return user_id, result
+        return fetch
+
+
+@pytest.fixture
+def cache(twitter):
+    return twitter.TweetResponseCache(ttl=60, max_size=100)
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+def ids(result):
+    return [tweet['id'] for tweet in result[1]]
+
+
+def test_identical_request_is_a_hit(cache, upstream):
+    cache.get('Alice', '', 10, upstream.returning('1', tweets(30, 20)), 1)
+    assert ids(cache.get('alice', None, 10, upstream.returning('1', []), 1)) == ['30', '20']
+    assert len(upstream.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize('cached, query, expected', [
+    # A short page holds every tweet after its since_id: any later since_id is answerable
+    (('', 10, (30, 20, 10)), ('15', 10), ['30', '20']),
+    # A page that reaches back to the query's since_id covers everything after it
+    (('', 3, (50, 40, 30)), ('40', 10), ['50']),
+    # Fewer results than a cached page: the newest ones
+    (('', 5, (50, 40, 30, 20, 10)), ('', 2), ['50', '40']),
+])
+def test_narrower_queries_are_derived(cache, upstream, cached, query, expected):
+    since_id, max_results, cached_ids = cached
+    cache.get('alice', since_id, max_results, upstream.returning('1', tweets(*cached_ids)), 1)
+
+    result = cache.get('alice', query[0], query[1], upstream.returning('1', []), 1)
+
+    assert ids(result) == expected
+    assert len(upstream.calls) == 1
+    assert cache.stats()["derived"] == 1
+
+
+@pytest.mark.parametrize('cached, query', [
+    # A full page that stops short of the query's since_id may be missing tweets
+    (('', 5, (50, 40, 30, 20, 10)), ('5', 10)),
+    # An entry starting after the query's since_id lacks older tweets
+    (('30', 10, (50, 40)), ('10', 10)),
+])
+def test_queries_that_may_miss_tweets_go_upstream(cache, upstream, cached, query):
+    since_id, max_results, cached_ids = cached
+    cache.get('alice', since_id, max_results, upstream.returning('1', tweets(*cached_ids)), 1)
+    cache.get('alice', query[0], query[1], upstream.returning('1', []), 1)
+    assert len(upstream.calls) == 2
+
+
+def test_unknown_handles_are_derived_as_empty(cache, upstream):
+    cache.get('ghost', '', 10, upstream.returning(None, []), 1)
+    assert cache.get('ghost', '123', 5, upstream.returning('1', tweets(1)), 1) == (None, [])
+
+
+def test_expired_entries_are_refetched(cache, upstream):
+    cache.get('alice', '', 10, upstream.returning('1', tweets(1)), 1)
+    cache.ttl = 0
+    cache.get('alice', '', 10, upstream.returning('1', tweets(2)), 1)
+    assert len(upstream.calls) == 2
+
+
+def test_concurrent_requests_share_one_fetch(cache):
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return '1', tweets(10)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('alice', '', 10, fetch, 5)))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [ids(result) for result in results] == [['10']] * 3
+    assert cache.stats()["coalesced"] == 2
+
+
+def test_fetch_errors_reach_followers_and_are_not_cached(cache):
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def request():
+        try:
+            cache.get('alice', '', 10, failing, 5)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    time.sleep(0.05)
+    follower = threading.Thread(target=request)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ["upstream down"] * 2
+    assert cache.stats()["size"] == 0 and cache.stats()["inflight"] == 0
@@ -0,0 +1,121 @@
+"""
+TweetWatcher baselines, poll backoff, events and SSE subscriber cap
+"""
+
+import time
+
+import pytest
+
+
+class Timeline:
+    """fetch_user_tweets stand-in: queued (user_id, tweets) results or exceptions per call"""
+
+    def __init__(self):
+        self.results = []
+        self.calls = []
+
+    def __call__(self, username, max_results, since_id, max_wait):
+        self.calls.append((username, since_id))
+        result = self.results.pop(0) if self.results else ('1', [])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def tweets(*ids):
+    return [{'id': str(i)} for i in ids]
+
+
+@pytest.fixture
+def timeline(twitter, monkeypatch):
+    timeline = Timeline()
+    monkeypatch.setattr(twitter, 'fetch_user_tweets', timeline)
+    return timeline
+
+
+@pytest.fixture
+def watcher(twitter, tmp_path, timeline):
+    return twitter.TweetWatcher(str(tmp_path / 'watch.json'), min_interval=30, max_interval=100, backoff=2,
+                                webhook_url=None, event_log_size=10, concurrency=1, max_subscribers=1)
+
+
+def test_first_poll_only_records_a_baseline(watcher, timeline):
+    watcher.add(['@Alice'])
+    timeline.results = [('1', tweets(10, 12)), ('1', tweets(15, 14))]
+
+    watcher._poll('alice')
+    assert watcher.watches['alice']['since_id'] == '12'
+    assert watcher.seq == 0
+
+    watcher._poll('alice')
+    assert timeline.calls[-1] == ('Alice', '12')
+    [event] = watcher.events_after(0)
+    assert event['username'] == 'Alice'
+    assert [t['id'] for t in event['data']] == ['14', '15']  # oldest first
+
+
+def test_known_since_id_skips_the_baseline(watcher, timeline):
+    watcher.add(['bob'], {'BOB': 5})
+    timeline.results = [('1', tweets(6))]
+    watcher._poll('bob')
+    assert timeline.calls == [('bob', '5')]
+    assert watcher.seq == 1
+
+
+def test_empty_polls_back_off_and_new_tweets_reset(watcher, timeline):
+    watcher.add(['alice'], {'alice': 1})
+    intervals = []
+    for _ in range(3):
+        watcher._poll('alice')
+        intervals.append(watcher.watches['alice']['interval'])
+    assert intervals == [60, 100, 100]  # doubled, capped at max_interval
+
+    timeline.results = [('1', tweets(2))]
+    watcher._poll('alice')
+    assert watcher.watches['alice']['interval'] == 30
+
+
+def test_throttled_polls_wait_for_the_window_and_keep_the_baseline_pending(twitter, watcher, timeline):
+    watcher.add(['alice'])
+    timeline.results = [twitter.Throttled('get_users_tweets', 300)]
+    before = time.time()
+    watcher._poll('alice')
+
+    watch = watcher.watches['alice']
+    assert watch['next_poll'] >= before + 300
+    assert watch['last_error'].startswith("Rate limited")
+    assert watch['baselined'] is False
+
+
+def test_watch_list_is_saved_only_when_it_changes(twitter, watcher, timeline, monkeypatch):
+    saves = []
+    save = watcher._save
+    monkeypatch.setattr(watcher, '_save', lambda: (saves.append(1), save()))
+
+    watcher.add(['alice'])  # added
+    watcher._poll('alice')  # baseline completed
+    watcher._poll('alice')  # empty poll: interval only
+    watcher._poll('alice')
+    timeline.results = [('1', tweets(3))]
+    watcher._poll('alice')  # new since_id
+    assert len(saves) == 3
+
+    reloaded = twitter.TweetWatcher(watcher.path, 30, 100, 2, None, 10, 1, 1)
+    assert reloaded.watches['alice']['since_id'] == '3'
+    assert reloaded.watches['alice']['baselined'] is True
+
+
+def test_stream_replays_the_log_and_caps_subscribers(watcher, timeline):
+    watcher.add(['alice'], {'alice': 1})
+    timeline.results = [('1', tweets(2)), ('1', tweets(3))]
+    watcher._poll('alice')
+    watcher._poll('alice')
+
+    assert watcher.subscribe()
+    assert not watcher.subscribe()  # max_subscribers=1
+    frames = watcher.stream(1)
+    assert next(frames).startswith("id: 2\nevent: tweets\n")
+    watcher._stopping = True
+    assert list(frames) == []
+    watcher.unsubscribe()
+    assert watcher.stats()["subscribers"] == 0
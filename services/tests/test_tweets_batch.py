@@ -0,0 +1,101 @@
+"""
+SinceIdStore per-consumer cursors and POST /tweets/batch
+"""
+
+import json
+
+import pytest
+
+TIMELINES = {'alice': ['30', '20', '10'], 'bob': ['7']}
+
+
+@pytest.fixture
+def store(twitter, tmp_path):
+    return twitter.SinceIdStore(str(tmp_path / 'since-ids.json'))
+
+
+def test_cursors_only_move_forward_per_consumer(store):
+    store.advance('worker', 'Alice', '20')
+    store.advance('worker', 'alice', '10')
+    store.advance('backfill', 'alice', '5')
+
+    assert store.get('worker', 'ALICE') == '20'
+    assert store.get('backfill', 'alice') == '5'
+    assert store.get('other', 'alice') is None
+    assert store.stats() == {"consumers": 2, "handles": 2}
+
+
+def test_cursors_survive_a_restart(twitter, store):
+    store.advance('worker', 'alice', '20')
+    store.save()
+    with open(store.path) as f:
+        state = json.load(f)
+    state['legacy-handle'] = '99'  # old single-cursor format is ignored
+    with open(store.path, 'w') as f:
+        json.dump(state, f)
+
+    reloaded = twitter.SinceIdStore(store.path)
+    assert reloaded.get('worker', 'alice') == '20'
+    assert 'legacy-handle' not in reloaded.since_ids
+
+
+@pytest.fixture
+def client(twitter, store, monkeypatch):
+    requests = []
+
+    def fetch_user_tweets(username, max_results, since_id, max_wait):
+        requests.append((username, since_id))
+        ids = [i for i in TIMELINES.get(username.lower(), []) if not since_id or int(i) > int(since_id)]
+        return ('1' if username.lower() in TIMELINES else None), [{'id': i} for i in ids[:max_results]]
+
+    monkeypatch.setattr(twitter, 'twitter_client', object())
+    monkeypatch.setattr(twitter, 'since_id_store', store)
+    monkeypatch.setattr(twitter, 'fetch_user_tweets', fetch_user_tweets)
+    client = twitter.app.test_client()
+    client.upstream = requests
+    return client
+
+
+def batch(client, **body):
+    response = client.post('/tweets/batch', json=body)
+    return response.status_code, response.get_json()
+
+
+def test_consumer_cursor_advances_and_is_reused(client, store):
+    status, body = batch(client, usernames=['@Alice', 'alice', 'bob', 'ghost'], consumer='worker')
+
+    assert status == 200
+    assert [r['username'] for r in body['results']] == ['@Alice', 'bob', 'ghost']  # one fetch per handle
+    assert [r.get('newest_id') for r in body['results']] == ['30', '7', None]
+    assert body['results'][2]['error'] == "User not found"
+    assert store.get('worker', 'alice') == '30'
+
+    client.upstream.clear()
+    batch(client, usernames=['alice'], consumer='worker')
+    batch(client, usernames=['alice'], consumer='other')
+    assert client.upstream == [('alice', '30'), ('alice', None)]
+
+
+def test_explicit_since_ids_win_and_nothing_is_stored_without_consumer(client, store):
+    store.advance('worker', 'alice', '30')
+    _, body = batch(client, usernames=['alice'], since_ids={'@ALICE': 10}, consumer='worker')
+    assert [t['id'] for t in body['results'][0]['data']] == ['30', '20']
+
+    batch(client, usernames=['bob'])
+    assert store.get('worker', 'bob') is None
+    assert store.stats()["consumers"] == 1
+
+
+@pytest.mark.parametrize('body', [
+    {"usernames": []},
+    {"usernames": ['alice', 3]},
+    {"usernames": ['alice'], "max_results": 'ten'},
+    {"usernames": ['alice'], "max_results": 0},
+    {"usernames": ['alice'], "max_results": True},
+    {"usernames": ['alice'], "since_ids": ['10']},
+    {"usernames": ['alice'], "since_ids": {'alice': {'id': 10}}},
+    {"usernames": ['alice'], "consumer": ''},
+])
+def test_malformed_requests_are_rejected(client, body):
+    status, _ = batch(client, **body)
+    assert status == 400
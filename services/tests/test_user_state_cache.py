@@ -0,0 +1,44 @@
+"""
+UserStateCache single-flight behaviour for async callers
+"""
+
+import asyncio
+
+import pytest
+
+STATE = {"marginSummary": {"accountValue": "100"}}
+
+
+def test_follower_timeout_leaves_shared_fetch_intact(hl, monkeypatch):
+    monkeypatch.setattr(hl, 'USER_STATE_WAIT_TIMEOUT', 0.2)
+    cache = hl.UserStateCache(None, 60, 10)
+    calls = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def fetch(address):
+            calls.append(address)
+            await release.wait()
+            return STATE
+
+        leader = asyncio.create_task(cache.get_async('0xAbC', fetch))
+        await asyncio.sleep(0)
+
+        # First follower gives up while the leader is still fetching
+        with pytest.raises(asyncio.TimeoutError):
+            await cache.get_async('0xabc', fetch)
+
+        # A later follower still shares the same in-flight fetch
+        follower = asyncio.create_task(cache.get_async('0xABC', fetch))
+        await asyncio.sleep(0)
+        release.set()
+        return await leader, await follower
+
+    leader_state, follower_state = asyncio.run(scenario())
+
+    assert leader_state == STATE
+    assert follower_state == STATE
+    assert calls == ['0xAbC']
+    assert cache.get('0xabc') == STATE  # cached by the leader
+    assert cache.stats()["coalesced"] == 2
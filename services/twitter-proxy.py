@@ -3,16 +3,25 @@ Twitter API Proxy using virtuals_tweepy SDK
 Uses GAME Twitter SDK instead of direct REST API calls
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+import heapq
+import itertools
+import json
 import os
 import logging
+import re
+import requests
+import threading
+import time
 from dotenv import load_dotenv
 
 # Import virtuals_tweepy
 try:
     from virtuals_tweepy import Client
-    from virtuals_tweepy.errors import TweepyException, NotFound, Unauthorized
+    from virtuals_tweepy.errors import TweepyException, NotFound, TooManyRequests, Unauthorized
 except ImportError:
     print("ERROR: virtuals_tweepy not installed. Install with: pip install virtuals_tweepy")
     exit(1)
@@ -30,6 +39,63 @@ logger = logging.getLogger(__name__)
 # GAME API Configuration
 GAME_API_KEY = os.getenv('GAME_API_KEY', '')
 
+# Username -> user id cache (ids never change, so lookups are only needed once per handle)
+USER_ID_CACHE_FILE = os.getenv(
+    'TWITTER_USER_ID_CACHE_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'twitter-user-ids.json')
+)
+USER_ID_CACHE_SIZE = int(os.getenv('TWITTER_USER_ID_CACHE_SIZE', '10000'))
+USER_ID_TTL = float(os.getenv('TWITTER_USER_ID_TTL', str(7 * 24 * 3600)))  # re-check handles weekly (renames)
+USER_ID_NEGATIVE_TTL = float(os.getenv('TWITTER_USER_ID_NEGATIVE_TTL', '600'))  # retry unknown handles sooner
+USER_ID_SAVE_DELAY = float(os.getenv('TWITTER_USER_ID_SAVE_DELAY', '5'))  # coalesce cache file writes over this window
+
+# Upstream call scheduling (token bucket shared by every GAME API call + per-endpoint rate-limit windows)
+RATE_LIMIT = float(os.getenv('TWITTER_RATE_LIMIT', '2'))  # calls per second, 0 disables
+RATE_BURST = int(os.getenv('TWITTER_RATE_BURST', '10'))
+RATE_LIMIT_BACKOFF = float(os.getenv('TWITTER_RATE_LIMIT_BACKOFF', '60'))  # hold after a 429 without a reset header
+THROTTLE_MAX_WAIT = float(os.getenv('TWITTER_THROTTLE_MAX_WAIT', '10'))  # GET /tweets waits at most this, then serves cache
+PRIORITY_FRESH = 0  # incremental polls (since_id known)
+PRIORITY_BACKFILL = 1  # first fetch of an account's timeline
+
+# Endpoint name -> request path (matched against each response URL)
+ENDPOINTS = {
+    'get_user': re.compile(r'/users/by/username/[^/]+$'),
+    'get_users_tweets': re.compile(r'/users/[^/]+/tweets$'),
+}
+
+# Timeline response cache (shared by all consumers of /tweets and /tweets/batch)
+RESPONSE_CACHE_TTL = float(os.getenv('TWITTER_RESPONSE_CACHE_TTL', '15'))  # seconds
+RESPONSE_CACHE_SIZE = int(os.getenv('TWITTER_RESPONSE_CACHE_SIZE', '5000'))
+RESPONSE_WAIT_TIMEOUT = 30  # extra wait for a coalesced caller beyond its own max wait
+
+# POST /tweets/batch
+BATCH_CONCURRENCY = int(os.getenv('TWITTER_BATCH_CONCURRENCY', '8'))
+BATCH_MAX_USERNAMES = int(os.getenv('TWITTER_BATCH_MAX_USERNAMES', '500'))
+BATCH_MAX_WAIT = float(os.getenv('TWITTER_BATCH_MAX_WAIT', '120'))  # per handle, before serving cache
+SINCE_ID_FILE = os.getenv(
+    'TWITTER_SINCE_ID_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'twitter-since-ids.json')
+)
+
+# Watch mode: poll registered handles in the background and push new tweets (single process only)
+WATCH_ENABLED = os.getenv('TWITTER_WATCH_ENABLED', 'false').lower() == 'true'
+WATCH_FILE = os.getenv(
+    'TWITTER_WATCH_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'twitter-watch.json')
+)
+WATCH_MIN_INTERVAL = float(os.getenv('TWITTER_WATCH_MIN_INTERVAL', '30'))  # seconds, right after new tweets
+WATCH_MAX_INTERVAL = float(os.getenv('TWITTER_WATCH_MAX_INTERVAL', '600'))  # seconds, for quiet handles
+WATCH_BACKOFF = float(os.getenv('TWITTER_WATCH_BACKOFF', '1.5'))  # interval multiplier per empty poll
+WATCH_MAX_RESULTS = int(os.getenv('TWITTER_WATCH_MAX_RESULTS', '20'))
+WATCH_CONCURRENCY = int(os.getenv('TWITTER_WATCH_CONCURRENCY', '2'))  # polls in flight (own pool, not the batch pool)
+WATCH_WEBHOOK_URL = os.getenv('TWITTER_WATCH_WEBHOOK_URL')  # optional: POST each event here
+WATCH_WEBHOOK_RETRIES = 3
+WATCH_EVENT_LOG_SIZE = int(os.getenv('TWITTER_WATCH_EVENT_LOG_SIZE', '1000'))  # events kept for /watch/events and SSE replay
+WATCH_KEEPALIVE = float(os.getenv('TWITTER_WATCH_KEEPALIVE', '15'))  # seconds between SSE keepalives; a dropped client is noticed on the next write
+# Each SSE subscriber holds a gunicorn thread for as long as it stays connected,
+# so keep this well below GUNICORN_THREADS (raise both together for more streams)
+WATCH_MAX_SUBSCRIBERS = int(os.getenv('TWITTER_WATCH_MAX_SUBSCRIBERS', '4'))
+
 # Initialize virtuals_tweepy client
 twitter_client = None
 if GAME_API_KEY:
@@ -41,6 +107,847 @@ if GAME_API_KEY:
 else:
     logger.warning("⚠️  GAME_API_KEY not set!")
 
+
+class UserIdCache:
+    """
+    LRU cache of lowercase username -> user id, persisted to a JSON file
+    Handles that do not exist are cached as None with a shorter TTL so they
+    are retried once the account may have been created or unsuspended.
+    Changes are written save_delay seconds after the first one, so a burst
+    of misses (a new batch of handles) costs one file write.
+    """
+
+    def __init__(self, path, max_size, ttl, negative_ttl, save_delay):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.save_delay = save_delay
+        self.entries = OrderedDict()  # username -> (user_id or None, expires_at)
+        self.hits = 0
+        self.misses = 0
+        self.saves = 0
+        self._lock = threading.Lock()
+        self._save_timer = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            now = time.time()
+            for username, entry in state.items():
+                if entry['expiresAt'] > now:
+                    self.entries[username] = (entry['id'], entry['expiresAt'])
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            logger.info(f"Loaded {len(self.entries)} cached user ids from {self.path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load user id cache from {self.path}: {e}")
+
+    def _schedule_save(self):
+        """Write the cache once save_delay has passed (one pending write at a time)"""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write the cache atomically now"""
+        try:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                state = {
+                    username: {'id': user_id, 'expiresAt': expires_at}
+                    for username, (user_id, expires_at) in self.entries.items()
+                }
+                self.saves += 1
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist user id cache: {e}")
+
+    def lookup(self, username: str):
+        """(found, user_id): user_id is None for a cached not-found handle"""
+        key = username.lower()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def store(self, username: str, user_id):
+        """Cache a resolved id, or None for a handle that does not exist"""
+        key = username.lower()
+        ttl = self.ttl if user_id is not None else self.negative_ttl
+        with self._lock:
+            self.entries[key] = (user_id, time.time() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        self._schedule_save()
+
+    def invalidate(self, username: str):
+        with self._lock:
+            removed = self.entries.pop(username.lower(), None)
+        if removed is not None:
+            self._schedule_save()
+
+    def stats(self):
+        with self._lock:
+            negative = sum(1 for user_id, _ in self.entries.values() if user_id is None)
+            return {
+                "size": len(self.entries),
+                "negative": negative,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "saves": self.saves,
+            }
+
+
+user_id_cache = UserIdCache(USER_ID_CACHE_FILE, USER_ID_CACHE_SIZE, USER_ID_TTL, USER_ID_NEGATIVE_TTL,
+                            USER_ID_SAVE_DELAY)
+
+
+class Throttled(Exception):
+    """An upstream call could not be scheduled within the caller's max wait"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Rate limited on {endpoint}, retry in {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def endpoint_for(url: str) -> str:
+    path = url.split('?', 1)[0]
+    for endpoint, pattern in ENDPOINTS.items():
+        if pattern.search(path):
+            return endpoint
+    return path
+
+
+class RateLimitScheduler:
+    """
+    Paces every GAME API call instead of letting bursts burn the window
+    A global token bucket spreads bursts. Each endpoint's x-rate-limit-*
+    headers (read from every response by a session hook) give its remaining
+    calls and reset time: once half the window is used, the rest is spread
+    evenly until the reset, and at zero (or after a 429) calls are held
+    until the reset. Waiting calls are released in priority order (fresh
+    polls before backfills); a caller whose wait would exceed max_wait gets
+    Throttled so it can serve cached results instead.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self.windows = {}  # endpoint -> {'limit', 'remaining', 'reset'} from the latest response
+        self.last_call = {}  # endpoint -> time of the last dispatch
+        self.waiting = []  # heap of (priority, seq, endpoint)
+        self.calls = 0
+        self.throttled = 0
+        self.rate_limited = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _delay(self, endpoint: str, now: float) -> float:
+        """Seconds until endpoint may be called; caller holds the lock"""
+        delay = 0.0
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+        self.updated = now
+
+        window = self.windows.get(endpoint)
+        if window and window['reset'] > now:
+            if window['remaining'] <= 0:
+                delay = max(delay, window['reset'] - now)
+            elif window['remaining'] * 2 < window['limit']:
+                spacing = (window['reset'] - now) / window['remaining']
+                delay = max(delay, self.last_call.get(endpoint, 0) + spacing - now)
+        return max(delay, 0.0)
+
+    def _ahead(self, ticket) -> bool:
+        """A higher-priority (or earlier) call to the same endpoint is waiting"""
+        return any(other < ticket and other[2] == ticket[2] for other in self.waiting)
+
+    def acquire(self, endpoint: str, priority: int = PRIORITY_FRESH, max_wait: float = THROTTLE_MAX_WAIT):
+        """Block until endpoint may be called (raises Throttled if that is more than max_wait away)"""
+        ticket = (priority, next(self._seq), endpoint)
+        deadline = time.time() + max_wait
+        with self._cond:
+            heapq.heappush(self.waiting, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    delay = self._delay(endpoint, now)
+                    ahead = self._ahead(ticket)
+                    if delay <= 0 and not ahead:
+                        if self.rate > 0:
+                            self.tokens -= 1
+                        self.last_call[endpoint] = now
+                        self.calls += 1
+                        return
+                    if now + delay > deadline or (ahead and now >= deadline):
+                        self.throttled += 1
+                        raise Throttled(endpoint, max(delay, 1.0))
+                    self._cond.wait(min(delay if delay > 0 else 1.0, deadline - now))
+            finally:
+                self.waiting.remove(ticket)
+                heapq.heapify(self.waiting)
+                self._cond.notify_all()
+
+    def call(self, endpoint: str, fn, priority: int = PRIORITY_FRESH, max_wait: float = THROTTLE_MAX_WAIT):
+        """Run fn() under the endpoint's budget; a 429 holds the endpoint and retries within max_wait"""
+        deadline = time.time() + max_wait
+        while True:
+            self.acquire(endpoint, priority, max(deadline - time.time(), 0))
+            try:
+                return fn()
+            except TooManyRequests:
+                logger.warning(f"Rate limited on {endpoint}, waiting for the window to reset")
+
+    def observe(self, response, *args, **kwargs):
+        """requests response hook: track x-rate-limit-* headers and 429s per endpoint"""
+        endpoint = endpoint_for(response.url)
+        headers = response.headers
+        now = time.time()
+        with self._cond:
+            if 'x-rate-limit-remaining' in headers:
+                try:
+                    remaining = int(headers['x-rate-limit-remaining'])
+                    self.windows[endpoint] = {
+                        'limit': int(headers.get('x-rate-limit-limit', remaining)),
+                        'remaining': remaining,
+                        'reset': float(headers.get('x-rate-limit-reset', now + RATE_LIMIT_BACKOFF)),
+                    }
+                except ValueError:
+                    logger.warning(f"Unparseable rate-limit headers for {endpoint}")
+            if response.status_code == 429:
+                self.rate_limited += 1
+                window = self.windows.setdefault(endpoint, {'limit': 0, 'remaining': 0, 'reset': 0})
+                window['remaining'] = 0
+                if window['reset'] <= now:
+                    window['reset'] = now + RATE_LIMIT_BACKOFF
+            self._cond.notify_all()
+
+    def stats(self):
+        now = time.time()
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self.tokens, 2),
+                "calls": self.calls,
+                "waiting": len(self.waiting),
+                "throttled": self.throttled,
+                "rate_limited": self.rate_limited,
+                "windows": {
+                    endpoint: {
+                        "limit": window['limit'],
+                        "remaining": window['remaining'],
+                        "resets_in": max(round(window['reset'] - now), 0),
+                    }
+                    for endpoint, window in self.windows.items()
+                },
+            }
+
+
+scheduler = RateLimitScheduler(RATE_LIMIT, RATE_BURST)
+if twitter_client is not None:
+    twitter_client.session.hooks['response'].append(scheduler.observe)
+
+
+class RecentTweets:
+    """Last tweets fetched per handle, served (filtered by since_id) while upstream is throttled"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # lowercase username -> (user_id, tweets newest first, fetched_at)
+        self.served = 0
+        self._lock = threading.Lock()
+
+    def store(self, username: str, user_id: str, tweets: list):
+        if not tweets:
+            return
+        key = username.lower()
+        with self._lock:
+            previous = self.entries.get(key)
+            merged = {tweet['id']: tweet for tweet in (previous[1] if previous else [])}
+            merged.update((tweet['id'], tweet) for tweet in tweets)
+            newest = sorted(merged.values(), key=lambda tweet: int(tweet['id']), reverse=True)[:100]
+            self.entries[key] = (user_id, newest, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get(self, username: str, max_results: int, since_id: str = None):
+        """(user_id, tweets, fetched_at) newer than since_id, or None if nothing was fetched yet"""
+        with self._lock:
+            entry = self.entries.get(username.lower())
+            if entry is None:
+                return None
+            self.served += 1
+        user_id, tweets, fetched_at = entry
+        if since_id and str(since_id).isdigit():
+            tweets = [tweet for tweet in tweets if int(tweet['id']) > int(since_id)]
+        return user_id, tweets[:max_results], fetched_at
+
+    def stats(self):
+        with self._lock:
+            return {"handles": len(self.entries), "served": self.served}
+
+
+recent_tweets = RecentTweets(USER_ID_CACHE_SIZE)
+
+
+def tweet_id(value) -> int:
+    return int(value) if value and str(value).isdigit() else 0
+
+
+class TweetResponseCache:
+    """
+    Short-TTL cache of timeline fetches keyed by (username, since_id, max_results)
+    Concurrent identical requests share one upstream call (single-flight).
+    A fresh entry for the same handle also answers a narrower query (later
+    since_id or fewer results) when it provably holds every tweet it needs.
+    """
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # (username, since_id, max_results) -> (user_id, tweets, fetched_at)
+        self._by_user = {}  # username -> set of keys in _entries
+        self._inflight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.derived = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _derive(self, key, now):
+        """Answer key from another fresh entry for the same handle; caller holds the lock"""
+        username, since_id, max_results = key
+        since = tweet_id(since_id)
+        if since_id and not since:
+            return None
+        for other in self._by_user.get(username, ()):
+            user_id, tweets, fetched_at = self._entries[other]
+            if now - fetched_at >= self.ttl:
+                continue
+            if user_id is None:
+                return user_id, []
+            other_since, other_max = tweet_id(other[1]), other[2]
+            if other_since > since:
+                continue
+            newer = [tweet for tweet in tweets if tweet_id(tweet['id']) > since]
+            complete = len(tweets) < other_max  # nothing older than the cached page exists above other_since
+            reaches_since = any(tweet_id(tweet['id']) <= since for tweet in tweets)
+            if complete or reaches_since or len(newer) >= max_results:
+                return user_id, newer[:max_results]
+        return None
+
+    def _complete(self, key, future, result=None, error=None):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if error is None and result is not None:
+                self._entries[key] = (result[0], result[1], time.time())
+                self._entries.move_to_end(key)
+                self._by_user.setdefault(key[0], set()).add(key)
+                while len(self._entries) > self.max_size:
+                    evicted, _ = self._entries.popitem(last=False)
+                    keys = self._by_user.get(evicted[0])
+                    keys.discard(evicted)
+                    if not keys:
+                        del self._by_user[evicted[0]]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def get(self, username: str, since_id: str, max_results: int, fetch, wait_timeout: float):
+        """(user_id, tweets) from cache, a coalesced in-flight fetch, or fetch()"""
+        key = (username.lower(), since_id or '', max_results)
+        with self._lock:
+            now = time.time()
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[2] < self.ttl:
+                self.hits += 1
+                return entry[0], entry[1]
+            derived = self._derive(key, now)
+            if derived is not None:
+                self.derived += 1
+                return derived
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                return future.result(wait_timeout)
+            except FutureTimeout:
+                raise Throttled('get_users_tweets', 1.0)
+        try:
+            result = fetch()
+        except BaseException as e:  # never leave followers waiting on an abandoned fetch
+            self._complete(key, future, error=e)
+            raise
+        self._complete(key, future, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "derived": self.derived,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+            }
+
+
+response_cache = TweetResponseCache(RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIZE)
+
+
+class SinceIdStore:
+    """
+    Newest tweet id returned per (consumer, handle) by /tweets/batch, persisted to a JSON file
+    Each consumer has its own cursors, so callers never consume each other's tweets.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.since_ids = {}  # consumer -> {lowercase username -> newest tweet id}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            # Skip entries from the old single-cursor format (username -> id)
+            self.since_ids = {consumer: ids for consumer, ids in state.items() if isinstance(ids, dict)}
+            logger.info(f"Loaded since ids for {len(self.since_ids)} consumers from {self.path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load since ids from {self.path}: {e}")
+
+    def get(self, consumer: str, username: str):
+        with self._lock:
+            return self.since_ids.get(consumer, {}).get(username.lower())
+
+    def advance(self, consumer: str, username: str, tweet_id: str):
+        """Remember tweet_id if it is newer than the stored one (ids are increasing integers)"""
+        key = username.lower()
+        with self._lock:
+            cursors = self.since_ids.setdefault(consumer, {})
+            current = cursors.get(key)
+            if current is None or int(tweet_id) > int(current):
+                cursors[key] = tweet_id
+
+    def save(self):
+        try:
+            with self._lock:
+                state = dict(self.since_ids)
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist since ids: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "consumers": len(self.since_ids),
+                "handles": sum(len(cursors) for cursors in self.since_ids.values()),
+            }
+
+
+since_id_store = SinceIdStore(SINCE_ID_FILE)
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix='tweets-batch')
+
+
+def resolve_user_id(username: str, priority: int = PRIORITY_FRESH, max_wait: float = THROTTLE_MAX_WAIT):
+    """User id for a handle (None if it does not exist), looked up only on a cache miss"""
+    found, user_id = user_id_cache.lookup(username)
+    if found:
+        return user_id
+
+    logger.info(f"Looking up user: {username}")
+    try:
+        user_response = scheduler.call(
+            'get_user', lambda: twitter_client.get_user(username=username), priority, max_wait
+        )
+        user_id = str(user_response.data.id) if user_response.data else None
+    except NotFound:
+        user_id = None
+    user_id_cache.store(username, user_id)
+    return user_id
+
+
+def fetch_user_tweets(username: str, max_results: int = 10, since_id: str = None, max_wait: float = THROTTLE_MAX_WAIT):
+    """
+    Recent tweets for a handle (without '@') as (user_id, tweets)
+    user_id is None when the handle does not exist. Raises Throttled when the
+    rate limit would hold the call longer than max_wait; SDK errors propagate.
+    """
+    max_results = min(max_results, 100)
+    return response_cache.get(
+        username, since_id, max_results,
+        lambda: fetch_timeline(username, max_results, since_id, max_wait),
+        max_wait + RESPONSE_WAIT_TIMEOUT
+    )
+
+
+def fetch_timeline(username: str, max_results: int, since_id: str, max_wait: float):
+    """Upstream part of fetch_user_tweets (user id lookup + get_users_tweets)"""
+    priority = PRIORITY_FRESH if since_id else PRIORITY_BACKFILL
+    user_id = resolve_user_id(username, priority, max_wait)
+    if user_id is None:
+        return None, []
+
+    request_params = {
+        'max_results': min(max_results, 100),
+        'tweet_fields': ['created_at', 'author_id', 'text']
+    }
+    if since_id:
+        request_params['since_id'] = since_id
+
+    logger.info(f"Fetching tweets with params: {request_params}")
+    try:
+        tweets_response = scheduler.call(
+            'get_users_tweets', lambda: twitter_client.get_users_tweets(user_id, **request_params),
+            priority, max_wait
+        )
+    except NotFound:
+        # Cached id no longer resolves (deleted/suspended account): look it up again next time
+        user_id_cache.invalidate(username)
+        raise
+
+    tweets = []
+    for tweet in tweets_response.data or []:
+        tweets.append({
+            'id': str(tweet.id),
+            'text': tweet.text,
+            'created_at': str(tweet.created_at) if hasattr(tweet, 'created_at') else None,
+            'author_id': str(tweet.author_id) if hasattr(tweet, 'author_id') else user_id
+        })
+    recent_tweets.store(username, user_id, tweets)
+    return user_id, tweets
+
+class TweetWatcher:
+    """
+    Background poller for a registered watch list
+    Each handle is polled on its own interval: reset to the minimum when new
+    tweets arrive and stretched by WATCH_BACKOFF after each empty poll, so
+    active accounts are checked often and quiet ones rarely. The first poll
+    only records the newest tweet id. New tweets become events (one per
+    handle per poll) that are kept in a bounded log for /watch/events and
+    /watch/stream (SSE) and POSTed to the webhook if one is configured.
+    At most max_subscribers SSE streams are open at once, since each one
+    occupies a server thread until the client goes away.
+    Polls share the scheduler and response cache with the HTTP endpoints but
+    run on their own small pool, so a large watch list cannot starve
+    /tweets/batch. The watch list is saved when it changes (handles added or
+    removed, a new since_id, a completed baseline), not after every poll.
+    """
+
+    def __init__(self, path, min_interval, max_interval, backoff, webhook_url, event_log_size, concurrency,
+                 max_subscribers):
+        self.path = path
+        self.concurrency = concurrency
+        self.max_subscribers = max_subscribers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.webhook_url = webhook_url
+        self.watches = {}  # lowercase username -> watch state
+        self.events = deque(maxlen=event_log_size)
+        self.seq = 0
+        self.polls = 0
+        self.delivered = 0
+        self.delivery_failures = 0
+        self.subscribers = 0
+        self._inflight = set()
+        self._stopping = False
+        self._thread = None
+        self._pollers = None
+        self._webhook = None
+        self._cond = threading.Condition()  # wakes the poll loop and SSE subscribers
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            now = time.time()
+            for key, watch in state.items():
+                watch.update(next_poll=now, last_error=None)
+                self.watches[key] = watch
+            logger.info(f"Loaded {len(self.watches)} watched handles from {self.path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load watch list from {self.path}: {e}")
+
+    def _save(self):
+        try:
+            with self._cond:
+                state = {
+                    key: {field: watch[field] for field in ('username', 'since_id', 'baselined', 'interval', 'last_tweet_at')}
+                    for key, watch in self.watches.items()
+                }
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist watch list: {e}")
+
+    def add(self, usernames, since_ids=None):
+        """Watch handles (idempotent); a known since_id skips the baseline poll"""
+        since_ids = {u.lstrip('@').lower(): str(since_id) for u, since_id in (since_ids or {}).items() if since_id}
+        added = []
+        with self._cond:
+            for username in usernames:
+                username = username.lstrip('@')
+                key = username.lower()
+                if key in self.watches:
+                    continue
+                self.watches[key] = {
+                    'username': username,
+                    'since_id': since_ids.get(key),
+                    'baselined': key in since_ids,
+                    'interval': self.min_interval,
+                    'next_poll': time.time(),
+                    'last_tweet_at': None,
+                    'last_error': None,
+                }
+                added.append(username)
+            self._cond.notify_all()
+        if added:
+            self._save()
+        return added
+
+    def remove(self, username: str) -> bool:
+        with self._cond:
+            removed = self.watches.pop(username.lstrip('@').lower(), None) is not None
+        if removed:
+            self._save()
+        return removed
+
+    def entries(self):
+        now = time.time()
+        with self._cond:
+            return [
+                {
+                    'username': watch['username'],
+                    'since_id': watch['since_id'],
+                    'interval': round(watch['interval'], 1),
+                    'next_poll_in': max(round(watch['next_poll'] - now, 1), 0),
+                    'last_tweet_at': watch['last_tweet_at'],
+                    'last_error': watch['last_error'],
+                }
+                for watch in self.watches.values()
+            ]
+
+    def start(self):
+        """Start the poll loop (idempotent)"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._pollers = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='tweets-watch')
+            if self.webhook_url:
+                self._webhook = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tweets-webhook')
+            self._thread = threading.Thread(target=self._run, name='tweets-watcher', daemon=True)
+            self._thread.start()
+        logger.info(f"👀 Tweet watcher started ({len(self.watches)} handles, "
+                    f"interval {self.min_interval:.0f}-{self.max_interval:.0f}s)")
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+        if self._pollers is not None:
+            self._pollers.shutdown(wait=False)
+            self._pollers = None
+        if self._webhook is not None:
+            self._webhook.shutdown(wait=True)
+            self._webhook = None
+
+    def _run(self):
+        with self._cond:
+            while not self._stopping:
+                now = time.time()
+                next_poll = now + self.max_interval
+                for key, watch in self.watches.items():
+                    if key in self._inflight:
+                        continue
+                    if watch['next_poll'] <= now:
+                        self._inflight.add(key)
+                        self._pollers.submit(self._poll, key)
+                    else:
+                        next_poll = min(next_poll, watch['next_poll'])
+                self._cond.wait(max(next_poll - now, 0.1))
+
+    def _poll(self, key):
+        with self._cond:
+            watch = self.watches.get(key)
+            if watch is None:
+                self._inflight.discard(key)
+                return
+            username, since_id = watch['username'], watch['since_id']
+
+        tweets, error, retry_after = [], None, 0
+        try:
+            user_id, tweets = fetch_user_tweets(username, WATCH_MAX_RESULTS, since_id, self.min_interval)
+            if user_id is None:
+                error = "User not found"
+        except Throttled as e:
+            error, retry_after = str(e), e.retry_after
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Watch poll failed for @{username}: {e}")
+
+        event = None
+        with self._cond:
+            self._inflight.discard(key)
+            self.polls += 1
+            watch = self.watches.get(key)
+            if watch is None:
+                return
+            now = time.time()
+            # Interval and error changes are not worth a write; cursor changes are
+            changed = bool(tweets) or (error is None and not watch['baselined'])
+            if tweets:
+                watch['since_id'] = max(tweets, key=lambda tweet: int(tweet['id']))['id']
+                watch['last_tweet_at'] = now
+                watch['interval'] = self.min_interval
+                if watch['baselined']:
+                    event = self._publish(watch['username'], tweets)
+            else:
+                watch['interval'] = min(watch['interval'] * self.backoff, self.max_interval)
+            if error is None:
+                watch['baselined'] = True
+            watch['last_error'] = error
+            watch['next_poll'] = now + max(watch['interval'], retry_after)
+            self._cond.notify_all()
+        if changed:
+            self._save()
+        if event is not None and self._webhook is not None:
+            self._webhook.submit(self._deliver, event)
+
+    def _publish(self, username: str, tweets: list) -> dict:
+        """Append an event to the log; caller holds the lock"""
+        self.seq += 1
+        event = {
+            'seq': self.seq,
+            'username': username,
+            'count': len(tweets),
+            'data': sorted(tweets, key=lambda tweet: int(tweet['id'])),
+            'detected_at': time.time(),
+        }
+        self.events.append(event)
+        logger.info(f"📣 {len(tweets)} new tweets from @{username} (event {self.seq})")
+        return event
+
+    def _deliver(self, event: dict):
+        for attempt in range(WATCH_WEBHOOK_RETRIES):
+            try:
+                response = requests.post(self.webhook_url, json=event, timeout=10)
+                if response.status_code < 300:
+                    self.delivered += 1
+                    return
+                error = f"status {response.status_code}"
+            except Exception as e:
+                error = str(e)
+            time.sleep(2 ** attempt)
+        self.delivery_failures += 1
+        logger.error(f"Webhook delivery failed for event {event['seq']}: {error}")
+
+    def events_after(self, seq: int, limit: int = 100):
+        with self._cond:
+            return [event for event in self.events if event['seq'] > seq][:limit]
+
+    def subscribe(self) -> bool:
+        """Reserve an SSE slot; False when max_subscribers streams are already open"""
+        with self._cond:
+            if self.subscribers >= self.max_subscribers:
+                return False
+            self.subscribers += 1
+            return True
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def stream(self, last_seq: int):
+        """SSE frames: events after last_seq from the log, then live events"""
+        while not self._stopping:
+            with self._cond:
+                pending = [event for event in self.events if event['seq'] > last_seq]
+                if not pending:
+                    self._cond.wait(WATCH_KEEPALIVE)
+                    pending = [event for event in self.events if event['seq'] > last_seq]
+            if not pending:
+                yield ": keepalive\n\n"
+                continue
+            for event in pending:
+                yield f"id: {event['seq']}\nevent: tweets\ndata: {json.dumps(event)}\n\n"
+                last_seq = event['seq']
+
+    def stats(self):
+        with self._cond:
+            return {
+                "enabled": WATCH_ENABLED,
+                "running": self._thread is not None,
+                "handles": len(self.watches),
+                "concurrency": self.concurrency,
+                "polls": self.polls,
+                "events": self.seq,
+                "subscribers": self.subscribers,
+                "max_subscribers": self.max_subscribers,
+                "webhook": bool(self.webhook_url),
+                "delivered": self.delivered,
+                "delivery_failures": self.delivery_failures,
+            }
+
+
+watcher = TweetWatcher(WATCH_FILE, WATCH_MIN_INTERVAL, WATCH_MAX_INTERVAL, WATCH_BACKOFF,
+                       WATCH_WEBHOOK_URL, WATCH_EVENT_LOG_SIZE, WATCH_CONCURRENCY, WATCH_MAX_SUBSCRIBERS)
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -49,7 +956,13 @@ def health():
         "status": "healthy",
         "service": "twitter-proxy",
         "game_api_configured": bool(GAME_API_KEY),
-        "client_initialized": twitter_client is not None
+        "client_initialized": twitter_client is not None,
+        "user_id_cache": user_id_cache.stats(),
+        "rate_limits": scheduler.stats(),
+        "recent_tweets": recent_tweets.stats(),
+        "response_cache": response_cache.stats(),
+        "watch": watcher.stats(),
+        "since_ids": since_id_store.stats()
     })
 
 @app.route('/tweets/<username>', methods=['GET'])
@@ -68,12 +981,9 @@ def get_tweets(username):
         }), 500
 
     try:
-        # Get user ID first
         clean_username = username.lstrip('@')
-        logger.info(f"Looking up user: {clean_username}")
-        
-        user_response = twitter_client.get_user(username=clean_username)
-        if not user_response.data:
+        user_id, tweets = fetch_user_tweets(clean_username, max_results, since_id)
+        if user_id is None:
             logger.warning(f"User not found: {clean_username}")
             return jsonify({
                 "username": username,
@@ -81,22 +991,8 @@ def get_tweets(username):
                 "data": [],
                 "error": "User not found"
             }), 404
-        
-        user_id = str(user_response.data.id)
-        logger.info(f"Found user ID: {user_id}")
-
-        # Fetch tweets
-        request_params = {
-            'max_results': min(max_results, 100),
-            'tweet_fields': ['created_at', 'author_id', 'text']
-        }
-        if since_id:
-            request_params['since_id'] = since_id
 
-        logger.info(f"Fetching tweets with params: {request_params}")
-        tweets_response = twitter_client.get_users_tweets(user_id, **request_params)
-        
-        if not tweets_response.data:
+        if not tweets:
             logger.info(f"No tweets found for user {clean_username}")
             return jsonify({
                 "username": username,
@@ -104,17 +1000,6 @@ def get_tweets(username):
                 "data": []
             })
 
-        # Format tweets
-        tweets = []
-        for tweet in tweets_response.data:
-            tweet_data = {
-                'id': str(tweet.id),
-                'text': tweet.text,
-                'created_at': str(tweet.created_at) if hasattr(tweet, 'created_at') else None,
-                'author_id': str(tweet.author_id) if hasattr(tweet, 'author_id') else user_id
-            }
-            tweets.append(tweet_data)
-
         logger.info(f"✅ Successfully fetched {len(tweets)} tweets from virtuals_tweepy SDK")
         return jsonify({
             "username": username,
@@ -122,6 +1007,25 @@ def get_tweets(username):
             "data": tweets
         })
 
+    except Throttled as e:
+        cached = recent_tweets.get(username.lstrip('@'), max_results, since_id)
+        if cached is None:
+            logger.warning(f"Throttled with no cached tweets for @{username}: {e}")
+            return jsonify({
+                "error": "Rate limited",
+                "details": str(e),
+                "retry_after": round(e.retry_after)
+            }), 429, {'Retry-After': str(round(e.retry_after))}
+        _, tweets, fetched_at = cached
+        logger.info(f"Throttled, serving {len(tweets)} cached tweets for @{username}")
+        return jsonify({
+            "username": username,
+            "count": len(tweets),
+            "data": tweets,
+            "stale": True,
+            "fetched_at": fetched_at,
+            "retry_after": round(e.retry_after)
+        })
     except NotFound:
         logger.error(f"User not found: {username}")
         return jsonify({
@@ -147,6 +1051,197 @@ def get_tweets(username):
             "details": str(e)
         }), 500
 
+def fetch_batch_entry(username: str, max_results: int, since_id: str, consumer: str = None) -> dict:
+    """
+    One /tweets/batch result; errors are reported per handle instead of failing the batch
+    With a consumer, its stored cursor for the handle advances to the newest id returned.
+    """
+    clean_username = username.lstrip('@')
+    result = {"username": username, "since_id": since_id, "count": 0, "data": []}
+    try:
+        user_id, tweets = fetch_user_tweets(clean_username, max_results, since_id, BATCH_MAX_WAIT)
+        if user_id is None:
+            result["error"] = "User not found"
+            return result
+        result["count"] = len(tweets)
+        result["data"] = tweets
+        if tweets:
+            result["newest_id"] = max(tweets, key=lambda tweet: int(tweet['id']))['id']
+            if consumer:
+                since_id_store.advance(consumer, clean_username, result["newest_id"])
+    except Throttled as e:
+        result["retry_after"] = round(e.retry_after)
+        cached = recent_tweets.get(clean_username, max_results, since_id)
+        if cached is None:
+            result["error"] = "Rate limited"
+        else:
+            result["data"] = cached[1]
+            result["count"] = len(cached[1])
+            result["stale"] = True
+            if cached[1]:
+                result["newest_id"] = cached[1][0]['id']
+                if consumer:
+                    since_id_store.advance(consumer, clean_username, result["newest_id"])
+    except NotFound:
+        result["error"] = "User not found"
+    except Unauthorized:
+        result["error"] = "Unauthorized"
+    except TweepyException as e:
+        logger.error(f"TweepyException for @{clean_username}: {e}")
+        result["error"] = f"Twitter API error: {e}"
+    except Exception as e:
+        logger.error(f"Unexpected error for @{clean_username}: {e}")
+        result["error"] = str(e)
+    return result
+
+@app.route('/tweets/batch', methods=['POST'])
+def get_tweets_batch():
+    """
+    Fetch tweets for many handles concurrently (within the upstream rate budget)
+    Body: { "usernames": ["user1", "user2"], "max_results": 10, "since_ids": { "user1": "123" }, "consumer": "worker" }
+    since_ids should come from the caller's own store of what it has ingested.
+    An optional "consumer" id keeps a server-side cursor per handle for that
+    consumer only: handles without an explicit since_id continue from the
+    newest tweet previously returned to it. Without one nothing is stored.
+    Returns: { "count": 12, "results": [{ "username", "since_id", "newest_id", "count", "data", "error"? }], "elapsed": 1.2 }
+    """
+    if not twitter_client:
+        logger.error("Twitter client not initialized - GAME_API_KEY missing")
+        return jsonify({
+            "error": "Twitter client not initialized",
+            "details": "GAME_API_KEY is not configured"
+        }), 500
+
+    data = request.get_json(silent=True) or {}
+    usernames = data.get('usernames')
+    if not isinstance(usernames, list) or not usernames or not all(isinstance(u, str) and u.lstrip('@') for u in usernames):
+        return jsonify({"error": "usernames must be a non-empty list of handles"}), 400
+    if len(usernames) > BATCH_MAX_USERNAMES:
+        return jsonify({"error": f"At most {BATCH_MAX_USERNAMES} usernames per batch"}), 400
+
+    max_results = data.get('max_results', 10)
+    if isinstance(max_results, str) and max_results.isdigit():
+        max_results = int(max_results)
+    if isinstance(max_results, bool) or not isinstance(max_results, int) or not 1 <= max_results <= 100:
+        return jsonify({"error": "max_results must be an integer between 1 and 100"}), 400
+    consumer = data.get('consumer')
+    if consumer is not None and (not isinstance(consumer, str) or not consumer):
+        return jsonify({"error": "consumer must be a non-empty string"}), 400
+    since_ids = data.get('since_ids') or {}
+    if not isinstance(since_ids, dict) or not all(
+            since_id is None or (isinstance(since_id, (str, int)) and not isinstance(since_id, bool))
+            for since_id in since_ids.values()):
+        return jsonify({"error": "since_ids must map handles to tweet ids"}), 400
+    since_ids = {u.lstrip('@').lower(): str(since_id) for u, since_id in since_ids.items() if since_id}
+
+    # One fetch per handle (case-insensitive), results in request order
+    unique = {}
+    for username in usernames:
+        unique.setdefault(username.lstrip('@').lower(), username)
+    started = time.time()
+    futures = [
+        batch_executor.submit(
+            fetch_batch_entry, username, max_results,
+            since_ids.get(key) or (consumer and since_id_store.get(consumer, key)), consumer
+        )
+        for key, username in unique.items()
+    ]
+    results = [future.result() for future in futures]
+    if consumer:
+        since_id_store.save()
+
+    elapsed = time.time() - started
+    total = sum(result["count"] for result in results)
+    logger.info(f"✅ Batch fetched {total} tweets for {len(results)} handles in {elapsed:.2f}s")
+    return jsonify({
+        "count": total,
+        "results": results,
+        "elapsed": round(elapsed, 3)
+    })
+
+def watch_disabled():
+    return jsonify({
+        "error": "Watch mode disabled",
+        "details": "Set TWITTER_WATCH_ENABLED=true to poll and push tweets"
+    }), 503
+
+@app.route('/watch', methods=['GET'])
+def list_watches():
+    """Watched handles with their current poll interval"""
+    if not WATCH_ENABLED:
+        return watch_disabled()
+    watches = watcher.entries()
+    return jsonify({"count": len(watches), "watches": watches})
+
+@app.route('/watch', methods=['POST'])
+def add_watches():
+    """
+    Add handles to the watch list
+    Body: { "usernames": ["user1", "user2"], "since_ids": { "user1": "123" } }
+    Without a since_id the first poll only records the newest tweet.
+    """
+    if not WATCH_ENABLED:
+        return watch_disabled()
+    data = request.get_json(silent=True) or {}
+    usernames = data.get('usernames')
+    if not isinstance(usernames, list) or not usernames or not all(isinstance(u, str) and u.lstrip('@') for u in usernames):
+        return jsonify({"error": "usernames must be a non-empty list of handles"}), 400
+    added = watcher.add(usernames, data.get('since_ids'))
+    return jsonify({"added": added, "count": len(watcher.watches)})
+
+@app.route('/watch/<username>', methods=['DELETE'])
+def remove_watch(username):
+    """Stop watching a handle"""
+    if not WATCH_ENABLED:
+        return watch_disabled()
+    if not watcher.remove(username):
+        return jsonify({"error": "Not watched", "username": username}), 404
+    return jsonify({"removed": username})
+
+@app.route('/watch/events', methods=['GET'])
+def watch_events():
+    """
+    Pull new-tweet events (local queue)
+    GET /watch/events?after=<seq>&limit=100
+    Returns: { "events": [{ "seq", "username", "count", "data", "detected_at" }], "last_seq": 42 }
+    """
+    if not WATCH_ENABLED:
+        return watch_disabled()
+    after = request.args.get('after', default=0, type=int)
+    limit = min(request.args.get('limit', default=100, type=int), WATCH_EVENT_LOG_SIZE)
+    events = watcher.events_after(after, limit)
+    return jsonify({
+        "events": events,
+        "last_seq": events[-1]['seq'] if events else after
+    })
+
+@app.route('/watch/stream', methods=['GET'])
+def watch_stream():
+    """
+    Server-sent events: one "tweets" event per handle with new tweets
+    Reconnects resume from the Last-Event-ID header (or ?after=<seq>).
+    Returns 503 when TWITTER_WATCH_MAX_SUBSCRIBERS streams are already open;
+    use /watch/events polling instead.
+    """
+    if not WATCH_ENABLED:
+        return watch_disabled()
+    last_seq = request.headers.get('Last-Event-ID', type=int)
+    if last_seq is None:
+        last_seq = request.args.get('after', default=watcher.seq, type=int)
+    if not watcher.subscribe():
+        return jsonify({
+            "error": "Too many stream subscribers",
+            "details": f"At most {watcher.max_subscribers} SSE streams; poll /watch/events instead"
+        }), 503
+    response = Response(
+        watcher.stream(last_seq),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Released when the server closes the response (client gone or shutdown)
+    response.call_on_close(watcher.unsubscribe)
+    return response
+
 @app.route('/test', methods=['GET'])
 def test_endpoint():
     """Test endpoint to verify proxy functionality"""
@@ -156,10 +1251,22 @@ def test_endpoint():
         'client_initialized': twitter_client is not None,
         'endpoints': {
             'health': '/health',
-            'tweets': '/tweets/<username>?max_results=10&since_id=123'
+            'tweets': '/tweets/<username>?max_results=10&since_id=123',
+            'batch': 'POST /tweets/batch',
+            'watch': 'GET/POST /watch, DELETE /watch/<username>, GET /watch/events, GET /watch/stream'
         }
     })
 
+def start_services():
+    """Start the watch poller when enabled (called once per process: dev server or the WSGI worker)"""
+    if WATCH_ENABLED and twitter_client is not None:
+        watcher.start()
+
+def stop_services():
+    watcher.stop()
+    batch_executor.shutdown(wait=False)
+    user_id_cache.flush()
+
 if __name__ == '__main__':
     # Get port from environment, default to 5002
     port_env = os.getenv('TWITTER_PROXY_PORT') or os.getenv('PORT') or '5002'
@@ -179,4 +1286,8 @@ if __name__ == '__main__':
     logger.info(f"   Endpoints:")
     logger.info(f"   - GET /health")
     logger.info(f"   - GET /tweets/<username>?max_results=10")
+    logger.info(f"   - POST /tweets/batch")
+    if WATCH_ENABLED:
+        logger.info(f"   - GET/POST /watch, GET /watch/events, GET /watch/stream")
+    start_services()
     app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
@@ -0,0 +1,64 @@
+"""
+Production entry point for the Python services
+The service files have hyphenated names, so they are loaded by path and
+exposed through an app factory that gunicorn can import:
+
+    gunicorn -c gunicorn.conf.py 'wsgi:create_app("hyperliquid")'
+    gunicorn -c gunicorn.conf.py 'wsgi:create_app("ostium")'
+    gunicorn -c gunicorn.conf.py 'wsgi:create_app("twitter")'
+
+Background workers (price feeds, pollers, tx queue) are started per worker
+process by gunicorn.conf.py, never in the preloading master.
+"""
+
+import importlib.util
+import os
+import sys
+
+SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVICES = {
+    'hyperliquid': 'hyperliquid-service.py',
+    'ostium': 'ostium-service.py',
+    'twitter': 'twitter-proxy.py',
+}
+
+# Service name -> loaded module
+loaded = {}
+
+
+def load_service(name: str):
+    """Import a service module by file path (once per process)"""
+    if name not in SERVICES:
+        raise ValueError(f"Unknown service '{name}' (expected one of: {', '.join(SERVICES)})")
+    if name not in loaded:
+        # Services log to relative paths (logs/...)
+        os.chdir(SERVICES_DIR)
+        os.makedirs('logs', exist_ok=True)
+        module_name = f"{name}_service"
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(SERVICES_DIR, SERVICES[name]))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        loaded[name] = module
+    return loaded[name]
+
+
+def create_app(service: str = None):
+    """App factory: service name from the argument or the MAXXIT_SERVICE env var"""
+    service = service or os.getenv('MAXXIT_SERVICE')
+    if not service:
+        raise ValueError("No service given: use wsgi:create_app(\"<name>\") or set MAXXIT_SERVICE")
+    return load_service(service).app
+
+
+def start_services():
+    for module in loaded.values():
+        if hasattr(module, 'start_services'):
+            module.start_services()
+
+
+def stop_services():
+    for module in loaded.values():
+        if hasattr(module, 'stop_services'):
+            module.stop_services()
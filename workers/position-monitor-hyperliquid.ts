@@ -8,7 +8,7 @@
 
 import { PrismaClient } from '@prisma/client';
 import { TradeExecutor } from '../lib/trade-executor';
-import { getHyperliquidOpenPositions, getHyperliquidMarketPrice, getHyperliquidUserFills } from '../lib/hyperliquid-utils';
+import { getHyperliquidOpenPositions, getHyperliquidOpenPositionsBatch, getHyperliquidMarketPrice, getHyperliquidUserFills, HyperliquidPosition } from '../lib/hyperliquid-utils';
 import { updateMetricsForDeployment } from '../lib/metrics-updater';
 import { calculatePnL } from '../lib/price-oracle';
 import * as fs from 'fs';
@@ -109,6 +109,21 @@ export async function monitorHyperliquidPositions() {
     let totalPositionsMonitored = 0;
     let totalPositionsClosed = 0;
 
+    // Prefetch positions for all deployments in batch requests (chunked to the service limit).
+    // Addresses missing from the result fall back to a per-address fetch below.
+    let prefetchedPositions: Record<string, HyperliquidPosition[]> = {};
+    try {
+      prefetchedPositions = await getHyperliquidOpenPositionsBatch(
+        deployments.map(d => d.safe_wallet)
+      );
+    } catch (error: any) {
+      console.log(`⚠️  Batch position fetch failed, falling back to per-deployment fetch: ${error.message}\n`);
+    }
+    const unprefetched = deployments.filter(d => !(d.safe_wallet in prefetchedPositions)).length;
+    if (unprefetched > 0) {
+      console.log(`⚠️  ${unprefetched}/${deployments.length} deployment(s) missing from batch results - fetching them individually\n`);
+    }
+
     // Step 2: For each deployment, fetch real positions from Hyperliquid
     for (const deployment of deployments) {
       const userAddress = deployment.safe_wallet;
@@ -120,7 +135,7 @@ export async function monitorHyperliquidPositions() {
 
       try {
         // Fetch positions from Hyperliquid API
-        const hlPositions = await getHyperliquidOpenPositions(userAddress);
+        const hlPositions = prefetchedPositions[userAddress] ?? await getHyperliquidOpenPositions(userAddress);
         
         if (hlPositions.length === 0) {
           console.log('  No open positions on Hyperliquid\n');
@@ -427,7 +442,12 @@ export async function monitorHyperliquidPositions() {
           // Fetch historical fills to get actual PnL for closed positions
           let fills: any[] = [];
           try {
-            fills = await getHyperliquidUserFills(deployment.hyperliquid_user_address || deployment.user_wallet);
+            // Only fills since the oldest orphan was opened can have closed it
+            const sinceTime = Math.min(...orphans.map(p => new Date(p.opened_at).getTime()));
+            fills = await getHyperliquidUserFills(
+              deployment.hyperliquid_user_address || deployment.user_wallet,
+              { sinceTime }
+            );
             console.log(`     Retrieved ${fills.length} historical fills from Hyperliquid`);
           } catch (error: any) {
             console.log(`     ⚠️  Could not fetch fills: ${error.message}`);
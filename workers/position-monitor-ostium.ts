@@ -9,7 +9,7 @@
 
 import { PrismaClient } from '@prisma/client';
 import { TradeExecutor } from '../lib/trade-executor';
-import { getOstiumPositions, getOstiumBalance } from '../lib/adapters/ostium-adapter';
+import { getOstiumPositions, getOstiumPositionsBatch, getOstiumBalance, OstiumPosition } from '../lib/adapters/ostium-adapter';
 import { updateMetricsForDeployment } from '../lib/metrics-updater';
 import * as fs from 'fs';
 import * as path from 'path';
@@ -115,6 +115,21 @@ export async function monitorOstiumPositions() {
     let totalPositionsMonitored = 0;
     let totalPositionsClosed = 0;
 
+    // Prefetch positions for all deployments in batch requests (chunked to the service limit).
+    // Addresses missing from the result fall back to a per-address fetch below.
+    let prefetchedPositions: Record<string, OstiumPosition[]> = {};
+    try {
+      prefetchedPositions = await getOstiumPositionsBatch(
+        deployments.map(d => d.safe_wallet)
+      );
+    } catch (error: any) {
+      console.log(`⚠️  Batch position fetch failed, falling back to per-deployment fetch: ${error.message}\n`);
+    }
+    const unprefetched = deployments.filter(d => !(d.safe_wallet in prefetchedPositions)).length;
+    if (unprefetched > 0) {
+      console.log(`⚠️  ${unprefetched}/${deployments.length} deployment(s) missing from batch results - fetching them individually\n`);
+    }
+
     // Monitor each deployment
     for (const deployment of deployments) {
       try {
@@ -122,7 +137,7 @@ export async function monitorOstiumPositions() {
         console.log(`   User Wallet: ${deployment.safe_wallet}`);
         
         // Get positions from Ostium for this user
-        const ostiumPositions = await getOstiumPositions(deployment.safe_wallet);
+        const ostiumPositions = prefetchedPositions[deployment.safe_wallet] ?? await getOstiumPositions(deployment.safe_wallet);
         
         console.log(`   Positions Found: ${ostiumPositions.length}`);
 
@@ -7,6 +7,7 @@
 import 'dotenv/config';
 import { PrismaClient } from '@prisma/client';
 import { createMultiMethodXApiClient } from '../lib/x-api-multi';
+import { BatchTweetsResult } from '../lib/game-twitter-client';
 import { classifyTweet } from '../lib/llm-classifier';
 
 const prisma = new PrismaClient();
@@ -52,15 +53,59 @@ async function ingestTweets() {
       console.log(`⚠️  Twitter proxy not available (${error.message}) - will process existing tweets\n`);
     }
 
+    // Fetch all accounts in one concurrent proxy batch, continuing from the
+    // newest stored post per account (the database is the source of truth)
+    const batchResults = new Map<string, BatchTweetsResult>();
+    if (xApiClient) {
+      const latestPosts = await prisma.ct_posts.findMany({
+        where: { ct_account_id: { in: accounts.map(account => account.id) } },
+        orderBy: { tweet_created_at: 'desc' },
+        distinct: ['ct_account_id'],
+        select: { ct_account_id: true, tweet_id: true },
+      });
+      const latestByAccount = new Map(latestPosts.map(post => [post.ct_account_id, post.tweet_id]));
+      const sinceIds: Record<string, string> = {};
+      for (const account of accounts) {
+        const sinceId = latestByAccount.get(account.id);
+        if (sinceId) {
+          sinceIds[account.x_username.replace('@', '')] = sinceId;
+        }
+      }
+
+      const batch = await xApiClient.getUserTweetsBatch(
+        accounts.map(account => account.x_username),
+        { maxResults: 15, sinceIds }
+      );
+      if (batch) {
+        for (const result of batch) {
+          batchResults.set(result.username.replace('@', '').toLowerCase(), result);
+        }
+        console.log(`📦 Batch fetched tweets for ${batchResults.size} account(s)\n`);
+      } else {
+        console.log('⚠️  Batch fetch unavailable - fetching accounts one at a time\n');
+      }
+    }
+
     const results = [];
 
     for (const account of accounts) {
       console.log(`[${account.x_username}] Processing...`);
       
       let tweets: Array<{ tweetId: string; tweetText: string; tweetCreatedAt: Date }> = [];
+      const batchResult = batchResults.get(account.x_username.replace('@', '').toLowerCase());
       
-      // Try to fetch from X API (Python proxy with GAME API) only if client is available
-      if (xApiClient) {
+      if (batchResult) {
+        if (batchResult.error) {
+          console.log(`[${account.x_username}] ⚠️  X API error:`, batchResult.error);
+        }
+        tweets = batchResult.data.map(tweet => ({
+          tweetId: tweet.id,
+          tweetText: tweet.text,
+          tweetCreatedAt: new Date(tweet.created_at),
+        }));
+        console.log(`[${account.x_username}] ✅ Fetched ${tweets.length} new tweets from batch`);
+      } else if (xApiClient) {
+        // Try to fetch from X API (Python proxy with GAME API) only if client is available
         try {
           // Get the last tweet we've seen for this account
           const lastTweet = await prisma.ct_posts.findFirst({